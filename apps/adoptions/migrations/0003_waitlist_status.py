@@ -0,0 +1,27 @@
+# Generated by Django 5.2.7 on 2026-10-18 03:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('adoptions', '0002_initial'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='simplifiedadoptionrequest',
+            options={'ordering': ['-created_at'], 'verbose_name': 'Solicitud Simplificada de Adopción', 'verbose_name_plural': 'Solicitudes de Adopción'},
+        ),
+        migrations.AlterField(
+            model_name='adoptionapplication',
+            name='application_status',
+            field=models.CharField(choices=[('Recibida', 'Recibida'), ('En Revisión', 'En Revisión'), ('Aprobada', 'Aprobada'), ('Rechazada', 'Rechazada'), ('Lista de Espera', 'Lista de Espera')], default='Recibida', max_length=20, verbose_name='Estado de la solicitud'),
+        ),
+        migrations.AlterField(
+            model_name='simplifiedadoptionrequest',
+            name='status',
+            field=models.CharField(choices=[('Recibida', 'Recibida'), ('En Revisión', 'En Revisión'), ('Aprobada', 'Aprobada'), ('Rechazada', 'Rechazada'), ('Lista de Espera', 'Lista de Espera')], default='Recibida', max_length=20, verbose_name='Estado de la solicitud'),
+        ),
+    ]
@@ -183,8 +183,12 @@ class AdoptionApplication(BaseModel):
         ('En Revisión', 'En Revisión'),
         ('Aprobada', 'Aprobada'),
         ('Rechazada', 'Rechazada'),
+        ('Lista de Espera', 'Lista de Espera'),
     ]
     
+    # Estado, quién lo cambió y cuándo (apps.common.bulk.status_changes)
+    BULK_STATUS_FIELDS = ('application_status', 'reviewed_by', 'review_date')
+    
     application_status = models.CharField(
         max_length=20,
         choices=APPLICATION_STATUS_CHOICES,
@@ -262,8 +266,12 @@ class SimplifiedAdoptionRequest(BaseModel):
         ('En Revisión', 'En Revisión'),
         ('Aprobada', 'Aprobada'),
         ('Rechazada', 'Rechazada'),
+        ('Lista de Espera', 'Lista de Espera'),
     ]
     
+    # Estado, quién lo cambió y cuándo (apps.common.bulk.status_changes)
+    BULK_STATUS_FIELDS = ('status', 'reviewed_by', 'review_date')
+    
     # MASCOTA
     pet = models.ForeignKey(
         Pet,
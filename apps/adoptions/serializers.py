@@ -1,5 +1,6 @@
 from rest_framework import serializers
 from .models import AdoptionApplication, PersonalReference
+from apps.common.serializers import FastListSerializer
 from apps.pets.serializers import PetListSerializer
 from .models import AdoptionApplication, PersonalReference, SimplifiedAdoptionRequest
 
@@ -32,6 +33,10 @@ class AdoptionApplicationListSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'created_at']
 
 
+# Mismo JSON que AdoptionApplicationListSerializer, generado desde .values()
+fast_adoption_application_list_serializer = FastListSerializer(AdoptionApplicationListSerializer)
+
+
 class AdoptionApplicationDetailSerializer(serializers.ModelSerializer):
     """
     Serializer completo para detalle de solicitud
@@ -49,6 +54,15 @@ class AdoptionApplicationDetailSerializer(serializers.ModelSerializer):
         fields = '__all__'
         read_only_fields = ['id', 'created_at', 'updated_at', 'reviewed_by', 'review_date']
 
+    def validate_application_status(self, value):
+        # La aprobación bloquea la mascota y resuelve las demás solicitudes
+        # (services.approve_application): solo por update_status
+        if value == 'Aprobada' and getattr(self.instance, 'application_status', None) != 'Aprobada':
+            raise serializers.ValidationError(
+                'Para aprobar usa PATCH /api/adoptions/applications/{id}/update_status/'
+            )
+        return value
+
 
 class AdoptionApplicationCreateSerializer(serializers.ModelSerializer):
     """
@@ -103,9 +117,16 @@ class AdoptionApplicationUpdateStatusSerializer(serializers.ModelSerializer):
     """
     Serializer para que los administradores actualicen el estado
     """
+    # Al aprobar: qué hacer con las demás solicitudes abiertas de la misma mascota
+    competing_applications = serializers.ChoiceField(
+        choices=[('Rechazada', 'Rechazar'), ('Lista de Espera', 'Lista de espera')],
+        default='Rechazada',
+        write_only=True
+    )
+    
     class Meta:
         model = AdoptionApplication
-        fields = ['application_status', 'admin_notes']
+        fields = ['application_status', 'admin_notes', 'competing_applications']
     
     def update(self, instance, validated_data):
         from django.utils import timezone
@@ -118,7 +139,7 @@ class AdoptionApplicationUpdateStatusSerializer(serializers.ModelSerializer):
             instance.reviewed_by = self.context['request'].user
             instance.review_date = timezone.now()
         
-        instance.save()
+        instance.save_fields('application_status', 'admin_notes', 'reviewed_by', 'review_date')
         return instance
 
 
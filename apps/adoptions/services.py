@@ -0,0 +1,114 @@
+"""
+Aprobación de solicitudes de adopción
+
+approve_application hace todo el cambio en una sola transacción:
+
+1. bloquea la mascota (select_for_update): dos aprobaciones simultáneas para
+   la misma mascota se ejecutan una después de la otra
+2. aprueba la solicitud y marca la mascota como adoptada (un save con
+   update_fields)
+3. rechaza o pasa a lista de espera, con un solo UPDATE por tabla, las demás
+   solicitudes abiertas de esa mascota
+
+La segunda aprobación encuentra la mascota adoptada y falla con
+AdoptionConflict. Si la base de datos aborta la transacción por un bloqueo
+(deadlock en MySQL, "database is locked" en SQLite) se reintenta.
+"""
+import random
+import time
+
+from django.db import OperationalError, transaction
+from django.utils import timezone
+from apps.common.counters import update_with_counters
+from apps.common.tasks import enqueue
+from apps.pets.models import Pet
+from .models import AdoptionApplication, SimplifiedAdoptionRequest
+from .tasks import notify_applicants
+
+
+# Solicitudes que todavía esperan una decisión
+OPEN_STATUSES = ['Recibida', 'En Revisión']
+
+# Estados posibles para las solicitudes que compiten por la misma mascota
+COMPETING_STATUSES = ['Rechazada', 'Lista de Espera']
+
+# Errores de bloqueo: MySQL 1213 (deadlock) y 1205 (espera agotada); SQLite por mensaje
+LOCK_ERROR_CODES = {1205, 1213}
+LOCK_RETRIES = 5
+
+
+class AdoptionConflict(Exception):
+    """
+    La mascota ya fue adoptada o tiene otra solicitud aprobada
+    """
+
+
+def is_lock_error(error):
+    code = error.args[0] if error.args else None
+    return code in LOCK_ERROR_CODES or 'locked' in str(error).lower()
+
+
+def approve_application(application_id, reviewer, admin_notes=None, competing='Rechazada'):
+    """
+    Aprobar la solicitud; retorna (solicitud, {modelo: [pk de solicitudes en competencia]})
+    """
+    if competing not in COMPETING_STATUSES:
+        raise ValueError(f'Estado inválido para las demás solicitudes: {competing}')
+
+    for attempt in range(LOCK_RETRIES):
+        try:
+            return _approve(application_id, reviewer, admin_notes, competing)
+        except OperationalError as error:
+            if attempt == LOCK_RETRIES - 1 or not is_lock_error(error):
+                raise
+            time.sleep(random.uniform(0.01, 0.05) * 2 ** attempt)
+
+
+def _approve(application_id, reviewer, admin_notes, competing):
+    now = timezone.now()
+    with transaction.atomic():
+        pet_id = AdoptionApplication.objects.values_list('pet_id', flat=True).get(pk=application_id)
+        # Siempre primero la mascota y después la solicitud: mismo orden de bloqueo
+        pet = Pet.objects.select_for_update().get(pk=pet_id)
+        application = AdoptionApplication.objects.select_for_update().get(pk=application_id)
+
+        if application.application_status == 'Aprobada':
+            return application, {}
+        other_approved = (
+            AdoptionApplication.objects.filter(pet=pet, application_status='Aprobada').exists()
+            or SimplifiedAdoptionRequest.objects.filter(pet=pet, status='Aprobada').exists()
+        )
+        if pet.status == 'adopted' or other_approved:
+            raise AdoptionConflict(f'{pet.name} ya fue adoptada o tiene otra solicitud aprobada')
+
+        # La mascota se actualiza antes que la solicitud: la tarea que encola la
+        # señal de la solicitud (mark_pet_adopted) la encuentra ya adoptada
+        pet.status = 'adopted'
+        pet.adoption_date = now.date()
+        pet.save(update_fields=['status', 'adoption_date', 'updated_at'])
+
+        application.application_status = 'Aprobada'
+        application.reviewed_by = reviewer
+        application.review_date = now
+        fields = ['application_status', 'reviewed_by', 'review_date', 'updated_at']
+        if admin_notes is not None:
+            application.admin_notes = admin_notes
+            fields.append('admin_notes')
+        application.save(update_fields=fields)
+
+        review = {'reviewed_by': reviewer, 'review_date': now, 'updated_at': now}
+        others = {
+            AdoptionApplication: update_with_counters(
+                AdoptionApplication.objects.filter(pet=pet, application_status__in=OPEN_STATUSES),
+                application_status=competing, **review
+            ),
+            SimplifiedAdoptionRequest: update_with_counters(
+                SimplifiedAdoptionRequest.objects.filter(pet=pet, status__in=OPEN_STATUSES),
+                status=competing, **review
+            ),
+        }
+        if competing == 'Rechazada':
+            for model, pks in others.items():
+                if pks:
+                    enqueue(notify_applicants, model=model._meta.label, pks=pks, status=competing)
+        return application, others
@@ -1,28 +1,41 @@
 from django.db.models.signals import post_save
-from django.dispatch import receiver
-from django.utils import timezone
+from apps.common.tasks import enqueue
 from .models import SimplifiedAdoptionRequest, AdoptionApplication
+from .tasks import mark_pet_adopted, notify_applicant, notify_new_application
 
 
-@receiver(post_save, sender=SimplifiedAdoptionRequest)
-def update_pet_status_on_approval(sender, instance, **kwargs):
-    """
-    Cuando una solicitud se aprueba, actualizar el estado de la mascota
-    """
-    if instance.status == 'Aprobada':
-        pet = instance.pet
-        pet.status = 'adopted'
-        pet.adoption_date = timezone.now().date()
-        pet.save()
+# Modelo -> campo de estado de la solicitud
+STATUS_FIELDS = {
+    AdoptionApplication: 'application_status',
+    SimplifiedAdoptionRequest: 'status',
+}
 
 
-@receiver(post_save, sender=AdoptionApplication)
-def update_pet_status_on_full_application_approval(sender, instance, **kwargs):
+def queue_application_side_effects(sender, instance, created, **kwargs):
     """
-    Para el formulario completo también
+    Encolar los efectos de guardar una solicitud, fuera del request
+
+    Las claves de idempotencia evitan repetir el trabajo cuando la solicitud
+    se guarda de nuevo con el mismo estado.
     """
-    if instance.application_status == 'Aprobada':
-        pet = instance.pet
-        pet.status = 'adopted'
-        pet.adoption_date = timezone.now().date()
-        pet.save()
\ No newline at end of file
+    label = sender._meta.label
+    status = getattr(instance, STATUS_FIELDS[sender])
+
+    if created:
+        enqueue(notify_new_application, key=f'new-application:{label}:{instance.pk}',
+                model=label, pk=instance.pk)
+
+    # Cuando una solicitud se aprueba, actualizar el estado de la mascota
+    if status == 'Aprobada':
+        enqueue(mark_pet_adopted, key=f'pet-adopted:{label}:{instance.pk}', pet_id=instance.pet_id)
+
+    if status in ('Aprobada', 'Rechazada'):
+        enqueue(notify_applicant, key=f'notify-applicant:{label}:{instance.pk}:{status}',
+                model=label, pk=instance.pk, status=status)
+
+
+for model in STATUS_FIELDS:
+    post_save.connect(
+        queue_application_side_effects, sender=model,
+        dispatch_uid=f'adoption_side_effects_{model._meta.label}'
+    )
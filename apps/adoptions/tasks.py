@@ -0,0 +1,91 @@
+"""
+Tareas en segundo plano del flujo de adopción (ver apps.common.tasks)
+"""
+from django.apps import apps
+from django.conf import settings
+from django.core.mail import send_mail, send_mass_mail
+from django.utils import timezone
+from apps.common.tasks import task
+from apps.pets.models import Pet
+
+
+STATUS_MESSAGES = {
+    'Aprobada': (
+        'Tu solicitud de adopción fue aprobada',
+        'Hola {name}:\n\n¡Tu solicitud para adoptar a {pet} fue aprobada! '
+        'Nos pondremos en contacto contigo para coordinar la entrega.\n\nHuellitas'
+    ),
+    'Rechazada': (
+        'Respuesta a tu solicitud de adopción',
+        'Hola {name}:\n\nGracias por tu interés en adoptar a {pet}. En esta ocasión '
+        'tu solicitud no fue aprobada; te invitamos a conocer a otras mascotas '
+        'disponibles.\n\nHuellitas'
+    ),
+}
+
+
+@task()
+def mark_pet_adopted(pet_id):
+    """
+    Marcar la mascota como adoptada al aprobar una solicitud
+    """
+    pet = Pet.objects.filter(pk=pet_id).first()
+    if pet is None or pet.status == 'adopted':
+        return
+    pet.status = 'adopted'
+    pet.adoption_date = timezone.now().date()
+    pet.save(update_fields=['status', 'adoption_date', 'updated_at'])
+
+
+def status_email(application, status):
+    """
+    (asunto, cuerpo, remitente, destinatarios) del aviso de decisión, o None
+    """
+    if not application.email or status not in STATUS_MESSAGES:
+        return None
+    subject, body = STATUS_MESSAGES[status]
+    return (
+        subject,
+        body.format(name=application.full_name, pet=application.pet.name),
+        settings.DEFAULT_FROM_EMAIL,
+        [application.email],
+    )
+
+
+@task()
+def notify_applicant(model, pk, status):
+    """
+    Avisar al solicitante por correo que su solicitud fue aprobada o rechazada
+    """
+    application = apps.get_model(model).objects.select_related('pet').filter(pk=pk).first()
+    message = status_email(application, status) if application else None
+    if message:
+        send_mail(*message)
+
+
+@task()
+def notify_applicants(model, pks, status):
+    """
+    Avisar a varios solicitantes con una sola conexión SMTP (rechazos en bloque)
+    """
+    applications = apps.get_model(model).objects.select_related('pet').filter(pk__in=pks)
+    messages = [status_email(application, status) for application in applications]
+    send_mass_mail([message for message in messages if message])
+
+
+@task()
+def notify_new_application(model, pk):
+    """
+    Avisar al equipo (ADOPTION_NOTIFICATION_EMAILS) de una solicitud nueva
+    """
+    recipients = getattr(settings, 'ADOPTION_NOTIFICATION_EMAILS', [])
+    application = apps.get_model(model).objects.select_related('pet').filter(pk=pk).first()
+    if application is None or not recipients:
+        return
+    send_mail(
+        f'Nueva solicitud de adopción: {application.pet.name}',
+        f'{application.full_name} envió una solicitud para adoptar a {application.pet.name}.\n'
+        f'Revísala en el panel de administración (solicitud #{application.pk}).',
+        settings.DEFAULT_FROM_EMAIL,
+        recipients,
+    )
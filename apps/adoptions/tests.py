@@ -1,3 +1,272 @@
-from django.test import TestCase
+import threading
 
-# Create your tests here.
+from django.core import mail
+from django.db import connection, connections
+from django.db.models import BooleanField
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from apps.authentication.models import AdminUser
+from apps.common.counters import find_drift, rebuild_counters
+from apps.common.models import Task
+from apps.common.tasks import run_pending
+from apps.pets.models import Pet
+from .models import AdoptionApplication, SimplifiedAdoptionRequest
+from .services import AdoptionConflict, approve_application
+
+
+def make_application(pet, name):
+    """
+    Solicitud completa con todos los compromisos aceptados
+    """
+    booleans = {
+        field.name: True for field in AdoptionApplication._meta.fields
+        if isinstance(field, BooleanField) and not field.has_default()
+    }
+    return AdoptionApplication.objects.create(
+        pet=pet, full_name=name, age=30, email=f'{name.split()[0].lower()}@example.com',
+        cell_phone='5555-5555', adults_in_home=2, **booleans
+    )
+
+
+@override_settings(ADOPTION_NOTIFICATION_EMAILS=['equipo@example.com'])
+class AdoptionSideEffectTaskTests(TestCase):
+    """
+    Los efectos de aprobar una solicitud se ejecutan como tareas, una sola vez
+    """
+
+    def setUp(self):
+        self.pet = Pet.objects.create(name='Luna', gender='F', size='small')
+
+    def make_request(self, **fields):
+        return SimplifiedAdoptionRequest.objects.create(
+            pet=self.pet, full_name='Ana López', pet_name_requested='Luna', phone='55555555',
+            email='ana@example.com', filled_form_pdf='adoptions/simplified_forms/ana.pdf', **fields
+        )
+
+    def test_approval_marks_pet_adopted_and_notifies_once(self):
+        application = self.make_request()
+        self.assertEqual([message.to for message in mail.outbox], [['equipo@example.com']])
+
+        application.status = 'Aprobada'
+        application.save()
+        application.save()
+
+        self.pet.refresh_from_db()
+        self.assertEqual(self.pet.status, 'adopted')
+        self.assertIsNotNone(self.pet.adoption_date)
+        self.assertEqual(len(mail.outbox), 2)
+        self.assertEqual(mail.outbox[1].to, ['ana@example.com'])
+        self.assertIn('aprobada', mail.outbox[1].subject)
+        self.assertEqual(Task.objects.filter(status='done').count(), 3)
+
+    @override_settings(TASKS_EAGER=False)
+    def test_request_only_queues_the_work(self):
+        application = self.make_request()
+        application.status = 'Aprobada'
+        application.save()
+
+        self.pet.refresh_from_db()
+        self.assertEqual(self.pet.status, 'available')
+        self.assertEqual(mail.outbox, [])
+        self.assertEqual(Task.objects.filter(status='pending').count(), 3)
+
+        self.assertEqual(run_pending(), 3)
+        self.pet.refresh_from_db()
+        self.assertEqual(self.pet.status, 'adopted')
+        self.assertEqual(len(mail.outbox), 2)
+
+
+class AdoptionApprovalServiceTests(TestCase):
+    """
+    Aprobar una solicitud adopta la mascota y cierra en bloque las demás
+    """
+
+    def setUp(self):
+        self.admin = AdminUser.objects.create_user(username='revisor', password='x', role='super_admin')
+        self.pet = Pet.objects.create(name='Toby', gender='M', size='medium')
+        self.applications = [make_application(self.pet, name) for name in ('Ana López', 'Luis Pérez', 'Eva Ruiz')]
+        SimplifiedAdoptionRequest.objects.create(
+            pet=self.pet, full_name='Sofía García', pet_name_requested='Toby', phone='55555555',
+            email='sofia@example.com', filled_form_pdf='adoptions/simplified_forms/sofia.pdf'
+        )
+        rebuild_counters()
+        mail.outbox = []
+
+    def test_approval_rejects_competitors_in_bulk(self):
+        chosen, *others = self.applications
+        with CaptureQueriesContext(connection) as context:
+            application, competing = approve_application(chosen.pk, self.admin, admin_notes='Todo en orden')
+
+        self.assertEqual(application.application_status, 'Aprobada')
+        self.pet.refresh_from_db()
+        self.assertEqual(self.pet.status, 'adopted')
+        self.assertEqual(sorted(competing[AdoptionApplication]), sorted(other.pk for other in others))
+        self.assertEqual(
+            set(AdoptionApplication.objects.exclude(pk=chosen.pk).values_list('application_status', flat=True)),
+            {'Rechazada'}
+        )
+        self.assertEqual(SimplifiedAdoptionRequest.objects.get().status, 'Rechazada')
+        self.assertEqual(find_drift(), [])
+
+        updates = [query['sql'] for query in context.captured_queries if query['sql'].startswith('UPDATE')]
+        pet_updates = [sql for sql in updates if sql.startswith('UPDATE "pets_pet"')]
+        application_updates = [sql for sql in updates if sql.startswith('UPDATE "adoptions_adoptionapplication"')]
+        self.assertEqual(len(pet_updates), 1)
+        # La aprobada y, en un solo UPDATE, las que compiten
+        self.assertEqual(len(application_updates), 2)
+
+        # Aprobada + 2 rechazos completos + 1 simplificado
+        self.assertEqual(sorted(message.to[0] for message in mail.outbox), [
+            'ana@example.com', 'eva@example.com', 'luis@example.com', 'sofia@example.com'
+        ])
+
+    def test_waitlist_keeps_competitors_without_notifying(self):
+        approve_application(self.applications[0].pk, self.admin, competing='Lista de Espera')
+        self.assertEqual(
+            AdoptionApplication.objects.filter(application_status='Lista de Espera').count(), 2
+        )
+        self.assertEqual([message.to for message in mail.outbox], [['ana@example.com']])
+
+    def test_second_approval_conflicts(self):
+        approve_application(self.applications[0].pk, self.admin)
+        other = self.applications[1]
+        AdoptionApplication.objects.filter(pk=other.pk).update(application_status='En Revisión')
+        with self.assertRaises(AdoptionConflict):
+            approve_application(other.pk, self.admin)
+
+        client = APIClient()
+        client.force_authenticate(self.admin)
+        response = client.patch(
+            f'/api/adoptions/applications/{other.pk}/update_status/',
+            {'application_status': 'Aprobada'}, format='json'
+        )
+        self.assertEqual(response.status_code, 409)
+        other.refresh_from_db()
+        self.assertEqual(other.application_status, 'En Revisión')
+
+    def test_plain_update_cannot_approve(self):
+        client = APIClient()
+        client.force_authenticate(self.admin)
+        application = self.applications[0]
+        response = client.patch(
+            f'/api/adoptions/applications/{application.pk}/', {'application_status': 'Aprobada'}, format='json'
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('application_status', response.data)
+        application.refresh_from_db()
+        self.assertNotEqual(application.application_status, 'Aprobada')
+        self.pet.refresh_from_db()
+        self.assertEqual(self.pet.status, 'available')
+
+        # Otros cambios de la solicitud siguen permitidos
+        response = client.patch(
+            f'/api/adoptions/applications/{application.pk}/', {'application_status': 'En Revisión'}, format='json'
+        )
+        self.assertEqual(response.status_code, 200)
+
+    def test_update_status_endpoint_approves_through_the_service(self):
+        client = APIClient()
+        client.force_authenticate(self.admin)
+        response = client.patch(
+            f'/api/adoptions/applications/{self.applications[1].pk}/update_status/',
+            {'application_status': 'Aprobada', 'competing_applications': 'Lista de Espera'}, format='json'
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['competing_applications'], {'status': 'Lista de Espera', 'count': 3})
+        self.pet.refresh_from_db()
+        self.assertEqual(self.pet.status, 'adopted')
+
+
+class ConcurrentApprovalTests(TransactionTestCase):
+    """
+    Dos administradores aprueban a la vez solicitudes distintas de la misma mascota
+    """
+
+    def test_only_one_concurrent_approval_wins(self):
+        admin = AdminUser.objects.create_user(username='revisor', password='x', role='super_admin')
+        pet = Pet.objects.create(name='Kira', gender='F', size='small')
+        applications = [make_application(pet, f'Solicitante {index}') for index in range(4)]
+
+        barrier = threading.Barrier(len(applications))
+        results = {}
+
+        def approve(application):
+            try:
+                barrier.wait()
+                approve_application(application.pk, admin)
+                results[application.pk] = 'approved'
+            except AdoptionConflict:
+                results[application.pk] = 'conflict'
+            finally:
+                connections.close_all()
+
+        threads = [threading.Thread(target=approve, args=(application,)) for application in applications]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(sorted(results.values()), ['approved', 'conflict', 'conflict', 'conflict'])
+        winner = next(pk for pk, result in results.items() if result == 'approved')
+        statuses = dict(AdoptionApplication.objects.values_list('pk', 'application_status'))
+        self.assertEqual(statuses.pop(winner), 'Aprobada')
+        self.assertEqual(set(statuses.values()), {'Rechazada'})
+        self.assertEqual(Pet.objects.get(pk=pet.pk).status, 'adopted')
+        self.assertEqual(find_drift(), [])
+
+
+
+class AdoptionBulkStatusTests(TestCase):
+    """
+    Rechazar o revisar solicitudes en bloque
+    """
+
+    def setUp(self):
+        self.admin = AdminUser.objects.create_user(username='revisor', password='x', role='admin')
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+        self.pet = Pet.objects.create(name='Toby', gender='M', size='medium')
+        self.applications = [make_application(self.pet, name) for name in ('Ana López', 'Luis Pérez')]
+        self.simplified = SimplifiedAdoptionRequest.objects.create(
+            pet=self.pet, full_name='Sofía García', pet_name_requested='Toby', phone='55555555',
+            email='sofia@example.com', filled_form_pdf='adoptions/simplified_forms/sofia.pdf'
+        )
+        rebuild_counters()
+        mail.outbox = []
+
+    def test_bulk_reject_sets_review_and_notifies_once(self):
+        response = self.client.post(
+            '/api/adoptions/applications/bulk_status/',
+            {'ids': [application.pk for application in self.applications], 'status': 'Rechazada'},
+            format='json'
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['count'], 2)
+        for application in AdoptionApplication.objects.all():
+            self.assertEqual(application.application_status, 'Rechazada')
+            self.assertEqual(application.reviewed_by, self.admin)
+            self.assertIsNotNone(application.review_date)
+        self.assertEqual(Task.objects.filter(name='apps.adoptions.tasks.notify_applicants').count(), 1)
+        self.assertEqual(find_drift(), [])
+
+    def test_bulk_approval_is_not_allowed(self):
+        response = self.client.post(
+            '/api/adoptions/applications/bulk_status/',
+            {'ids': [self.applications[0].pk], 'status': 'Aprobada'},
+            format='json'
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(AdoptionApplication.objects.filter(application_status='Aprobada').exists())
+
+    def test_simplified_bulk_status_by_filter(self):
+        response = self.client.post(
+            '/api/adoptions/simplified/bulk_status/',
+            {'filter': {'pet': str(self.pet.pk)}, 'status': 'En Revisión'},
+            format='json'
+        )
+        self.assertEqual(response.data['results'], [{'id': self.simplified.pk, 'result': 'updated'}])
+        self.simplified.refresh_from_db()
+        self.assertEqual(self.simplified.status, 'En Revisión')
+        self.assertEqual(self.simplified.reviewed_by, self.admin)
@@ -1,25 +1,56 @@
 from rest_framework import viewsets, status, filters
 from rest_framework.decorators import action, api_view, permission_classes
 from rest_framework.response import Response
-from rest_framework.permissions import IsAuthenticated, AllowAny
+from rest_framework.permissions import AllowAny
 from django_filters.rest_framework import DjangoFilterBackend
 from django.http import FileResponse, Http404
 from django.conf import settings
 import os
 
 from .models import AdoptionApplication, PersonalReference, SimplifiedAdoptionRequest
+from .services import AdoptionConflict, approve_application
+from .tasks import notify_applicants
 from .serializers import (
     AdoptionApplicationListSerializer,
     AdoptionApplicationDetailSerializer,
     AdoptionApplicationCreateSerializer,
     AdoptionApplicationUpdateStatusSerializer,
     PersonalReferenceSerializer,
-    SimplifiedAdoptionRequestSerializer
+    SimplifiedAdoptionRequestSerializer,
+    fast_adoption_application_list_serializer
 )
-from apps.common.permissions import IsAdminUser
+from apps.common.permissions import PUBLIC, HasCapability
+from apps.authentication.activity import ActivityLogMixin
+from apps.common.mixins import BulkStatusMixin, FastListMixin, SerializerTimingMixin, SoftDeleteMixin
+from apps.common.tasks import enqueue
 
 
-class AdoptionApplicationViewSet(viewsets.ModelViewSet):
+class ApplicationBulkStatusMixin(ActivityLogMixin, BulkStatusMixin):
+    """
+    Cambio de estado en bloque y registro de actividad para solicitudes
+
+    La aprobación bloquea la mascota y cierra las demás solicitudes
+    (update_status), así que no se aplica en bloque. Los rechazados reciben
+    un solo aviso por correo en segundo plano.
+    """
+    bulk_status_exclude = ('Aprobada',)
+    activity_actions = dict.fromkeys(
+        ['update', 'partial_update', 'destroy', 'bulk_delete', 'bulk_restore'], 'update_adoption'
+    )
+
+    def activity_action(self, request, response):
+        if self.action in ('update_status', 'bulk_status'):
+            new_status = request.data.get('application_status') or request.data.get('status')
+            return {'Aprobada': 'approve_adoption', 'Rechazada': 'reject_adoption'}.get(new_status, 'update_adoption')
+        return super().activity_action(request, response)
+
+    def bulk_status_done(self, pks, value):
+        if value == 'Rechazada':
+            model = self.get_queryset().model
+            enqueue(notify_applicants, model=model._meta.label, pks=pks, status=value)
+
+
+class AdoptionApplicationViewSet(SoftDeleteMixin, ApplicationBulkStatusMixin, FastListMixin, viewsets.ModelViewSet):
     """
     ViewSet para gestionar solicitudes de adopción (formulario completo)
     
@@ -28,13 +59,19 @@ class AdoptionApplicationViewSet(viewsets.ModelViewSet):
     create: POST /api/adoptions/applications/ - Crear solicitud (público)
     update: PUT /api/adoptions/applications/{id}/ - Actualizar solicitud (admin)
     partial_update: PATCH /api/adoptions/applications/{id}/ - Actualizar parcial (admin)
+    bulk_status: POST /api/adoptions/applications/bulk_status/ - Cambiar estado en bloque (admin)
     """
+    permission_classes = [HasCapability]
+    required_capability = 'adoptions'
+    action_capabilities = {'create': PUBLIC}
     queryset = AdoptionApplication.objects.all()
     filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
     filterset_fields = ['application_status', 'pet', 'dwelling_type', 'adoption_purpose']
     search_fields = ['full_name', 'email', 'cell_phone', 'pet__name']
     ordering_fields = ['created_at', 'full_name']
     ordering = ['-created_at']
+    bulk_status_fields = AdoptionApplication.BULK_STATUS_FIELDS
+    fast_list_serializer = fast_adoption_application_list_serializer
     
     def get_serializer_class(self):
         if self.action == 'create':
@@ -45,14 +82,6 @@ class AdoptionApplicationViewSet(viewsets.ModelViewSet):
             return AdoptionApplicationUpdateStatusSerializer
         return AdoptionApplicationDetailSerializer
     
-    def get_permissions(self):
-        # Solo 'create' es público, el resto requiere autenticación
-        if self.action == 'create':
-            permission_classes = [AllowAny]
-        else:
-            permission_classes = [IsAuthenticated, IsAdminUser]
-        return [permission() for permission in permission_classes]
-    
     def get_queryset(self):
         queryset = AdoptionApplication.objects.select_related('pet', 'reviewed_by').prefetch_related('references')
         
@@ -80,15 +109,17 @@ class AdoptionApplicationViewSet(viewsets.ModelViewSet):
         
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
     
-    @action(detail=True, methods=['patch'], permission_classes=[IsAuthenticated, IsAdminUser])
+    @action(detail=True, methods=['patch'])
     def update_status(self, request, pk=None):
         """
         Actualizar el estado de una solicitud
         PATCH /api/adoptions/applications/{id}/update_status/
         Body: {
             "application_status": "Aprobada",
-            "admin_notes": "Cumple con todos los requisitos"
+            "admin_notes": "Cumple con todos los requisitos",
+            "competing_applications": "Rechazada"  (o "Lista de Espera")
         }
+        Al aprobar, la mascota pasa a adoptada; si ya lo estaba responde 409
         """
         application = self.get_object()
         serializer = AdoptionApplicationUpdateStatusSerializer(
@@ -97,23 +128,35 @@ class AdoptionApplicationViewSet(viewsets.ModelViewSet):
             context={'request': request}
         )
         
-        if serializer.is_valid():
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        
+        new_status = serializer.validated_data.get('application_status')
+        competing = serializer.validated_data['competing_applications']
+        response = {'message': 'Estado actualizado exitosamente'}
+        
+        if new_status == 'Aprobada':
+            # Transacción con bloqueo de la mascota; las demás solicitudes se cierran en bloque
+            try:
+                application, others = approve_application(
+                    application.pk,
+                    request.user,
+                    admin_notes=serializer.validated_data.get('admin_notes'),
+                    competing=competing
+                )
+            except AdoptionConflict as error:
+                return Response({'error': str(error)}, status=status.HTTP_409_CONFLICT)
+            response['competing_applications'] = {
+                'status': competing,
+                'count': sum(len(pks) for pks in others.values())
+            }
+        else:
             serializer.save()
-            
-            # Si se aprueba, actualizar el estado de la mascota
-            if serializer.validated_data.get('application_status') == 'Aprobada':
-                pet = application.pet
-                pet.status = 'in_process'
-                pet.save()
-            
-            return Response({
-                'message': 'Estado actualizado exitosamente',
-                'data': AdoptionApplicationDetailSerializer(application).data
-            })
         
-        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        response['data'] = AdoptionApplicationDetailSerializer(application).data
+        return Response(response)
     
-    @action(detail=False, methods=['get'], permission_classes=[IsAuthenticated, IsAdminUser])
+    @action(detail=False, methods=['get'])
     def pending(self, request):
         """
         Obtener solicitudes pendientes
@@ -123,7 +166,7 @@ class AdoptionApplicationViewSet(viewsets.ModelViewSet):
         serializer = AdoptionApplicationListSerializer(applications, many=True)
         return Response(serializer.data)
     
-    @action(detail=False, methods=['get'], permission_classes=[IsAuthenticated, IsAdminUser])
+    @action(detail=False, methods=['get'])
     def statistics(self, request):
         """
         Estadísticas de solicitudes
@@ -143,7 +186,7 @@ class AdoptionApplicationViewSet(viewsets.ModelViewSet):
             'rejected': rejected
         })
     
-    @action(detail=True, methods=['get'], permission_classes=[IsAuthenticated, IsAdminUser])
+    @action(detail=True, methods=['get'])
     def references(self, request, pk=None):
         """
         Obtener referencias de una solicitud
@@ -153,35 +196,27 @@ class AdoptionApplicationViewSet(viewsets.ModelViewSet):
         references = application.references.all()
         serializer = PersonalReferenceSerializer(references, many=True)
         return Response(serializer.data)
-    
-    def perform_destroy(self, instance):
-        # Soft delete
-        instance.is_active = False
-        instance.save()
 
 
-class SimplifiedAdoptionRequestViewSet(viewsets.ModelViewSet):
+class SimplifiedAdoptionRequestViewSet(SoftDeleteMixin, ApplicationBulkStatusMixin, SerializerTimingMixin, viewsets.ModelViewSet):
     """
     ViewSet para solicitudes simplificadas (formulario PDF)
     
     create: POST /api/adoptions/simplified/ - Enviar solicitud (público)
     list: GET /api/adoptions/simplified/ - Listar (admin)
     retrieve: GET /api/adoptions/simplified/{id}/ - Ver detalle (admin)
+    bulk_status: POST /api/adoptions/simplified/bulk_status/ - Cambiar estado en bloque (admin)
     """
+    permission_classes = [HasCapability]
+    required_capability = 'adoptions'
+    action_capabilities = {'create': PUBLIC}
     queryset = SimplifiedAdoptionRequest.objects.all()
     serializer_class = SimplifiedAdoptionRequestSerializer
     filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
     filterset_fields = ['status', 'pet']
     search_fields = ['full_name', 'phone', 'pet__name']
     ordering = ['-created_at']
-    
-    def get_permissions(self):
-        # Solo 'create' es público
-        if self.action == 'create':
-            permission_classes = [AllowAny]
-        else:
-            permission_classes = [IsAuthenticated, IsAdminUser]
-        return [permission() for permission in permission_classes]
+    bulk_status_fields = SimplifiedAdoptionRequest.BULK_STATUS_FIELDS
     
     def create(self, request, *args, **kwargs):
         """
@@ -218,4 +253,4 @@ def download_adoption_form(request):
             content_type='application/pdf'
         )
     else:
-        raise Http404("El formulario no está disponible en este momento.")
\ No newline at end of file
+        raise Http404("El formulario no está disponible en este momento.")
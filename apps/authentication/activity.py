@@ -0,0 +1,181 @@
+"""
+Registro de actividad de los administradores en lotes
+
+record_activity no escribe en el request: agrega la entrada a un buffer del
+proceso que se vuelca con un solo bulk_create cuando junta
+ACTIVITY_LOG_BATCH_SIZE entradas o cuando la más antigua lleva
+ACTIVITY_LOG_FLUSH_INTERVAL segundos esperando (un hilo en segundo plano
+revisa el buffer aunque no lleguen más requests). Al terminar el proceso
+(atexit, y worker_exit en gunicorn.conf.py) se vuelca lo pendiente.
+
+La entrada se agrega cuando la transacción del request se confirma; created_at
+es el momento del volcado, a lo sumo unos segundos después de la acción.
+"""
+import atexit
+import logging
+import os
+import threading
+import time
+
+from django.conf import settings
+from django.db import connections, transaction
+
+from apps.common.utils import get_client_ip
+from .models import AdminActivityLog
+
+
+logger = logging.getLogger(__name__)
+
+
+class ActivityLogBuffer:
+    """
+    Entradas de AdminActivityLog pendientes de guardar en el proceso actual
+    """
+
+    def __init__(self, batch_size=50, flush_interval=5, max_pending=1000):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self.pid = os.getpid()
+        self.lock = threading.Lock()
+        self.flush_lock = threading.Lock()
+        self.entries = []
+        self.oldest = None
+        self.timer = None
+
+    def add(self, entry):
+        with self.lock:
+            if not self.entries:
+                self.oldest = time.monotonic()
+            self.entries.append(entry)
+            full = len(self.entries) >= self.batch_size
+        if full:
+            self.flush()
+        else:
+            self.start_timer()
+
+    def due(self):
+        return self.oldest is not None and time.monotonic() - self.oldest >= self.flush_interval
+
+    def take(self):
+        with self.lock:
+            entries, self.entries, self.oldest = self.entries, [], None
+        return entries
+
+    def flush(self):
+        """
+        Guardar las entradas pendientes; retorna cuántas se guardaron
+        """
+        with self.flush_lock:
+            entries = self.take()
+            if not entries:
+                return 0
+            try:
+                AdminActivityLog.objects.bulk_create(entries, batch_size=self.batch_size)
+            except Exception:
+                logger.exception('No se pudo guardar el registro de actividad (%s entradas)', len(entries))
+                self.restore(entries)
+                return 0
+            return len(entries)
+
+    def restore(self, entries):
+        # Se reintenta en el siguiente volcado; si la base de datos no responde
+        # por mucho tiempo se descartan las más antiguas
+        with self.lock:
+            self.entries = (entries + self.entries)[-self.max_pending:]
+            self.oldest = time.monotonic()
+
+    def start_timer(self):
+        with self.lock:
+            if self.timer is not None and self.timer.is_alive():
+                return
+            self.timer = threading.Thread(target=self.run_timer, name='activity-log', daemon=True)
+        self.timer.start()
+
+    def run_timer(self):
+        try:
+            while True:
+                time.sleep(self.flush_interval)
+                if self.due():
+                    self.flush()
+                with self.lock:
+                    if not self.entries:
+                        self.timer = None
+                        return
+        finally:
+            # Conexiones propias de este hilo
+            connections.close_all()
+
+
+_buffer = None
+_buffer_lock = threading.Lock()
+
+
+def get_buffer():
+    """
+    Buffer del proceso actual; se crea de nuevo tras un fork (preload_app)
+    """
+    global _buffer
+    if _buffer is None or _buffer.pid != os.getpid():
+        with _buffer_lock:
+            if _buffer is None or _buffer.pid != os.getpid():
+                _buffer = ActivityLogBuffer(
+                    getattr(settings, 'ACTIVITY_LOG_BATCH_SIZE', 50),
+                    getattr(settings, 'ACTIVITY_LOG_FLUSH_INTERVAL', 5),
+                )
+    return _buffer
+
+
+def flush_activity():
+    if _buffer is not None and _buffer.pid == os.getpid():
+        return _buffer.flush()
+    return 0
+
+
+atexit.register(flush_activity)
+
+
+def record_activity(request, action, description='', user=None):
+    """
+    Registrar una acción del administrador (por defecto, request.user)
+    """
+    user = user or request.user
+    entry = AdminActivityLog(
+        user_id=user.pk,
+        action=action,
+        description=description,
+        ip_address=get_client_ip(request)
+    )
+    transaction.on_commit(lambda: get_buffer().add(entry))
+
+
+class ActivityLogMixin:
+    """
+    Registrar en AdminActivityLog las mutaciones exitosas del ViewSet
+
+        activity_actions = {'create': 'create_pet', 'destroy': 'delete_pet', ...}
+
+    Las entradas se guardan en lotes (ActivityLogBuffer), así que registrar
+    cada cambio no agrega un INSERT por request.
+    activity_action se puede sobrescribir cuando la acción depende del body.
+    """
+    activity_actions = {}
+
+    def activity_action(self, request, response):
+        return self.activity_actions.get(self.action)
+
+    def activity_description(self, response):
+        meta = self.get_queryset().model._meta
+        data = response.data if isinstance(response.data, dict) else {}
+        if 'results' in data and 'count' in data:
+            return f'{self.action}: {data["count"]} {meta.verbose_name_plural}'
+        pk = self.kwargs.get(self.lookup_url_kwarg or self.lookup_field) or data.get('id')
+        return f'{self.action}: {meta.verbose_name} #{pk}' if pk else f'{self.action}: {meta.verbose_name}'
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        if response.status_code < 400 and request.user.is_authenticated:
+            action = self.activity_action(request, response)
+            if action:
+                record_activity(request, action, self.activity_description(response))
+        return response
@@ -4,4 +4,7 @@ from django.apps import AppConfig
 class AuthenticationConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.authentication'
-    verbose_name = 'Autenticación'
\ No newline at end of file
+    verbose_name = 'Autenticación'
+
+    def ready(self):
+        import apps.authentication.signals
@@ -0,0 +1,100 @@
+"""
+Autenticación por token con caché y vencimiento
+
+TokenAuthentication de DRF consulta authtoken_token JOIN usuario en cada
+request; el panel de administración consulta los dashboards constantemente.
+CachedTokenAuthentication guarda el resultado (usuario y fecha de creación
+del token) durante AUTH_TOKEN_CACHE_TTL segundos. El usuario se guarda sin el
+hash de la contraseña, que en producción terminaría en disco o en la tabla de
+la caché; check_password lo consulta cuando hace falta.
+
+Con CACHE_BACKEND=db leer la entrada también es una consulta, así que ahí la
+caché no ahorra viajes a la base, solo el JOIN.
+
+La entrada se invalida al borrar el token (logout, rotación) y al guardar el
+usuario con cambios de contraseña, rol o estado (ver signals.py). Con varios
+workers la caché debe ser compartida, como en producción; con LocMemCache un
+token borrado puede seguir siendo válido en otro proceso hasta que venza la
+entrada.
+
+Los tokens vencen AUTH_TOKEN_TTL segundos después de crearse (0 = nunca): el
+login entrega uno nuevo si el anterior venció y POST /api/auth/token/refresh/
+lo rota antes de tiempo.
+"""
+import hashlib
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+from rest_framework import exceptions
+from rest_framework.authentication import TokenAuthentication
+from rest_framework.authtoken.models import Token
+
+
+def token_cache_key(key):
+    # La clave del token no se guarda tal cual en la caché
+    return 'auth-token:' + hashlib.sha256(key.encode()).hexdigest()
+
+
+def token_expired(created, now=None):
+    ttl = getattr(settings, 'AUTH_TOKEN_TTL', 0)
+    return bool(ttl) and created + timedelta(seconds=ttl) <= (now or timezone.now())
+
+
+def forget_token(key):
+    cache.delete(token_cache_key(key))
+
+
+def forget_user_tokens(user_id):
+    for key in Token.objects.filter(user_id=user_id).values_list('key', flat=True):
+        forget_token(key)
+
+
+def issue_token(user):
+    """
+    Token vigente del usuario; si venció se reemplaza por uno nuevo
+    """
+    token, created = Token.objects.get_or_create(user=user)
+    if not created and token_expired(token.created):
+        token = rotate_token(user)
+    return token
+
+
+@transaction.atomic
+def rotate_token(user):
+    """
+    Reemplazar el token del usuario; el anterior deja de funcionar
+    """
+    # delete() de cada fila para que post_delete invalide la caché
+    for token in Token.objects.filter(user=user):
+        token.delete()
+    return Token.objects.create(user=user)
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    """
+    TokenAuthentication que resuelve token -> usuario desde la caché
+    """
+
+    def authenticate_credentials(self, key):
+        cache_key = token_cache_key(key)
+        cached = cache.get(cache_key)
+        if cached is None:
+            try:
+                token = Token.objects.select_related('user').defer('user__password').get(key=key)
+            except Token.DoesNotExist:
+                raise exceptions.AuthenticationFailed(_('Invalid token.'))
+            cached = (token.user, token.created)
+            cache.set(cache_key, cached, getattr(settings, 'AUTH_TOKEN_CACHE_TTL', 60))
+
+        user, created = cached
+        if not user.is_active:
+            raise exceptions.AuthenticationFailed(_('User inactive or deleted.'))
+        if token_expired(created):
+            Token.objects.filter(key=key).delete()
+            forget_token(key)
+            raise exceptions.AuthenticationFailed('El token venció, inicia sesión de nuevo.')
+        return user, Token(key=key, user=user, created=created)
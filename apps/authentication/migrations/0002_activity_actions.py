@@ -0,0 +1,18 @@
+# Generated by Django 5.2.7 on 2026-10-18 03:39
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('authentication', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='adminactivitylog',
+            name='action',
+            field=models.CharField(choices=[('login', 'Iniciar sesión'), ('logout', 'Cerrar sesión'), ('create_pet', 'Crear mascota'), ('update_pet', 'Actualizar mascota'), ('delete_pet', 'Eliminar mascota'), ('approve_adoption', 'Aprobar adopción'), ('reject_adoption', 'Rechazar adopción'), ('update_adoption', 'Actualizar adopción'), ('create_content', 'Crear contenido'), ('update_content', 'Actualizar contenido'), ('delete_content', 'Eliminar contenido')], max_length=20, verbose_name='Acción'),
+        ),
+    ]
@@ -1,6 +1,7 @@
 from django.contrib.auth.models import AbstractUser
 from django.db import models
 from apps.common.models import BaseModel, TimestampedModel
+from apps.common.permissions import user_capabilities
 
 
 class AdminUser(AbstractUser):
@@ -72,15 +73,8 @@ class AdminUser(AbstractUser):
         return f"{self.first_name} {self.last_name}".strip() or self.username
     
     def has_permission(self, permission):
-        """Verificar permisos según el rol"""
-        permissions = {
-            'super_admin': ['all'],
-            'admin': ['pets', 'adoptions', 'content', 'users'],
-            'volunteer': ['pets', 'adoptions'],
-            'veterinarian': ['pets'],
-        }
-        user_permissions = permissions.get(self.role, [])
-        return 'all' in user_permissions or permission in user_permissions
+        """Verificar permisos según el rol (ver apps.common.permissions)"""
+        return permission in user_capabilities(self)
 
 
 class AdminActivityLog(TimestampedModel):
@@ -96,8 +90,10 @@ class AdminActivityLog(TimestampedModel):
         ('delete_pet', 'Eliminar mascota'),
         ('approve_adoption', 'Aprobar adopción'),
         ('reject_adoption', 'Rechazar adopción'),
+        ('update_adoption', 'Actualizar adopción'),
         ('create_content', 'Crear contenido'),
         ('update_content', 'Actualizar contenido'),
+        ('delete_content', 'Eliminar contenido'),
     ]
     
     user = models.ForeignKey(
@@ -0,0 +1,31 @@
+from django.db.models.signals import post_delete, post_save
+from rest_framework.authtoken.models import Token
+from .authentication import forget_token, forget_user_tokens
+from .models import AdminUser
+
+
+# Campos del usuario que afectan la autenticación o los permisos
+AUTH_FIELDS = {'password', 'role', 'is_active', 'is_staff', 'is_superuser'}
+
+
+def forget_deleted_token(sender, instance, **kwargs):
+    """
+    Logout y rotación: el token borrado deja de resolverse desde la caché
+    """
+    forget_token(instance.key)
+
+
+def forget_changed_user(sender, instance, created, update_fields=None, **kwargs):
+    """
+    Cambio de contraseña, rol o estado: recargar el usuario en el siguiente request
+
+    Los guardados parciales de otros campos (p. ej. is_active_session en el
+    login) no invalidan la caché.
+    """
+    if created or (update_fields is not None and not AUTH_FIELDS & set(update_fields)):
+        return
+    forget_user_tokens(instance.pk)
+
+
+post_delete.connect(forget_deleted_token, sender=Token, dispatch_uid='auth_token_forget_deleted')
+post_save.connect(forget_changed_user, sender=AdminUser, dispatch_uid='auth_token_forget_user')
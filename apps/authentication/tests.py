@@ -1,3 +1,167 @@
-from django.test import TestCase
+from datetime import timedelta
+from unittest.mock import patch
 
-# Create your tests here.
+from django.core.cache import cache
+from django.db import DatabaseError, connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from apps.pets.models import Pet
+from .activity import ActivityLogBuffer
+from .authentication import token_cache_key
+from .models import AdminActivityLog, AdminUser
+
+
+LOCMEM_CACHE = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'auth-tests'}}
+
+
+@override_settings(CACHES=LOCMEM_CACHE, AUTH_TOKEN_TTL=3600, AUTH_TOKEN_CACHE_TTL=60)
+class CachedTokenAuthenticationTests(TestCase):
+    """
+    El token se resuelve desde la caché y se invalida al cerrar sesión o cambiar permisos
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.user = AdminUser.objects.create_user(username='ana', password='clave-segura-1', role='volunteer')
+        response = APIClient().post('/api/auth/login/', {'username': 'ana', 'password': 'clave-segura-1'})
+        self.token = response.data['token']
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {self.token}')
+
+    def token_queries(self, path='/api/auth/me/'):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(path)
+        return response, [query['sql'] for query in queries if 'authtoken_token' in query['sql']]
+
+    def test_second_request_skips_token_lookup(self):
+        response, queries = self.token_queries()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(queries), 1)
+        response, queries = self.token_queries()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(queries, [])
+
+    def test_password_hash_is_not_cached(self):
+        self.token_queries()
+        user, _ = cache.get(token_cache_key(self.token))
+        self.assertNotIn('password', user.__dict__)
+        self.assertTrue(user.check_password('clave-segura-1'))
+
+    def test_logout_invalidates_cached_token(self):
+        self.token_queries()
+        self.assertEqual(self.client.post('/api/auth/logout/').status_code, 200)
+        self.assertEqual(self.client.get('/api/auth/me/').status_code, 401)
+
+    def test_role_change_reloads_user(self):
+        self.token_queries()
+        self.user.role = 'admin'
+        self.user.save(update_fields=['role'])
+        response, queries = self.token_queries()
+        self.assertEqual(response.data['role'], 'admin')
+        self.assertEqual(len(queries), 1)
+
+    def test_password_change_reloads_user(self):
+        self.token_queries()
+        response = self.client.post('/api/auth/change-password/', {
+            'old_password': 'clave-segura-1', 'new_password': 'clave-segura-2', 'confirm_password': 'clave-segura-2'
+        })
+        self.assertEqual(response.status_code, 200, response.data)
+        _, queries = self.token_queries()
+        self.assertEqual(len(queries), 1)
+
+    def test_deactivated_user_is_rejected(self):
+        self.token_queries()
+        self.user.is_active = False
+        self.user.save()
+        self.assertEqual(self.client.get('/api/auth/me/').status_code, 401)
+
+    def test_expired_token_is_rejected_and_replaced_on_login(self):
+        Token.objects.filter(key=self.token).update(created=timezone.now() - timedelta(hours=2))
+        response = self.client.get('/api/auth/me/')
+        self.assertEqual(response.status_code, 401)
+        self.assertFalse(Token.objects.filter(key=self.token).exists())
+
+        stale = Token.objects.create(user=self.user)
+        Token.objects.filter(pk=stale.pk).update(created=timezone.now() - timedelta(hours=2))
+        login = APIClient().post('/api/auth/login/', {'username': 'ana', 'password': 'clave-segura-1'})
+        self.assertNotEqual(login.data['token'], stale.key)
+        self.assertFalse(Token.objects.filter(key=stale.key).exists())
+
+    def test_refresh_rotates_token(self):
+        self.token_queries()
+        response = self.client.post('/api/auth/token/refresh/')
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response.data['token'], self.token)
+        self.assertEqual(self.client.get('/api/auth/me/').status_code, 401)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {response.data["token"]}')
+        self.assertEqual(self.client.get('/api/auth/me/').status_code, 200)
+
+
+class ActivityLogBufferTests(TestCase):
+    """
+    Las entradas se guardan en lotes, no una por request
+    """
+
+    def setUp(self):
+        self.user = AdminUser.objects.create_user(username='luis', password='x', role='admin')
+
+    def entry(self, action='update_pet'):
+        return AdminActivityLog(user=self.user, action=action, description='prueba')
+
+    def test_flushes_on_batch_size(self):
+        buffer = ActivityLogBuffer(batch_size=3, flush_interval=3600)
+        buffer.start_timer = lambda: None
+        buffer.add(self.entry())
+        buffer.add(self.entry())
+        self.assertFalse(AdminActivityLog.objects.exists())
+        with CaptureQueriesContext(connection) as queries:
+            buffer.add(self.entry())
+        inserts = [query for query in queries if query['sql'].startswith('INSERT')]
+        self.assertEqual(len(inserts), 1)
+        self.assertEqual(AdminActivityLog.objects.count(), 3)
+
+    def test_due_after_interval_and_flush_on_shutdown(self):
+        buffer = ActivityLogBuffer(batch_size=50, flush_interval=5)
+        buffer.start_timer = lambda: None
+        buffer.add(self.entry())
+        self.assertFalse(buffer.due())
+        buffer.oldest -= 10
+        self.assertTrue(buffer.due())
+        self.assertEqual(buffer.flush(), 1)
+        self.assertEqual(buffer.flush(), 0)
+        self.assertEqual(AdminActivityLog.objects.count(), 1)
+
+    def test_failed_flush_keeps_entries(self):
+        buffer = ActivityLogBuffer(batch_size=50, flush_interval=5)
+        buffer.start_timer = lambda: None
+        buffer.add(self.entry())
+        failing = patch.object(AdminActivityLog.objects, 'bulk_create', side_effect=DatabaseError('caída'))
+        with failing, self.assertLogs('apps.authentication.activity', 'ERROR'):
+            self.assertEqual(buffer.flush(), 0)
+        self.assertEqual(len(buffer.entries), 1)
+        self.assertEqual(buffer.flush(), 1)
+
+    def test_viewset_mutations_are_logged(self):
+        client = APIClient()
+        client.force_authenticate(self.user)
+        pet = Pet.objects.create(name='Luna', gender='F', size='small')
+        with self.captureOnCommitCallbacks(execute=True):
+            client.patch(f'/api/pets/{pet.pk}/', {'name': 'Luna Mar'}, format='json')
+            client.delete(f'/api/pets/{pet.pk}/')
+            client.get('/api/pets/')
+        self.assertEqual(
+            list(AdminActivityLog.objects.order_by('pk').values_list('action', 'description')),
+            [('update_pet', f'partial_update: Mascota #{pet.pk}'), ('delete_pet', f'destroy: Mascota #{pet.pk}')]
+        )
+
+    def test_login_is_logged(self):
+        self.user.set_password('clave')
+        self.user.save()
+        with self.captureOnCommitCallbacks(execute=True):
+            APIClient().post('/api/auth/login/', {'username': 'luis', 'password': 'clave'}, REMOTE_ADDR='10.0.0.7')
+        log = AdminActivityLog.objects.get()
+        self.assertEqual((log.action, log.ip_address), ('login', '10.0.0.7'))
@@ -2,6 +2,7 @@ from django.urls import path
 from .views import (
     admin_login,
     admin_logout,
+    refresh_token,
     current_admin_user,
     update_admin_profile,
     change_password,
@@ -14,6 +15,7 @@ urlpatterns = [
     # Autenticación
     path('login/', admin_login, name='admin-login'),
     path('logout/', admin_logout, name='admin-logout'),
+    path('token/refresh/', refresh_token, name='token-refresh'),
     path('me/', current_admin_user, name='current-user'),
     
     # Perfil
@@ -2,8 +2,10 @@ from rest_framework import status, generics
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated, AllowAny
-from rest_framework.authtoken.models import Token
 from django.contrib.auth import login, logout
+from apps.common.permissions import has_capability
+from .activity import record_activity
+from .authentication import issue_token, rotate_token
 from .models import AdminUser, AdminActivityLog
 from .serializers import (
     AdminUserSerializer, 
@@ -13,16 +15,6 @@ from .serializers import (
 )
 
 
-def get_client_ip(request):
-    """Obtener IP del cliente"""
-    x_forwarded_for = request.META.get('HTTP_X_FORWARDED_FOR')
-    if x_forwarded_for:
-        ip = x_forwarded_for.split(',')[0]
-    else:
-        ip = request.META.get('REMOTE_ADDR')
-    return ip
-
-
 @api_view(['POST'])
 @permission_classes([AllowAny])
 def admin_login(request):
@@ -34,20 +26,15 @@ def admin_login(request):
     if serializer.is_valid():
         user = serializer.validated_data['user']
         
-        # Crear o obtener token
-        token, created = Token.objects.get_or_create(user=user)
+        # Token vigente (uno nuevo si el anterior venció)
+        token = issue_token(user)
         
         # Actualizar sesión activa
         user.is_active_session = True
-        user.save()
+        user.save(update_fields=['is_active_session'])
         
         # Registrar actividad
-        AdminActivityLog.objects.create(
-            user=user,
-            action='login',
-            description=f'Inicio de sesión exitoso',
-            ip_address=get_client_ip(request)
-        )
+        record_activity(request, 'login', 'Inicio de sesión exitoso', user=user)
         
         return Response({
             'token': token.key,
@@ -71,15 +58,10 @@ def admin_logout(request):
         
         # Actualizar sesión
         request.user.is_active_session = False
-        request.user.save()
+        request.user.save(update_fields=['is_active_session'])
         
         # Registrar actividad
-        AdminActivityLog.objects.create(
-            user=request.user,
-            action='logout',
-            description='Cierre de sesión',
-            ip_address=get_client_ip(request)
-        )
+        record_activity(request, 'logout', 'Cierre de sesión')
         
         return Response({
             'message': 'Logout exitoso'
@@ -90,6 +72,20 @@ def admin_logout(request):
         }, status=status.HTTP_400_BAD_REQUEST)
 
 
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def refresh_token(request):
+    """
+    Rotar el token: el actual deja de funcionar y se entrega uno nuevo
+    POST /api/auth/token/refresh/
+    """
+    token = rotate_token(request.user)
+    return Response({
+        'token': token.key,
+        'message': 'Token renovado exitosamente'
+    }, status=status.HTTP_200_OK)
+
+
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def current_admin_user(request):
@@ -134,15 +130,10 @@ def change_password(request):
         
         # Cambiar contraseña
         user.set_password(serializer.validated_data['new_password'])
-        user.save()
+        user.save(update_fields=['password'])
         
         # Registrar actividad
-        AdminActivityLog.objects.create(
-            user=user,
-            action='update_content',
-            description='Cambio de contraseña',
-            ip_address=get_client_ip(request)
-        )
+        record_activity(request, 'update_content', 'Cambio de contraseña')
         
         return Response({
             'message': 'Contraseña actualizada exitosamente'
@@ -161,7 +152,7 @@ class AdminActivityLogListView(generics.ListAPIView):
     
     def get_queryset(self):
         # Solo super_admin puede ver todos los logs
-        if self.request.user.role == 'super_admin':
+        if has_capability(self.request, 'users'):
             return AdminActivityLog.objects.all()
         # Otros solo ven sus propios logs
         return AdminActivityLog.objects.filter(user=self.request.user)
\ No newline at end of file
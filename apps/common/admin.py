@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Address, PhoneNumber, SiteConfiguration
+from .models import Address, PhoneNumber, SiteConfiguration, StatusCounter, Task
 
 
 @admin.register(Address)
@@ -27,4 +27,31 @@ class SiteConfigurationAdmin(admin.ModelAdmin):
     
     def has_delete_permission(self, request, obj=None):
         # No permitir eliminar la configuración
-        return False
\ No newline at end of file
+        return False
+
+
+@admin.register(StatusCounter)
+class StatusCounterAdmin(admin.ModelAdmin):
+    list_display = ('kind', 'key', 'count', 'updated_at')
+    list_filter = ('kind',)
+    readonly_fields = ('kind', 'key', 'count', 'updated_at')
+    
+    def has_add_permission(self, request):
+        # Los contadores se mantienen por señales o con rebuild_counters
+        return False
+
+
+@admin.register(Task)
+class TaskAdmin(admin.ModelAdmin):
+    list_display = ('name', 'status', 'attempts', 'run_at', 'finished_at', 'locked_by')
+    list_filter = ('status', 'name')
+    search_fields = ('name', 'idempotency_key')
+    readonly_fields = (
+        'name', 'payload', 'idempotency_key', 'attempts', 'locked_at',
+        'locked_by', 'finished_at', 'last_error', 'created_at', 'updated_at'
+    )
+    
+    def has_add_permission(self, request):
+        # Las tareas se encolan desde el código con apps.common.tasks.enqueue
+        return False
+
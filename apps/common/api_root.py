@@ -25,6 +25,7 @@ def api_root(request):
             'admin': {
                 'login': '/api/auth/login/',
                 'dashboard': '/api/dashboard/statistics/',
+                'metrics': '/api/metrics/',
                 'admin_panel': '/admin/'
             }
         },
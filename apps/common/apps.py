@@ -1,7 +1,30 @@
 from django.apps import AppConfig
+from django.db.models.signals import post_migrate
+from django.utils.module_loading import autodiscover_modules
+
+
+def create_search_indexes(sender, using='default', **kwargs):
+    """
+    Solo sin migraciones (tests con MIGRATION_MODULES desactivado): si no, los
+    índices los crea la migración common.0004_search_indexes
+    """
+    from django.db import connections
+    from django.db.migrations.loader import MigrationLoader
+    from apps.common.search import install_search_indexes
+
+    module_name, _ = MigrationLoader.migrations_module(sender.label)
+    if module_name is None:
+        install_search_indexes(connections[using])
 
 
 class CommonConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.common'
-    verbose_name = 'Común'
\ No newline at end of file
+    verbose_name = 'Común'
+    
+    def ready(self):
+        import apps.common.signals
+        # Registrar las tareas (@task) de todas las apps para el worker
+        autodiscover_modules('tasks')
+        # Índices de texto completo cuando las tablas se crean sin migraciones
+        post_migrate.connect(create_search_indexes, sender=self, dispatch_uid='create_search_indexes')
@@ -0,0 +1,154 @@
+"""
+Endpoints públicos de solo lectura para ASGI
+
+Las vistas de apps/*/async_views.py responden los GET más consultados del
+sitio público (catálogo de mascotas, destacados, FAQs) con el ORM async. Con
+uvicorn (GUNICORN_WORKER_CLASS=uvicorn_worker.UvicornWorker, ver
+gunicorn.conf.py) cada worker atiende muchos requests a la vez mientras
+esperan a la base de datos o a la caché, en lugar de uno por hilo.
+
+- Solo datos públicos: no se autentica (un token se ignora) y solo se ven
+  registros activos. El panel de administración sigue en los endpoints
+  síncronos, que funcionan igual con WSGI y con ASGI.
+- Filtros, búsqueda y orden son los del ViewSet equivalente, así que el JSON
+  es el mismo que el del endpoint síncrono.
+- Paginación por número de página; el modo cursor solo existe en los
+  endpoints síncronos.
+- Caché de respuestas con las mismas generaciones que CachedResponseMixin.
+"""
+import hashlib
+from functools import wraps
+from math import ceil
+
+from django.core.cache import cache
+from django.http import Http404, HttpResponse
+from rest_framework import exceptions
+from rest_framework.pagination import PageNumberPagination
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+from .cache import aget_generations
+from .instrumentation import measure
+from .metrics import record_cache
+from .routers import aread_primary_if_written
+
+
+SAFE_METHODS = ('GET', 'HEAD')
+
+
+def json_response(data, status=200):
+    # Mismo renderer que las vistas de DRF: mismos bytes para los mismos datos
+    return HttpResponse(JSONRenderer().render(data), status=status, content_type='application/json')
+
+
+def error_response(exc):
+    data = exc.detail if isinstance(exc, exceptions.ValidationError) else {'detail': exc.detail}
+    return json_response(data, status=exc.status_code)
+
+
+def public_viewset(viewset_class, request, action):
+    """
+    Instancia del ViewSet para reutilizar get_queryset y filter_queryset
+
+    El request es anónimo, así que get_queryset aplica el filtro is_active.
+    """
+    return viewset_class(request=request, action=action, args=(), kwargs={}, format_kwarg=None)
+
+
+async def response_cache_key(request, name, kwargs, models):
+    params = sorted((key, values) for key, values in request.query_params.lists())
+    parts = [
+        request.build_absolute_uri(request.path),
+        name,
+        repr(sorted(kwargs.items())),
+        repr(params),
+        repr(await aget_generations(models)),
+    ]
+    digest = hashlib.md5('|'.join(parts).encode('utf-8')).hexdigest()
+    return f'async-response:{name}:{digest}'
+
+
+def public_endpoint(name, cache_models=(), cache_timeout=60 * 5):
+    """
+    Decorador para las vistas async públicas
+
+    La vista recibe un Request de DRF anónimo (sin consultar tokens ni
+    sesiones) y retorna los datos a serializar; las excepciones de DRF y
+    Http404 se convierten en la misma respuesta de error que da DRF. Con
+    cache_models la respuesta se guarda en caché con sus generaciones.
+    """
+    def decorator(view):
+        @wraps(view)
+        async def wrapper(request, *args, **kwargs):
+            if request.method not in SAFE_METHODS:
+                return error_response(exceptions.MethodNotAllowed(request.method))
+            request = Request(request, authenticators=())
+
+            key = None
+            if cache_models:
+                key = await response_cache_key(request, name, kwargs, cache_models)
+                content = await cache.aget(key)
+                record_cache(name, content is not None)
+                if content is not None:
+                    return HttpResponse(content, content_type='application/json')
+                await aread_primary_if_written(cache_models)
+
+            try:
+                data = await view(request, *args, **kwargs)
+            except Http404 as exc:
+                return error_response(exceptions.NotFound(*exc.args))
+            except exceptions.APIException as exc:
+                return error_response(exc)
+
+            response = json_response(data)
+            if key is not None:
+                await cache.aset(key, response.content, cache_timeout)
+            return response
+
+        # Lecturas desde la réplica, si hay una (apps.common.routers)
+        wrapper.replica_reads = True
+        return wrapper
+
+    return decorator
+
+
+async def paginate(request, rows, serialize, page_size=None):
+    """
+    Página de `rows` con el mismo formato que StandardResultsPagination
+
+    serialize recibe la lista de filas de la página y retorna los datos.
+    """
+    page_size = page_size or api_settings.PAGE_SIZE
+    count = await rows.acount()
+    pages = max(1, ceil(count / page_size))
+
+    number = request.query_params.get(PageNumberPagination.page_query_param, 1)
+    if number in PageNumberPagination.last_page_strings:
+        number = pages
+    try:
+        number = int(number)
+    except (TypeError, ValueError):
+        number = 0
+    if not 1 <= number <= pages:
+        raise exceptions.NotFound(PageNumberPagination.invalid_page_message)
+
+    start = (number - 1) * page_size
+    page = [row async for row in rows[start:start + page_size]]
+    with measure('serializer'):
+        results = serialize(page)
+
+    url = request.build_absolute_uri()
+    page_param = PageNumberPagination.page_query_param
+    previous = None
+    if number == 2:
+        previous = remove_query_param(url, page_param)
+    elif number > 2:
+        previous = replace_query_param(url, page_param, number - 1)
+    return {
+        'count': count,
+        'next': replace_query_param(url, page_param, number + 1) if number < pages else None,
+        'previous': previous,
+        'results': results,
+    }
@@ -0,0 +1,262 @@
+"""
+Datos sintéticos y medición de los endpoints más usados de la API
+
+seed_benchmark_data crea un conjunto realista y reproducible (misma semilla,
+mismos datos) con bulk_create. run_benchmarks recorre los endpoints con el
+cliente de pruebas de DRF y reporta p50/p95 de latencia y consultas SQL por
+endpoint, en un diccionario listo para volcar a JSON y comparar entre commits.
+"""
+import math
+import random
+import time
+from datetime import timedelta
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from django.db.models import Max
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.utils import timezone
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from apps.adoptions.models import AdoptionApplication, PersonalReference
+from apps.authentication.models import AdminUser
+from apps.contact.models import ContactMessage
+from apps.content.models import FAQ, NewsArticle, SuccessStory
+from apps.pets.models import Pet, PetImage
+from .counters import rebuild_counters
+
+
+NAMES = ['Luna', 'Rocky', 'Canela', 'Max', 'Nala', 'Toby', 'Kira', 'Simba', 'Lola', 'Bruno']
+BREEDS = ['Mestizo', 'Labrador', 'Pastor alemán', 'Siamés', 'Criollo', 'Husky', 'Persa']
+WORDS = (
+    'perro gato cachorro pequeño grande juguetón tranquilo cariñoso vacunado '
+    'esterilizado adopción hogar familia niños paseo rescate refugio'
+).split()
+FIRST_NAMES = ['Ana', 'Carlos', 'María', 'José', 'Lucía', 'Pedro', 'Sofía', 'Diego']
+LAST_NAMES = ['López', 'Pérez', 'García', 'Hernández', 'Martínez', 'Ramírez']
+
+
+def _text(rng, words):
+    return ' '.join(rng.choice(WORDS) for _ in range(words)).capitalize() + '.'
+
+
+def _person(rng):
+    return f'{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}'
+
+
+def _choice(rng, choices):
+    return rng.choice(choices)[0]
+
+
+def _last_pk(model):
+    return model.objects.aggregate(last=Max('pk'))['last'] or 0
+
+
+def _created(model, last_pk, **lookups):
+    """
+    Filas recién creadas con bulk_create: MySQL no asigna el pk a los objetos
+    que retorna, así que se vuelven a consultar
+    """
+    return list(model.objects.filter(pk__gt=last_pk, **lookups).order_by('pk'))
+
+
+def seed_benchmark_data(pets=200, images_per_pet=3, applications=100, messages=100,
+                        news=30, stories=30, faqs=20, seed=0):
+    """
+    Crear datos de prueba con bulk_create; retorna cuántas filas se crearon
+    """
+    rng = random.Random(seed)
+    now = timezone.now()
+
+    last_pet = _last_pk(Pet)
+    Pet.objects.bulk_create([
+        Pet(
+            name=f'{rng.choice(NAMES)} {index}', species=_choice(rng, Pet.SPECIES_CHOICES),
+            breed=rng.choice(BREEDS), gender=_choice(rng, Pet.GENDER_CHOICES),
+            age_years=rng.randint(0, 12), age_months=rng.randint(0, 11),
+            size=_choice(rng, Pet.SIZE_CHOICES), status=_choice(rng, Pet.STATUS_CHOICES),
+            energy_level=_choice(rng, Pet.ENERGY_LEVEL_CHOICES),
+            description=_text(rng, 30), characteristics=_text(rng, 60),
+            main_image=f'pets/main/benchmark-{index}.jpg', is_active=rng.random() > 0.05,
+        )
+        for index in range(pets)
+    ])
+    pet_rows = _created(Pet, last_pet, main_image__startswith='pets/main/benchmark-')
+    PetImage.objects.bulk_create([
+        PetImage(pet=pet, image=f'pets/gallery/benchmark-{pet.pk}-{order}.jpg', order=order)
+        for pet in pet_rows
+        for order in range(images_per_pet)
+    ])
+
+    last_application = _last_pk(AdoptionApplication)
+    AdoptionApplication.objects.bulk_create([
+        AdoptionApplication(
+            pet=rng.choice(pet_rows), full_name=_person(rng), age=rng.randint(18, 70),
+            civil_status='Soltero/a', profession='Docente', address=_text(rng, 8),
+            cell_phone='5555-0000', email=f'solicitante{index}@example.com',
+            housing_ownership='Propia', dwelling_type=_choice(rng, AdoptionApplication.DWELLING_TYPE_CHOICES),
+            adoption_reason=_text(rng, 20), pet_location_in_home='Toda la casa',
+            adults_in_home=rng.randint(1, 4), children_in_home=rng.randint(0, 3),
+            all_family_agrees=True, can_afford_pet=True, has_had_pets_before=rng.random() > 0.5,
+            has_current_pets=rng.random() > 0.5, adoption_purpose='Para hogar',
+            aware_of_potential_damage=True, damage_plan=_text(rng, 10), willing_to_educate=True,
+            behavior_plan=_text(rng, 10), agrees_to_home_visits=True,
+            understands_no_transfer_policy=True, vision_in_5_years=_text(rng, 10),
+            agrees_to_sterilize=True, dpi_copy='adoptions/dpi/benchmark.pdf',
+            utility_bill_copy='adoptions/bills/benchmark.pdf',
+            application_status=_choice(rng, AdoptionApplication.APPLICATION_STATUS_CHOICES),
+        )
+        for index in range(applications)
+    ])
+    application_rows = _created(
+        AdoptionApplication, last_application, dpi_copy='adoptions/dpi/benchmark.pdf'
+    )
+    PersonalReference.objects.bulk_create([
+        PersonalReference(application=application, full_name=_person(rng), phone='5555-1111', relationship='Amigo')
+        for application in application_rows
+        for _ in range(3)
+    ])
+
+    ContactMessage.objects.bulk_create([
+        ContactMessage(
+            full_name=_person(rng), email=f'contacto{index}@example.com',
+            subject=_choice(rng, ContactMessage.SUBJECT_CHOICES), message=_text(rng, 25),
+            status=_choice(rng, ContactMessage.STATUS_CHOICES),
+        )
+        for index in range(messages)
+    ])
+    NewsArticle.objects.bulk_create([
+        NewsArticle(
+            title=f'Noticia {index}: {_text(rng, 4)}', slug=f'noticia-benchmark-{index}',
+            summary=_text(rng, 15), content=_text(rng, 200), is_featured=index % 5 == 0,
+            published_date=now - timedelta(days=index),
+        )
+        for index in range(news)
+    ])
+    SuccessStory.objects.bulk_create([
+        SuccessStory(
+            title=f'Historia {index}', pet_name=rng.choice(NAMES), adopter_name=_person(rng),
+            story=_text(rng, 120), is_featured=index % 5 == 0,
+        )
+        for index in range(stories)
+    ])
+    FAQ.objects.bulk_create([
+        FAQ(
+            question=f'¿Pregunta {index}?', answer=_text(rng, 30), order=index,
+            category=_choice(rng, FAQ._meta.get_field('category').choices),
+        )
+        for index in range(faqs)
+    ])
+
+    # bulk_create no dispara señales: recalcular los contadores del dashboard
+    rebuild_counters()
+
+    return {
+        'pets': pets, 'pet_images': pets * images_per_pet, 'applications': applications,
+        'references': applications * 3, 'messages': messages, 'news': news,
+        'stories': stories, 'faqs': faqs,
+    }
+
+
+def adoption_payload(pet):
+    """
+    Formulario multipart de solicitud de adopción con sus 3 referencias
+    """
+    payload = {
+        'pet': pet.pk, 'full_name': 'Benchmark Solicitante', 'age': 30, 'civil_status': 'Casado/a',
+        'profession': 'Ingeniero', 'address': 'Zona 1', 'cell_phone': '5555-2222',
+        'email': 'benchmark@example.com', 'housing_ownership': 'Propia', 'dwelling_type': 'Casa',
+        'adoption_reason': 'Compañía', 'pet_location_in_home': 'Toda la casa', 'adults_in_home': 2,
+        'children_in_home': 1, 'all_family_agrees': True, 'can_afford_pet': True,
+        'has_had_pets_before': True, 'has_current_pets': False, 'adoption_purpose': 'Para hogar',
+        'aware_of_potential_damage': True, 'damage_plan': 'Paciencia', 'willing_to_educate': True,
+        'behavior_plan': 'Entrenador', 'agrees_to_home_visits': True,
+        'understands_no_transfer_policy': True, 'vision_in_5_years': 'Felices',
+        'agrees_to_sterilize': True,
+        'dpi_copy': SimpleUploadedFile('dpi.pdf', b'%PDF-1.4 benchmark', content_type='application/pdf'),
+        'utility_bill_copy': SimpleUploadedFile('recibo.pdf', b'%PDF-1.4 benchmark', content_type='application/pdf'),
+    }
+    for index in range(3):
+        payload[f'references[{index}]full_name'] = f'Referencia {index}'
+        payload[f'references[{index}]phone'] = '5555-3333'
+        payload[f'references[{index}]relationship'] = 'Vecino'
+    return payload
+
+
+def get_endpoints():
+    """
+    (nombre, método, ruta, requiere token, datos) de cada endpoint medido
+    """
+    pet = Pet.objects.filter(is_active=True).order_by('pk').first()
+    article = NewsArticle.objects.order_by('pk').first()
+    return [
+        ('pets-list', 'get', '/api/pets/', False, None),
+        ('pets-list-cursor', 'get', '/api/pets/?pagination=cursor', False, None),
+        ('pets-search', 'get', '/api/pets/?search=cachorro', False, None),
+        ('pets-available', 'get', '/api/pets/available/', False, None),
+        ('pets-detail', 'get', f'/api/pets/{pet.pk}/', False, None),
+        ('news-list', 'get', '/api/content/news/', False, None),
+        ('news-detail', 'get', f'/api/content/news/{article.slug}/', False, None),
+        ('faqs-list', 'get', '/api/content/faqs/', False, None),
+        ('dashboard-statistics', 'get', '/api/dashboard/statistics/', True, None),
+        ('dashboard-quick-stats', 'get', '/api/dashboard/quick-stats/', True, None),
+        ('adoptions-list', 'get', '/api/adoptions/applications/', True, None),
+        ('contact-list', 'get', '/api/contact/messages/', True, None),
+        ('adoptions-create', 'post', '/api/adoptions/applications/', False, lambda: adoption_payload(pet)),
+    ]
+
+
+def percentile(values, fraction):
+    """
+    Percentil por rango más cercano (sin interpolar)
+    """
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(fraction * len(ordered)) - 1)]
+
+
+def run_benchmarks(iterations=20, warmup=2, only=None):
+    """
+    Medir cada endpoint; retorna {nombre: {p50_ms, p95_ms, queries, status}}
+    """
+    admin, _ = AdminUser.objects.get_or_create(
+        username='benchmark', defaults={'role': 'super_admin', 'is_staff': True}
+    )
+    token, _ = Token.objects.get_or_create(user=admin)
+
+    results = {}
+    # Los archivos subidos quedan en memoria, no en MEDIA_ROOT
+    storages = {
+        'default': {'BACKEND': 'django.core.files.storage.InMemoryStorage'},
+        'staticfiles': {'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage'},
+    }
+    with override_settings(STORAGES=storages):
+        for name, method, path, needs_token, data in get_endpoints():
+            if only and name not in only:
+                continue
+            # Fuera del runner de tests 'testserver' no está en ALLOWED_HOSTS
+            client = APIClient(SERVER_NAME='localhost')
+            if needs_token:
+                client.credentials(HTTP_AUTHORIZATION=f'Token {token.key}')
+
+            timings, queries, status_code = [], [], None
+            for iteration in range(warmup + iterations):
+                kwargs = {'data': data(), 'format': 'multipart'} if data else {}
+                with CaptureQueriesContext(connection) as context:
+                    start = time.perf_counter()
+                    response = getattr(client, method)(path, **kwargs)
+                    elapsed = (time.perf_counter() - start) * 1000
+                status_code = response.status_code
+                if iteration >= warmup:
+                    timings.append(elapsed)
+                    queries.append(len(context.captured_queries))
+
+            results[name] = {
+                'method': method.upper(),
+                'path': path,
+                'status': status_code,
+                'p50_ms': round(percentile(timings, 0.50), 3),
+                'p95_ms': round(percentile(timings, 0.95), 3),
+                'queries': max(queries),
+            }
+    return results
@@ -0,0 +1,107 @@
+"""
+Cambios masivos desde la API de administración
+
+Las filas se eligen con una lista de IDs o con un filtro (los mismos campos
+que acepta el listado del ViewSet):
+
+    {"ids": [1, 2, 3]}
+    {"filter": {"status": "new", "subject": "adoption"}}
+
+bulk_update cambia todas con un solo UPDATE (a través de update_with_counters,
+que mantiene los contadores del dashboard) y devuelve el resultado de cada ID:
+
+- updated: la fila cambió
+- unchanged: la fila ya estaba en el estado pedido
+- not_found: no existe o no es visible para el usuario
+"""
+from django.utils import timezone
+from rest_framework import serializers
+
+from .cache import bump_generation
+from .counters import update_with_counters
+
+
+# Máximo de filas por operación masiva
+MAX_BULK_IDS = 500
+
+
+class BulkSelectionSerializer(serializers.Serializer):
+    """
+    {"ids": [...]} o {"filter": {campo: valor}}, no ambos
+    """
+    ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        allow_empty=False,
+        max_length=MAX_BULK_IDS,
+        required=False
+    )
+    filter = serializers.DictField(
+        child=serializers.CharField(),
+        allow_empty=False,
+        required=False
+    )
+
+    def validate(self, data):
+        if ('ids' in data) == ('filter' in data):
+            raise serializers.ValidationError('Enviar "ids" o "filter" (solo uno)')
+        return data
+
+
+class BulkStatusSerializer(BulkSelectionSerializer):
+    """
+    Selección más el estado destino; las opciones las define la vista
+    """
+    status = serializers.ChoiceField(choices=[])
+
+    def __init__(self, *args, choices=(), **kwargs):
+        super().__init__(*args, **kwargs)
+        self.fields['status'].choices = choices
+
+
+def status_changes(fields, value, user):
+    """
+    Columnas a escribir al pasar filas al estado `value`
+
+    fields: (campo de estado, usuario que hizo el cambio, fecha del cambio),
+    los mismos campos de auditoría que el cambio individual
+    (responded_by/response_date, reviewed_by/review_date); los dos últimos
+    pueden ser None.
+    """
+    field, user_field, date_field = fields
+    changes = {field: value}
+    if user_field:
+        changes[user_field] = user
+    if date_field:
+        changes[date_field] = timezone.now()
+    return changes
+
+
+def bulk_update(queryset, ids, changes, state=None):
+    """
+    Aplicar `changes` (más updated_at) a las filas `ids` visibles en `queryset`
+
+    state: campos que definen el estado destino; las filas que ya lo tienen
+    no se escriben (por defecto, todos los campos de `changes`).
+    Retorna (cantidad actualizada, [{'id': ..., 'result': ...}]).
+    """
+    model = queryset.model
+    state = changes if state is None else state
+    ids = list(dict.fromkeys(ids))
+
+    visible = set(queryset.filter(pk__in=ids).values_list('pk', flat=True))
+    pending = model._default_manager.filter(pk__in=visible).exclude(**state)
+    updated = set(update_with_counters(pending, **changes, updated_at=timezone.now()))
+    if updated:
+        # update() no dispara señales: invalidar la caché de respuestas a mano
+        bump_generation(model)
+
+    results = []
+    for pk in ids:
+        if pk in updated:
+            result = 'updated'
+        elif pk in visible:
+            result = 'unchanged'
+        else:
+            result = 'not_found'
+        results.append({'id': pk, 'result': result})
+    return len(updated), results
@@ -0,0 +1,135 @@
+"""
+Caché versionada de respuestas para los endpoints públicos de solo lectura
+
+Cada modelo tiene una "generación" guardada en la caché que se incrementa al
+guardar o eliminar (incluido el soft delete) cualquiera de sus filas. Las
+respuestas se guardan con una clave que incluye la generación de los modelos
+de los que dependen, así que una edición del admin invalida de inmediato todas
+las respuestas afectadas sin tener que buscarlas.
+
+Con varios workers la caché debe ser compartida (archivo o base de datos en
+producción); LocMemCache solo es coherente dentro de un proceso.
+"""
+import hashlib
+import time
+from functools import wraps
+
+from django.core.cache import cache
+from rest_framework.response import Response
+
+from .metrics import record_cache
+from .routers import mark_written, read_primary_if_written
+
+
+def generation_key(model):
+    return f'generation:{model._meta.label_lower}'
+
+
+def _new_generation():
+    # Basada en el tiempo para no reutilizar una generación si la clave expiró
+    return int(time.time() * 1000)
+
+
+def get_generations(models):
+    """
+    Retorna las generaciones actuales de los modelos, en el mismo orden
+    """
+    keys = [generation_key(model) for model in models]
+    found = cache.get_many(keys)
+    generations = []
+    for key in keys:
+        if key not in found:
+            cache.add(key, _new_generation(), timeout=None)
+            found[key] = cache.get(key)
+        generations.append(found[key])
+    return generations
+
+
+async def aget_generations(models):
+    """
+    Versión async de get_generations (vistas de apps/common/async_api.py)
+    """
+    keys = [generation_key(model) for model in models]
+    found = await cache.aget_many(keys)
+    generations = []
+    for key in keys:
+        if key not in found:
+            await cache.aadd(key, _new_generation(), timeout=None)
+            found[key] = await cache.aget(key)
+        generations.append(found[key])
+    return generations
+
+
+def bump_generation(model):
+    """
+    Invalida todas las respuestas que dependen del modelo
+    Debe llamarse también tras update()/bulk_create(), que no disparan señales.
+    """
+    key = generation_key(model)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, _new_generation(), timeout=None)
+    mark_written(model)
+
+
+def cache_response(view_method):
+    """
+    Decorador para acciones de lectura de un ViewSet con CachedResponseMixin
+    """
+    @wraps(view_method)
+    def wrapper(self, request, *args, **kwargs):
+        if not self.is_response_cacheable(request):
+            return view_method(self, request, *args, **kwargs)
+
+        key = self.get_response_cache_key(request, *args, **kwargs)
+        data = cache.get(key)
+        record_cache(f'{type(self).__name__}.{self.action}', data is not None)
+        if data is not None:
+            return Response(data)
+
+        read_primary_if_written(self.cache_models)
+        response = view_method(self, request, *args, **kwargs)
+        if response.status_code == 200:
+            cache.set(key, response.data, self.cache_timeout)
+        return response
+
+    return wrapper
+
+
+class CachedResponseMixin:
+    """
+    Caché de respuestas para ViewSets: list y retrieve se guardan en caché y
+    otras acciones de lectura se pueden marcar con @cache_response
+
+    cache_models: modelos cuya generación forma parte de la clave
+    cache_timeout: segundos que se conserva cada respuesta
+    """
+    cache_models = ()
+    cache_timeout = 60 * 5
+
+    def is_response_cacheable(self, request):
+        # Los administradores ven registros inactivos: siempre consultan la base
+        return request.method == 'GET' and not request.user.is_authenticated
+
+    def get_response_cache_key(self, request, *args, **kwargs):
+        params = sorted(
+            (key, values) for key, values in request.query_params.lists()
+        )
+        parts = [
+            request.build_absolute_uri(request.path),
+            self.action,
+            repr(sorted(kwargs.items())),
+            repr(params),
+            repr(get_generations(self.cache_models)),
+        ]
+        digest = hashlib.md5('|'.join(parts).encode('utf-8')).hexdigest()
+        return f'response:{type(self).__name__}:{self.action}:{digest}'
+
+    @cache_response
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
+
+    @cache_response
+    def retrieve(self, request, *args, **kwargs):
+        return super().retrieve(request, *args, **kwargs)
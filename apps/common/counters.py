@@ -0,0 +1,230 @@
+"""
+Mantenimiento incremental de la tabla StatusCounter
+
+Cada modelo contado declara qué campos agrupan sus totales; solo se cuentan
+los registros activos, así que un soft delete (is_active=False) descuenta la
+fila igual que un borrado real. La reconstrucción completa recalcula todos
+los totales con una sola consulta UNION ALL.
+"""
+from collections import Counter
+
+from django.db import transaction
+from django.db.models import CharField, Count, F, Value
+
+from apps.pets.models import Pet
+from apps.adoptions.models import AdoptionApplication, SimplifiedAdoptionRequest
+from apps.contact.models import ContactMessage
+from apps.content.models import NewsArticle, SuccessStory
+from .models import StatusCounter
+
+
+# {modelo: {kind: campo}}; campo None cuenta el total sin agrupar
+COUNTED_MODELS = {
+    Pet: {'pets': 'status', 'species': 'species'},
+    AdoptionApplication: {'adoptions': 'application_status'},
+    SimplifiedAdoptionRequest: {'requests': 'status'},
+    ContactMessage: {'messages': 'status'},
+    NewsArticle: {'news': None},
+    SuccessStory: {'success_stories': None},
+}
+
+SNAPSHOT_ATTR = '_counter_snapshot'
+
+
+def counter_keys(instance):
+    """
+    Retorna {kind: key} con los contadores a los que aporta la instancia
+    """
+    if not instance.is_active:
+        return {}
+    return {
+        kind: getattr(instance, field) if field else ''
+        for kind, field in COUNTED_MODELS[type(instance)].items()
+    }
+
+
+def _tracked_fields(model):
+    return {'is_active', *(f for f in COUNTED_MODELS[model].values() if f)}
+
+
+def take_snapshot(instance):
+    """
+    Guarda en la instancia los contadores que representa su fila actual
+    Si algún campo contado fue diferido (only/defer) no se toma el snapshot.
+    """
+    if _tracked_fields(type(instance)) & instance.get_deferred_fields():
+        return
+    setattr(instance, SNAPSHOT_ATTR, counter_keys(instance))
+
+
+def stored_keys(instance):
+    """
+    Contadores de la fila tal como está guardada en la base de datos
+    """
+    if hasattr(instance, SNAPSHOT_ATTR):
+        return getattr(instance, SNAPSHOT_ATTR)
+
+    model = type(instance)
+    row = model.objects.filter(pk=instance.pk).values(*_tracked_fields(model)).first()
+    if row is None:
+        return {}
+    return counter_keys(model(**row))
+
+
+def adjust(kind, key, delta):
+    """
+    Suma `delta` al contador (kind, key) de forma atómica
+    """
+    updated = StatusCounter.objects.filter(kind=kind, key=key).update(count=F('count') + delta)
+    if not updated:
+        counter, _ = StatusCounter.objects.get_or_create(kind=kind, key=key)
+        StatusCounter.objects.filter(pk=counter.pk).update(count=F('count') + delta)
+
+
+def apply_change(old_keys, new_keys):
+    """
+    Aplica la diferencia entre dos estados de una fila
+    """
+    for kind in old_keys.keys() | new_keys.keys():
+        old, new = old_keys.get(kind), new_keys.get(kind)
+        if old == new:
+            continue
+        if old is not None:
+            adjust(kind, old, -1)
+        if new is not None:
+            adjust(kind, new, 1)
+
+
+@transaction.atomic
+def update_with_counters(queryset, **changes):
+    """
+    queryset.update(**changes) manteniendo los contadores; retorna los pk afectados
+
+    update() no dispara señales: se bloquean y leen los campos contados de
+    las filas (un SELECT), se actualizan con un solo UPDATE y se ajusta cada
+    contador una vez por cada (kind, key) que cambió. `changes` debe usar
+    valores literales para los campos contados. Los modelos sin contadores
+    solo se bloquean y actualizan.
+    """
+    model = queryset.model
+    if model not in COUNTED_MODELS:
+        pks = list(queryset.select_for_update().values_list('pk', flat=True))
+        if pks:
+            model.objects.filter(pk__in=pks).update(**changes)
+        return pks
+    tracked = sorted(_tracked_fields(model))
+    rows = list(queryset.select_for_update().values('pk', *tracked))
+    pks = [row.pop('pk') for row in rows]
+    if not pks:
+        return []
+    model.objects.filter(pk__in=pks).update(**changes)
+
+    new_values = {field: changes[field] for field in tracked if field in changes}
+    deltas = Counter()
+    for row in rows:
+        old_keys, new_keys = counter_keys(model(**row)), counter_keys(model(**{**row, **new_values}))
+        for kind in old_keys.keys() | new_keys.keys():
+            if old_keys.get(kind) != new_keys.get(kind):
+                if kind in old_keys:
+                    deltas[kind, old_keys[kind]] -= 1
+                if kind in new_keys:
+                    deltas[kind, new_keys[kind]] += 1
+    for (kind, key), delta in sorted(deltas.items()):
+        if delta:
+            adjust(kind, key, delta)
+    return pks
+
+
+def grouped_count(queryset, kind, field=None):
+    """
+    Conteo agrupado de un queryset etiquetado con `kind`
+
+    Cada fila resultante tiene la forma {'kind', 'key', 'count'}; si no se
+    indica `field` se devuelve una única fila con key vacía.
+    """
+    key = F(field) if field else Value('', output_field=CharField())
+    return (
+        queryset.order_by()
+        .annotate(kind=Value(kind, output_field=CharField()), key=key)
+        .values('kind', 'key')
+        .annotate(count=Count('pk'))
+    )
+
+
+def collect_counts(*querysets):
+    """
+    Ejecuta todos los conteos agrupados en una sola consulta UNION ALL
+    Retorna un diccionario {kind: {key: count}}
+    """
+    counts = {}
+    if not querysets:
+        return counts
+
+    first, *rest = querysets
+    combined = first.union(*rest, all=True) if rest else first
+    for row in combined:
+        counts.setdefault(row['kind'], {})[row['key']] = row['count']
+    return counts
+
+
+def read_counters():
+    """
+    Lee todos los contadores en una sola consulta
+    Retorna un diccionario {kind: {key: count}}
+    """
+    counts = {}
+    for kind, key, count in StatusCounter.objects.values_list('kind', 'key', 'count'):
+        counts.setdefault(kind, {})[key] = count
+    return counts
+
+
+def compute_counters():
+    """
+    Recalcula los contadores desde las tablas de origen
+    """
+    querysets = [
+        grouped_count(model.objects.filter(is_active=True), kind, field)
+        for model, kinds in COUNTED_MODELS.items()
+        for kind, field in kinds.items()
+    ]
+    counts = collect_counts(*querysets)
+    # Los conteos sin agrupar devuelven una fila aun en tablas vacías
+    return {
+        kind: {key: count for key, count in keys.items() if count}
+        for kind, keys in counts.items()
+    }
+
+
+def find_drift(actual=None):
+    """
+    Compara la tabla materializada con los totales reales
+    Retorna una lista de (kind, key, almacenado, real) que no coinciden
+    """
+    stored = read_counters()
+    if actual is None:
+        actual = compute_counters()
+    drift = []
+    for kind in sorted(stored.keys() | actual.keys()):
+        keys = stored.get(kind, {}).keys() | actual.get(kind, {}).keys()
+        for key in sorted(keys):
+            stored_count = stored.get(kind, {}).get(key, 0)
+            actual_count = actual.get(kind, {}).get(key, 0)
+            if stored_count != actual_count:
+                drift.append((kind, key, stored_count, actual_count))
+    return drift
+
+
+@transaction.atomic
+def rebuild_counters():
+    """
+    Reemplaza la tabla de contadores con los totales recalculados
+    """
+    actual = compute_counters()
+    drift = find_drift(actual)
+    StatusCounter.objects.all().delete()
+    StatusCounter.objects.bulk_create([
+        StatusCounter(kind=kind, key=key, count=count)
+        for kind, keys in actual.items()
+        for key, count in keys.items()
+    ])
+    return drift
@@ -0,0 +1,102 @@
+"""
+Motor de agregación para los dashboards de administración
+
+Los totales por estado, especie y tipo de contenido se leen de la tabla
+materializada StatusCounter (ver apps.common.counters), así que el costo del
+dashboard no depende del número de filas de cada tabla.
+"""
+from datetime import timedelta
+
+from django.utils import timezone
+
+from apps.pets.models import Pet
+from apps.adoptions.models import AdoptionApplication
+from .counters import read_counters
+
+
+def _total(counts, kind):
+    return sum(counts.get(kind, {}).values())
+
+
+def _get(counts, kind, key=''):
+    return counts.get(kind, {}).get(key, 0)
+
+
+def dashboard_counts():
+    """
+    Conteos usados por /api/dashboard/statistics/
+    """
+    counts = read_counters()
+
+    # La ventana de 30 días no se puede materializar, se cuenta aparte
+    last_month = timezone.now() - timedelta(days=30)
+    applications_last_month = AdoptionApplication.objects.filter(
+        created_at__gte=last_month,
+        is_active=True
+    ).count()
+
+    # Mantener el orden de las opciones y omitir especies sin mascotas
+    by_species = [
+        {'species': species, 'count': _get(counts, 'species', species)}
+        for species, _ in Pet.SPECIES_CHOICES
+        if _get(counts, 'species', species)
+    ]
+
+    return {
+        'pets': {
+            'total': _total(counts, 'pets'),
+            'available': _get(counts, 'pets', 'available'),
+            'adopted': _get(counts, 'pets', 'adopted'),
+            'in_process': _get(counts, 'pets', 'in_process'),
+            'by_species': by_species
+        },
+        'adoptions': {
+            'total': _total(counts, 'adoptions'),
+            'pending': _get(counts, 'adoptions', 'Recibida'),
+            'approved': _get(counts, 'adoptions', 'Aprobada'),
+            'rejected': _get(counts, 'adoptions', 'Rechazada'),
+            'last_month': applications_last_month
+        },
+        'messages': {
+            'total': _total(counts, 'messages'),
+            'pending': _get(counts, 'messages', 'new'),
+            'resolved': _get(counts, 'messages', 'resolved')
+        },
+        'content': {
+            'news': _get(counts, 'news'),
+            'success_stories': _get(counts, 'success_stories')
+        }
+    }
+
+
+def quick_counts():
+    """
+    Conteos usados por /api/dashboard/quick-stats/
+    """
+    counts = read_counters()
+
+    return {
+        'pending_applications': _get(counts, 'adoptions', 'Recibida'),
+        'available_pets': _get(counts, 'pets', 'available'),
+        'pending_messages': _get(counts, 'messages', 'new'),
+        'total_adoptions': _get(counts, 'pets', 'adopted')
+    }
+
+
+def admin_dashboard_counts():
+    """
+    Conteos usados por el dashboard personalizado del admin de Django
+    """
+    counts = read_counters()
+
+    return {
+        'total_mascotas': _total(counts, 'pets'),
+        'disponibles': _get(counts, 'pets', 'available'),
+        'en_proceso': _get(counts, 'pets', 'in_process'),
+        'adoptados': _get(counts, 'pets', 'adopted'),
+        'solicitudes_pendientes': _get(counts, 'requests', 'Recibida'),
+        'solicitudes_revision': _get(counts, 'requests', 'En Revisión'),
+        'solicitudes_aprobadas': _get(counts, 'requests', 'Aprobada'),
+        'mensajes_nuevos': _get(counts, 'messages', 'new'),
+        'mensajes_proceso': _get(counts, 'messages', 'in_progress'),
+    }
@@ -0,0 +1,82 @@
+"""
+Conexiones persistentes a la base de datos
+
+Con CONN_MAX_AGE (DB_CONN_MAX_AGE) cada hilo conserva su conexión entre
+requests: al terminar un request Django solo la cierra si superó su edad
+máxima o quedó inutilizable, y con CONN_HEALTH_CHECKS verifica antes de
+reutilizarla que el servidor no la haya cerrado. Las conexiones son por hilo:
+un worker gthread con 4 hilos mantiene hasta 4 conexiones por base de datos.
+
+warm_up_worker abre esas conexiones al iniciar cada worker de gunicorn
+(post_worker_init en gunicorn.conf.py), así el primer request de cada hilo no
+paga la conexión TLS con MySQL. La instrumentación por request
+(apps.common.instrumentation) cuenta las conexiones abiertas para verificar
+que se reutilizan.
+"""
+import logging
+import threading
+import time
+from concurrent.futures import wait
+
+from django.conf import settings
+from django.db import DatabaseError, connections
+
+
+logger = logging.getLogger(__name__)
+
+
+def warm_up_connections(aliases=None):
+    """
+    Abrir las conexiones del hilo actual; retorna {alias: milisegundos}
+
+    Por defecto los alias de DB_WARMUP_ALIASES que existen en DATABASES (la
+    réplica se abre recién con el primer request que la usa). Un error se
+    registra y no se propaga: el worker arranca igual y el request volverá a
+    intentar la conexión.
+    """
+    if aliases is None:
+        aliases = [
+            alias for alias in getattr(settings, 'DB_WARMUP_ALIASES', ['default'])
+            if alias in connections.settings
+        ]
+    timings = {}
+    for alias in aliases:
+        start = time.perf_counter()
+        try:
+            connections[alias].ensure_connection()
+        except DatabaseError:
+            logger.warning('No se pudo abrir la conexión "%s" al iniciar', alias, exc_info=True)
+            continue
+        timings[alias] = round((time.perf_counter() - start) * 1000, 2)
+    return timings
+
+
+def warm_up_worker(worker, timeout=10):
+    """
+    Abrir una conexión en cada hilo que atenderá requests del worker
+
+    Con workers gthread las tareas esperan en una barrera hasta que todos los
+    hilos del pool tienen una, así cada una corre en un hilo distinto. Los
+    workers sync atienden en el hilo principal. Retorna una lista con el
+    resultado de warm_up_connections por hilo.
+    """
+    if not getattr(settings, 'DB_WARMUP', True) or getattr(settings, 'DB_CONN_MAX_AGE', 0) == 0:
+        # Sin conexiones persistentes no hay nada que reutilizar
+        return []
+
+    pool = getattr(worker, 'tpool', None)
+    if pool is None:
+        return [warm_up_connections()]
+
+    threads = worker.cfg.threads
+    barrier = threading.Barrier(threads)
+
+    def task():
+        try:
+            barrier.wait(timeout)
+        except threading.BrokenBarrierError:
+            pass
+        return warm_up_connections()
+
+    done, _ = wait([pool.submit(task) for _ in range(threads)], timeout * 2)
+    return [future.result() for future in done]
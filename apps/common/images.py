@@ -0,0 +1,198 @@
+"""
+Procesamiento de imágenes en segundo plano
+
+Al guardar una imagen nueva (foto principal de mascota, galería, noticias e
+historias) el request solo guarda el original; un pool de hilos genera
+después las versiones reducidas:
+
+- thumbnail, card y full (ver RENDITIONS), cada una en WebP y JPEG
+- orientación EXIF aplicada y metadatos EXIF eliminados
+
+Los nombres de los archivos generados se guardan en el campo JSON
+`<campo>_renditions` del modelo ({'card': {'webp': ..., 'jpeg': ...}, ...}) y
+los serializers los exponen como URLs con RenditionsField.
+
+IMAGE_PROCESSING_EAGER procesa en el mismo hilo (tests); IMAGE_WORKERS
+define el tamaño del pool.
+"""
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.db import connections, transaction
+from django.utils import timezone
+from PIL import Image, ImageOps, UnidentifiedImageError
+
+from apps.content.models import NewsArticle, SuccessStory
+from apps.pets.models import Pet, PetImage
+from .cache import bump_generation
+
+
+logger = logging.getLogger(__name__)
+
+# Modelo -> campos de imagen con versiones reducidas
+IMAGE_FIELDS = {
+    Pet: ['main_image'],
+    PetImage: ['image'],
+    NewsArticle: ['featured_image'],
+    SuccessStory: ['before_image', 'after_image'],
+}
+
+# Nombre -> tamaño máximo (ancho, alto); se conserva la proporción
+RENDITIONS = {
+    'thumbnail': (200, 200),
+    'card': (600, 600),
+    'full': (1600, 1600),
+}
+
+FORMATS = {
+    'webp': ('WEBP', {'quality': 80, 'method': 4}),
+    'jpeg': ('JPEG', {'quality': 82, 'optimize': True, 'progressive': True}),
+}
+
+# Formatos aceptados al subir imágenes (Pillow: Image.format)
+UPLOAD_FORMATS = {'JPEG', 'PNG', 'WEBP'}
+
+
+def renditions_field(field_name):
+    return f'{field_name}_renditions'
+
+
+def render_image(source, size, image_format, options):
+    """
+    Versión reducida de `source` (ya orientada) en memoria, sin EXIF
+    """
+    image = source.copy()
+    image.thumbnail(size, Image.Resampling.LANCZOS)
+    if image_format == 'JPEG' and image.mode != 'RGB':
+        image = image.convert('RGB')
+    output = BytesIO()
+    # Sin `exif=`: Pillow no copia los metadatos del original
+    image.save(output, image_format, **options)
+    return output.getvalue()
+
+
+def generate_renditions(field_file):
+    """
+    Crear todas las versiones de la imagen; retorna {versión: {formato: nombre}}
+    """
+    storage = field_file.storage
+    directory, filename = os.path.split(field_file.name)
+    stem = os.path.splitext(filename)[0]
+
+    with field_file.open('rb') as handle:
+        source = ImageOps.exif_transpose(Image.open(handle))
+        source.load()
+    if source.mode not in ('RGB', 'RGBA'):
+        source = source.convert('RGBA' if 'A' in source.getbands() else 'RGB')
+
+    renditions = {}
+    for name, size in RENDITIONS.items():
+        renditions[name] = {}
+        for extension, (image_format, options) in FORMATS.items():
+            content = render_image(source, size, image_format, options)
+            path = os.path.join(directory, 'renditions', f'{stem}-{name}.{extension}')
+            renditions[name][extension] = storage.save(path, ContentFile(content))
+    return renditions
+
+
+def read_image_header(upload):
+    """
+    (formato, (ancho, alto)) leyendo solo la cabecera, o None si no es una imagen
+
+    Image.open no decodifica los píxeles; el archivo queda en la posición 0.
+    """
+    upload.seek(0)
+    try:
+        with Image.open(upload) as image:
+            return image.format, image.size
+    except (UnidentifiedImageError, Image.DecompressionBombError, OSError, ValueError):
+        return None
+    finally:
+        upload.seek(0)
+
+
+def stored_name(instance, field_name):
+    """
+    Nombre del archivo tal como se cargó, sin consultar campos diferidos
+    """
+    value = instance.__dict__.get(instance._meta.get_field(field_name).attname)
+    return getattr(value, 'name', value) or ''
+
+
+def delete_renditions(storage, renditions):
+    for formats in (renditions or {}).values():
+        for name in formats.values():
+            storage.delete(name)
+
+
+def process_image(model, pk, field_name):
+    """
+    Generar y guardar las versiones de una imagen (se ejecuta en el pool)
+    """
+    instance = model.objects.filter(pk=pk).first()
+    if instance is None:
+        return
+    field_file = getattr(instance, field_name)
+    target = renditions_field(field_name)
+    if not field_file or not field_file.storage.exists(field_file.name):
+        return
+
+    renditions = generate_renditions(field_file)
+    previous = getattr(instance, target)
+    # Solo si la imagen no cambió mientras se procesaba; update() no dispara señales
+    updated = model.objects.filter(pk=pk, **{field_name: field_file.name}).update(
+        **{target: renditions, 'updated_at': timezone.now()}
+    )
+    if updated:
+        delete_renditions(field_file.storage, previous)
+        bump_generation(model)
+    else:
+        delete_renditions(field_file.storage, renditions)
+
+
+def _run(model, pk, field_name, close_connections=True):
+    try:
+        process_image(model, pk, field_name)
+    except Exception:
+        # Un archivo que no es imagen no debe afectar al request que lo subió
+        logger.exception('Error al procesar %s.%s (pk=%s)', model._meta.label, field_name, pk)
+    finally:
+        if close_connections:
+            # Cada hilo del pool tiene sus propias conexiones
+            connections.close_all()
+
+
+_executor = None
+_executor_pid = None
+_executor_lock = threading.Lock()
+
+
+def get_executor():
+    """
+    Pool de hilos del proceso actual; se crea de nuevo tras un fork
+    """
+    global _executor, _executor_pid
+    with _executor_lock:
+        if _executor is None or _executor_pid != os.getpid():
+            _executor = ThreadPoolExecutor(
+                max_workers=getattr(settings, 'IMAGE_WORKERS', 2),
+                thread_name_prefix='images'
+            )
+            _executor_pid = os.getpid()
+    return _executor
+
+
+def schedule_renditions(instance, field_name):
+    """
+    Encolar el procesamiento cuando la transacción actual se confirme
+    """
+    model, pk = type(instance), instance.pk
+    if getattr(settings, 'IMAGE_PROCESSING_EAGER', False):
+        _run(model, pk, field_name, close_connections=False)
+        return
+    transaction.on_commit(lambda: get_executor().submit(_run, model, pk, field_name))
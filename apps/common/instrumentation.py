@@ -0,0 +1,245 @@
+"""
+Instrumentación por request: consultas SQL, tiempos y consultas repetidas
+
+RequestInstrumentationMiddleware mide, en una fracción configurable de los
+requests (REQUEST_INSTRUMENTATION_SAMPLE_RATE):
+
+- número de consultas y tiempo total en la base de datos
+- conexiones a la base de datos abiertas durante el request (con
+  CONN_MAX_AGE deberían ser 0 salvo en el primer request de cada hilo)
+- huellas de consultas repetidas (mismo SQL con otros parámetros: N+1)
+- tiempo de serialización (ViewSets con apps.common.mixins.SerializerTimingMixin
+  y FastListSerializer)
+- tiempo total
+
+Los resultados se devuelven en la cabecera Server-Timing (visible en las
+herramientas de desarrollo del navegador) y como una línea JSON en el logger
+`apps.requests`. En los requests no muestreados solo se cuentan consultas y
+tiempo total para los histogramas de apps.common.metrics (METRICS_ENABLED).
+"""
+import hashlib
+import json
+import logging
+import random
+import re
+import time
+from collections import Counter
+from contextlib import ExitStack, contextmanager
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.db import connections
+from django.db.backends.signals import connection_created
+
+from .metrics import metrics_enabled, record_request
+
+
+logger = logging.getLogger('apps.requests')
+
+_current = ContextVar('request_metrics', default=None)
+
+STRING_RE = re.compile(r"'(?:[^']|'')*'")
+NUMBER_RE = re.compile(r'\b\d+(?:\.\d+)?\b')
+IN_LIST_RE = re.compile(r'\bIN \((?:\s*(?:%s|\?)\s*,?)+\)', re.IGNORECASE)
+SPACES_RE = re.compile(r'\s+')
+
+
+def fingerprint(sql):
+    """
+    SQL normalizado: sin literales ni listas IN de largo variable
+    """
+    sql = STRING_RE.sub('?', sql)
+    sql = NUMBER_RE.sub('?', sql)
+    sql = IN_LIST_RE.sub('IN (...)', sql)
+    return SPACES_RE.sub(' ', sql).strip()
+
+
+class RequestMetrics:
+    """
+    Métricas acumuladas durante un request
+    """
+
+    def __init__(self, detailed=True):
+        self.detailed = detailed
+        self.started = time.perf_counter()
+        self.queries = 0
+        self.connections = 0
+        self.db_time = 0.0
+        self.fingerprints = Counter()
+        self.timings = Counter()
+        self.view = None
+        self.total = None
+
+    def __call__(self, execute, sql, params, many, context):
+        # Usado como connection.execute_wrapper
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.db_time += time.perf_counter() - start
+            self.queries += 1
+            if self.detailed:
+                self.fingerprints[fingerprint(sql)] += 1
+
+    def finish(self):
+        self.total = time.perf_counter() - self.started
+
+    @property
+    def duplicates(self):
+        return [(sql, count) for sql, count in self.fingerprints.most_common() if count > 1]
+
+    def server_timing(self):
+        duplicated = sum(count for _, count in self.duplicates)
+        parts = [
+            f'db;dur={self.db_time * 1000:.2f};desc="{self.queries} consultas, {duplicated} repetidas, '
+            f'{self.connections} conexiones nuevas"',
+            *(f'{name};dur={seconds * 1000:.2f}' for name, seconds in self.timings.items()),
+            f'total;dur={self.total * 1000:.2f}',
+        ]
+        return ', '.join(parts)
+
+    def as_dict(self, request, response):
+        return {
+            'method': request.method,
+            'path': request.path,
+            'view': self.view,
+            'status': response.status_code,
+            'total_ms': round(self.total * 1000, 2),
+            'db_ms': round(self.db_time * 1000, 2),
+            'queries': self.queries,
+            'connections_opened': self.connections,
+            **{f'{name}_ms': round(seconds * 1000, 2) for name, seconds in self.timings.items()},
+            'duplicates': [
+                {
+                    'fingerprint': hashlib.md5(sql.encode('utf-8')).hexdigest()[:12],
+                    'count': count,
+                    'sql': sql[:300],
+                }
+                for sql, count in self.duplicates[:5]
+            ],
+        }
+
+
+def current_metrics():
+    """
+    Métricas del request en curso, o None si no se está midiendo
+    """
+    return _current.get()
+
+
+def count_connection(sender, connection, **kwargs):
+    # Se emite en el hilo que abre la conexión, con el contexto del request
+    metrics = _current.get()
+    if metrics is not None:
+        metrics.connections += 1
+
+
+connection_created.connect(count_connection, dispatch_uid='instrumentation_connection_created')
+
+
+@contextmanager
+def measure(name):
+    """
+    Acumular el tiempo del bloque bajo `name` (si el request se está midiendo)
+    """
+    metrics = _current.get()
+    if metrics is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        metrics.timings[name] += time.perf_counter() - start
+
+
+def view_name(view_func, method):
+    """
+    `ViewSet.accion` para ViewSets de DRF, nombre de la función en otro caso
+    """
+    cls = getattr(view_func, 'cls', None)
+    if cls is None:
+        return getattr(view_func, '__name__', repr(view_func))
+    action = (getattr(view_func, 'actions', None) or {}).get(method.lower())
+    return f'{cls.__name__}.{action}' if action else cls.__name__
+
+
+class RequestInstrumentationMiddleware:
+    """
+    Middleware de instrumentación; va al inicio de MIDDLEWARE para medir todo
+
+    Funciona con WSGI y con ASGI: si fuera solo síncrono, Django ejecutaría
+    las vistas async de apps/*/async_views.py en un hilo y se perdería la
+    ventaja de servirlas con uvicorn.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.sample_rate = getattr(settings, 'REQUEST_INSTRUMENTATION_SAMPLE_RATE', 1.0)
+        self.server_timing = getattr(settings, 'REQUEST_INSTRUMENTATION_SERVER_TIMING', True)
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+    def sampled(self, request):
+        return self.sample_rate >= 1 or random.random() < self.sample_rate
+
+    def wrap_connections(self, stack, metrics):
+        # Las conexiones son por hilo: con ASGI se llama desde el hilo en el
+        # que el ORM async ejecuta las consultas de este request
+        for connection in connections.all():
+            stack.enter_context(connection.execute_wrapper(metrics))
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        sampled = self.sampled(request)
+        if not sampled and not metrics_enabled():
+            return self.get_response(request)
+
+        metrics = RequestMetrics(detailed=sampled)
+        token = _current.set(metrics)
+        try:
+            with ExitStack() as stack:
+                self.wrap_connections(stack, metrics)
+                response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        return self.finish(request, response, metrics)
+
+    async def __acall__(self, request):
+        sampled = self.sampled(request)
+        if not sampled and not metrics_enabled():
+            return await self.get_response(request)
+
+        metrics = RequestMetrics(detailed=sampled)
+        token = _current.set(metrics)
+        stack = ExitStack()
+        try:
+            await sync_to_async(self.wrap_connections)(stack, metrics)
+            try:
+                response = await self.get_response(request)
+            finally:
+                await sync_to_async(stack.close)()
+        finally:
+            _current.reset(token)
+        return self.finish(request, response, metrics)
+
+    def finish(self, request, response, metrics):
+        metrics.finish()
+        record_request(metrics.view, metrics.total, metrics.queries, metrics.connections)
+        if not metrics.detailed:
+            return response
+
+        if self.server_timing:
+            response['Server-Timing'] = metrics.server_timing()
+        logger.info(json.dumps(metrics.as_dict(request, response), ensure_ascii=False))
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        metrics = _current.get()
+        if metrics is not None:
+            metrics.view = view_name(view_func, request.method)
@@ -0,0 +1,72 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.test import RequestFactory
+from rest_framework.renderers import JSONRenderer
+
+from apps.pets.models import Pet
+from apps.pets.serializers import PetListSerializer, fast_pet_list_serializer
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = 'Compara PetListSerializer con su versión rápida sobre .values() (datos temporales)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, nargs='+', default=[20, 100, 1000])
+        parser.add_argument('--repeat', type=int, default=20, help='Repeticiones por medición (se toma la mejor)')
+
+    def measure(self, function, repeat):
+        best = None
+        for _ in range(repeat):
+            start = time.perf_counter()
+            function()
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        return best * 1000
+
+    def handle(self, *args, **options):
+        # Los datos se crean dentro de una transacción que se revierte al final
+        try:
+            with transaction.atomic():
+                self.run(options['rows'], options['repeat'])
+                raise Rollback
+        except Rollback:
+            pass
+
+    def run(self, sizes, repeat):
+        Pet.objects.bulk_create([
+            Pet(
+                name=f'Benchmark {index}', species=('dog', 'cat', 'other')[index % 3],
+                gender='MF'[index % 2], size=('small', 'medium', 'large')[index % 3],
+                age_years=index % 12, age_months=index % 11,
+                main_image=f'pets/main/benchmark-{index}.jpg' if index % 2 else None,
+                description='Mascota de prueba para el benchmark'
+            )
+            for index in range(max(sizes))
+        ])
+        pets = Pet.objects.filter(name__startswith='Benchmark ').defer('characteristics', 'special_needs')
+        context = {'request': RequestFactory().get('/api/pets/', HTTP_HOST='localhost')}
+        renderer = JSONRenderer()
+
+        self.stdout.write(f'{"filas":>6} {"DRF (ms)":>10} {"rápido (ms)":>12} {"mejora":>8}')
+        for size in sizes:
+            page = pets.order_by('-created_at', '-id')[:size]
+
+            def drf():
+                return renderer.render(PetListSerializer(page, many=True, context=context).data)
+
+            def fast():
+                rows = fast_pet_list_serializer.values(page)
+                return renderer.render(fast_pet_list_serializer.to_representation(rows, context))
+
+            if drf() != fast():
+                self.stderr.write(self.style.ERROR(f'{size} filas: el JSON no coincide'))
+                return
+
+            drf_ms, fast_ms = self.measure(drf, repeat), self.measure(fast, repeat)
+            self.stdout.write(f'{size:>6} {drf_ms:>10.2f} {fast_ms:>12.2f} {drf_ms / fast_ms:>7.1f}x')
@@ -0,0 +1,30 @@
+from django.core.management.base import BaseCommand
+from apps.common.images import IMAGE_FIELDS, process_image, renditions_field
+
+
+class Command(BaseCommand):
+    help = 'Genera en este proceso las versiones reducidas de las imágenes que aún no las tienen'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--all',
+            action='store_true',
+            help='Regenerar también las imágenes que ya tienen versiones'
+        )
+
+    def handle(self, *args, **options):
+        for model, fields in IMAGE_FIELDS.items():
+            for field in fields:
+                queryset = model.objects.exclude(**{field: ''}).exclude(**{f'{field}__isnull': True})
+                if not options['all']:
+                    queryset = queryset.filter(**{renditions_field(field): {}})
+
+                failed = 0
+                pks = list(queryset.values_list('pk', flat=True))
+                for pk in pks:
+                    try:
+                        process_image(model, pk, field)
+                    except Exception as error:
+                        failed += 1
+                        self.stdout.write(self.style.WARNING(f'{model._meta.label} {pk}: {error}'))
+                self.stdout.write(f'{model._meta.label}.{field}: {len(pks) - failed} de {len(pks)} procesada(s)')
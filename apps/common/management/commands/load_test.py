@@ -0,0 +1,127 @@
+import json
+import math
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from itertools import count
+from urllib.error import HTTPError, URLError
+from urllib.request import urlopen
+
+from django.core.management.base import BaseCommand, CommandError
+
+
+# Nombre -> ruta bajo /api/ (síncrono) y /api/async/ (ASGI)
+ENDPOINTS = {
+    'pets': 'pets/',
+    'available': 'pets/available/',
+    'pet': 'pets/{pet_id}/',
+    'news': 'content/news/featured/',
+    'stories': 'content/success-stories/featured/',
+    'faqs': 'content/faqs/by_category/',
+}
+
+
+def percentile(values, fraction):
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, math.ceil(fraction * len(ordered)) - 1)]
+
+
+class Command(BaseCommand):
+    help = (
+        'Prueba de carga contra un servidor en ejecución: compara los endpoints '
+        'públicos síncronos (/api/...) con sus versiones async (/api/async/...)'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('base_url', help='Por ejemplo http://127.0.0.1:8000')
+        parser.add_argument('--endpoints', nargs='+', choices=sorted(ENDPOINTS), default=sorted(ENDPOINTS))
+        parser.add_argument('--modes', nargs='+', choices=['sync', 'async'], default=['sync', 'async'])
+        parser.add_argument('--concurrency', type=int, default=50, help='Requests simultáneos')
+        parser.add_argument('--requests', type=int, default=1000, help='Requests por endpoint y modo')
+        parser.add_argument('--pet-id', type=int, default=1)
+        parser.add_argument('--timeout', type=float, default=10)
+        parser.add_argument(
+            '--no-cache', action='store_true',
+            help='Agregar un parámetro distinto a cada request para no usar la caché de respuestas'
+        )
+        parser.add_argument('--output', help='Archivo JSON de salida (por defecto, la consola)')
+
+    def run(self, url, options):
+        """
+        `requests` GET a `url` con `concurrency` hilos; retorna el resumen
+        """
+        sequence = count()
+        lock = threading.Lock()
+        latencies, errors = [], []
+
+        def request(_):
+            target = url
+            if options['no_cache']:
+                with lock:
+                    number = next(sequence)
+                target += f'{"&" if "?" in url else "?"}_={number}'
+            start = time.perf_counter()
+            try:
+                with urlopen(target, timeout=options['timeout']) as response:
+                    response.read()
+            except HTTPError as error:
+                errors.append(error.code)
+                return
+            except (URLError, OSError) as error:
+                errors.append(type(error).__name__)
+                return
+            latencies.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(options['concurrency']) as executor:
+            list(executor.map(request, range(options['requests'])))
+        elapsed = time.perf_counter() - start
+
+        def ms(value):
+            return None if value is None else round(value * 1000, 2)
+
+        return {
+            'url': url,
+            'requests_per_second': round(len(latencies) / elapsed, 1),
+            'p50_ms': ms(percentile(latencies, 0.50)),
+            'p95_ms': ms(percentile(latencies, 0.95)),
+            'p99_ms': ms(percentile(latencies, 0.99)),
+            'errors': len(errors),
+            'error_codes': sorted({str(code) for code in errors}),
+        }
+
+    def handle(self, *args, **options):
+        base_url = options['base_url'].rstrip('/')
+        if not base_url.startswith(('http://', 'https://')):
+            raise CommandError('base_url debe empezar con http:// o https://')
+
+        prefixes = {'sync': '/api/', 'async': '/api/async/'}
+        results = {}
+        for name in options['endpoints']:
+            path = ENDPOINTS[name].format(pet_id=options['pet_id'])
+            results[name] = {}
+            for mode in options['modes']:
+                self.stderr.write(f'{name} ({mode})...')
+                results[name][mode] = self.run(base_url + prefixes[mode] + path, options)
+
+            if {'sync', 'async'} <= results[name].keys() and results[name]['sync']['requests_per_second']:
+                results[name]['async_vs_sync'] = round(
+                    results[name]['async']['requests_per_second'] / results[name]['sync']['requests_per_second'], 2
+                )
+
+        report = json.dumps({
+            'base_url': base_url,
+            'concurrency': options['concurrency'],
+            'requests': options['requests'],
+            'cache': not options['no_cache'],
+            'endpoints': results,
+        }, indent=2, sort_keys=True, ensure_ascii=False)
+
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8') as output:
+                output.write(report + '\n')
+            self.stdout.write(self.style.SUCCESS(f'Resultados guardados en {options["output"]}'))
+        else:
+            self.stdout.write(report)
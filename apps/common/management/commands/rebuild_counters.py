@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand
+from apps.common.counters import find_drift, rebuild_counters
+
+
+class Command(BaseCommand):
+    help = 'Recalcula desde cero la tabla de contadores de estado (StatusCounter)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--check',
+            action='store_true',
+            help='Solo reportar diferencias, sin modificar la tabla'
+        )
+
+    def handle(self, *args, **options):
+        drift = find_drift() if options['check'] else rebuild_counters()
+
+        for kind, key, stored, actual in drift:
+            self.stdout.write(f'{kind}:{key or "-"} almacenado={stored} real={actual}')
+
+        if options['check']:
+            if drift:
+                self.stdout.write(self.style.WARNING(f'{len(drift)} contador(es) desincronizado(s)'))
+            else:
+                self.stdout.write(self.style.SUCCESS('Los contadores están sincronizados'))
+        else:
+            self.stdout.write(self.style.SUCCESS(f'Contadores reconstruidos ({len(drift)} corregido(s))'))
@@ -0,0 +1,52 @@
+import json
+import platform
+
+import django
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from apps.common.benchmarks import run_benchmarks, seed_benchmark_data
+from .seed_benchmark_data import add_seed_arguments, seed_options
+
+
+class Command(BaseCommand):
+    help = (
+        'Mide p50/p95 y consultas SQL de los endpoints principales sobre una base '
+        'SQLite temporal con datos sintéticos; el resultado es JSON comparable entre commits'
+    )
+
+    def add_arguments(self, parser):
+        add_seed_arguments(parser)
+        parser.add_argument('--iterations', type=int, default=20, help='Mediciones por endpoint')
+        parser.add_argument('--warmup', type=int, default=2, help='Peticiones descartadas por endpoint')
+        parser.add_argument('--only', nargs='+', help='Medir solo estos endpoints (por nombre)')
+        parser.add_argument('--output', help='Archivo JSON de salida (por defecto, la consola)')
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'sqlite':
+            raise CommandError('Ejecutar con SQLite: DJANGO_ENVIRONMENT=testing python manage.py run_benchmarks')
+
+        # Base temporal: nunca se toca la base configurada
+        old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+        try:
+            data = seed_benchmark_data(**seed_options(options))
+            results = run_benchmarks(options['iterations'], options['warmup'], options['only'])
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+
+        report = json.dumps({
+            'environment': {
+                'python': platform.python_version(),
+                'django': django.get_version(),
+                'database': connection.vendor,
+            },
+            'iterations': options['iterations'],
+            'data': data,
+            'endpoints': results,
+        }, indent=2, sort_keys=True, ensure_ascii=False)
+
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8') as output:
+                output.write(report + '\n')
+            self.stdout.write(self.style.SUCCESS(f'Resultados guardados en {options["output"]}'))
+        else:
+            self.stdout.write(report)
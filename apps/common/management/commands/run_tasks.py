@@ -0,0 +1,49 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+from apps.common.tasks import purge_finished, release_stale, run_pending, worker_name
+
+
+class Command(BaseCommand):
+    help = 'Worker de la cola de tareas en segundo plano (apps.common.tasks)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='Ejecutar las tareas pendientes y terminar'
+        )
+        parser.add_argument(
+            '--sleep',
+            type=float,
+            default=None,
+            help='Segundos de espera cuando la cola está vacía (TASK_POLL_INTERVAL)'
+        )
+        parser.add_argument(
+            '--keep-days',
+            type=int,
+            default=7,
+            help='Días que se conservan las tareas completadas'
+        )
+
+    def handle(self, *args, **options):
+        worker = worker_name()
+        sleep = options['sleep'] if options['sleep'] is not None else getattr(settings, 'TASK_POLL_INTERVAL', 1)
+        purged = purge_finished(options['keep_days'])
+        self.stdout.write(f'Worker {worker} iniciado ({purged} tarea(s) antigua(s) borrada(s))')
+
+        try:
+            while True:
+                release_stale()
+                processed = run_pending(worker)
+                if processed:
+                    self.stdout.write(f'{processed} tarea(s) ejecutada(s)')
+                if options['once']:
+                    break
+                # Conexiones caídas o vencidas (CONN_MAX_AGE) se reabren en la siguiente vuelta
+                close_old_connections()
+                time.sleep(sleep)
+        except KeyboardInterrupt:
+            self.stdout.write('Worker detenido')
@@ -0,0 +1,48 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from apps.common.benchmarks import seed_benchmark_data
+
+
+def add_seed_arguments(parser):
+    parser.add_argument('--pets', type=int, default=200)
+    parser.add_argument('--images-per-pet', type=int, default=3)
+    parser.add_argument('--applications', type=int, default=100, help='Cada solicitud lleva 3 referencias')
+    parser.add_argument('--messages', type=int, default=100)
+    parser.add_argument('--news', type=int, default=30)
+    parser.add_argument('--stories', type=int, default=30)
+    parser.add_argument('--faqs', type=int, default=20)
+    parser.add_argument('--seed', type=int, default=0, help='Semilla: la misma semilla genera los mismos datos')
+
+
+def seed_options(options):
+    return {
+        key: options[key]
+        for key in ['pets', 'images_per_pet', 'applications', 'messages', 'news', 'stories', 'faqs', 'seed']
+    }
+
+
+class Command(BaseCommand):
+    help = 'Genera datos sintéticos (mascotas, solicitudes, mensajes y contenido) para benchmarks'
+
+    def add_arguments(self, parser):
+        add_seed_arguments(parser)
+        parser.add_argument(
+            '--force', action='store_true',
+            help='Crear los datos aunque DEBUG esté desactivado (la base puede ser la de producción)',
+        )
+
+    def handle(self, *args, **options):
+        # development y production comparten la base MySQL: sin DEBUG (o testing)
+        # no se escriben miles de filas sintéticas sin pedirlo explícitamente
+        if not settings.DEBUG and not options['force']:
+            raise CommandError(
+                f'DEBUG está desactivado y la base "{connection.settings_dict["NAME"]}" puede ser la de '
+                'producción; usar DJANGO_ENVIRONMENT=testing o --force'
+            )
+
+        with transaction.atomic():
+            created = seed_benchmark_data(**seed_options(options))
+
+        summary = ', '.join(f'{count} {name}' for name, count in created.items())
+        self.stdout.write(self.style.SUCCESS(f'Datos creados: {summary}'))
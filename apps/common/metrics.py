@@ -0,0 +1,236 @@
+"""
+Métricas en formato de texto de Prometheus para /api/metrics/
+
+Cada proceso acumula contadores e histogramas en memoria (sin E/S por
+request). Con varios workers de gunicorn, cada uno vuelca sus valores a
+METRICS_DIR/metrics-<pid>.json como máximo cada METRICS_FLUSH_INTERVAL
+segundos; al leer /api/metrics/ se suman los archivos de todos los workers.
+Sin METRICS_DIR las métricas solo cubren el proceso que responde.
+
+El directorio debe vaciarse al iniciar el servidor (los contadores son
+acumulativos desde el arranque); gunicorn.conf.py lo hace en on_starting.
+"""
+import json
+import os
+import tempfile
+import threading
+import time
+from glob import glob
+
+from django.conf import settings
+
+
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_BUCKETS = (1, 2, 3, 5, 10, 20, 50, 100)
+
+HELP = {
+    'http_request_duration_seconds': ('histogram', 'Duración de los requests por vista y acción'),
+    'http_request_queries': ('histogram', 'Consultas SQL por request, por vista y acción'),
+    'db_connections_opened_total': ('counter', 'Conexiones a la base de datos abiertas durante los requests'),
+    'response_cache_requests_total': ('counter', 'Aciertos y fallos de la caché de respuestas'),
+    'adoption_applications_pending': ('gauge', 'Solicitudes de adopción recibidas sin revisar'),
+    'contact_messages_new': ('gauge', 'Mensajes de contacto nuevos'),
+}
+
+
+def _key(name, labels):
+    return json.dumps([name, sorted((labels or {}).items())], ensure_ascii=False)
+
+
+class MetricsRegistry:
+    """
+    Contadores e histogramas del proceso actual
+    """
+
+    def __init__(self, directory=None, flush_interval=5):
+        self.directory = directory
+        self.flush_interval = flush_interval
+        self.pid = os.getpid()
+        self.lock = threading.Lock()
+        self.counters = {}
+        self.histograms = {}
+        self.last_flush = time.monotonic()
+
+    def inc(self, name, labels=None, value=1):
+        key = _key(name, labels)
+        with self.lock:
+            self.counters[key] = self.counters.get(key, 0) + value
+        self.maybe_flush()
+
+    def observe(self, name, value, buckets, labels=None):
+        key = _key(name, labels)
+        with self.lock:
+            histogram = self.histograms.get(key)
+            if histogram is None:
+                histogram = self.histograms[key] = {
+                    'buckets': list(buckets), 'counts': [0] * len(buckets), 'sum': 0, 'count': 0
+                }
+            for index, bound in enumerate(buckets):
+                if value <= bound:
+                    histogram['counts'][index] += 1
+            histogram['sum'] += value
+            histogram['count'] += 1
+        self.maybe_flush()
+
+    def snapshot(self):
+        with self.lock:
+            return {
+                'counters': dict(self.counters),
+                'histograms': {
+                    key: {**histogram, 'counts': list(histogram['counts'])}
+                    for key, histogram in self.histograms.items()
+                },
+            }
+
+    def path(self):
+        return os.path.join(self.directory, f'metrics-{self.pid}.json')
+
+    def maybe_flush(self):
+        if self.directory and time.monotonic() - self.last_flush >= self.flush_interval:
+            self.flush()
+
+    def flush(self):
+        if not self.directory:
+            return
+        self.last_flush = time.monotonic()
+        os.makedirs(self.directory, exist_ok=True)
+        # Escritura atómica: el lector nunca ve un archivo a medias
+        descriptor, temporary = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        with os.fdopen(descriptor, 'w', encoding='utf-8') as output:
+            json.dump(self.snapshot(), output)
+        os.replace(temporary, self.path())
+
+    def collect(self):
+        """
+        Valores sumados de todos los workers
+        """
+        if not self.directory:
+            return self.snapshot()
+        self.flush()
+
+        merged = {'counters': {}, 'histograms': {}}
+        for path in glob(os.path.join(self.directory, 'metrics-*.json')):
+            try:
+                with open(path, encoding='utf-8') as source:
+                    data = json.load(source)
+            except (OSError, ValueError):
+                continue
+            for key, value in data['counters'].items():
+                merged['counters'][key] = merged['counters'].get(key, 0) + value
+            for key, histogram in data['histograms'].items():
+                target = merged['histograms'].get(key)
+                if target is None or target['buckets'] != histogram['buckets']:
+                    merged['histograms'][key] = histogram
+                    continue
+                target['counts'] = [a + b for a, b in zip(target['counts'], histogram['counts'])]
+                target['sum'] += histogram['sum']
+                target['count'] += histogram['count']
+        return merged
+
+
+_registry = None
+_registry_lock = threading.Lock()
+
+
+def get_registry():
+    """
+    Registro del proceso actual; se crea de nuevo tras un fork (preload_app)
+    """
+    global _registry
+    if _registry is None or _registry.pid != os.getpid():
+        with _registry_lock:
+            if _registry is None or _registry.pid != os.getpid():
+                _registry = MetricsRegistry(
+                    getattr(settings, 'METRICS_DIR', None),
+                    getattr(settings, 'METRICS_FLUSH_INTERVAL', 5),
+                )
+    return _registry
+
+
+def flush_metrics():
+    """
+    Volcar los valores del proceso actual (al terminar un worker)
+    """
+    if _registry is not None and _registry.pid == os.getpid():
+        _registry.flush()
+
+
+def clear_metrics_dir(directory):
+    """
+    Borrar los archivos de métricas de una ejecución anterior del servidor
+
+    Lo llama gunicorn.conf.py (on_starting) antes de crear los workers.
+    """
+    if not directory:
+        return 0
+    paths = glob(os.path.join(directory, 'metrics-*.json'))
+    for path in paths:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+    return len(paths)
+
+
+def metrics_enabled():
+    return getattr(settings, 'METRICS_ENABLED', True)
+
+
+def record_request(view, duration, queries, connections=0):
+    if not metrics_enabled():
+        return
+    registry = get_registry()
+    labels = {'view': view or 'unknown'}
+    registry.observe('http_request_duration_seconds', duration, DURATION_BUCKETS, labels)
+    registry.observe('http_request_queries', queries, QUERY_BUCKETS, labels)
+    # Comparado con http_request_duration_seconds_count muestra cuánto se reutilizan las conexiones
+    registry.inc('db_connections_opened_total', labels, connections)
+
+
+def record_cache(view, hit):
+    if not metrics_enabled():
+        return
+    get_registry().inc('response_cache_requests_total', {'view': view, 'result': 'hit' if hit else 'miss'})
+
+
+def _labels(pairs, **extra):
+    items = [*pairs, *extra.items()]
+    if not items:
+        return ''
+    rendered = ','.join(
+        '{}="{}"'.format(name, str(value).replace('\\', '\\\\').replace('"', '\\"'))
+        for name, value in items
+    )
+    return '{' + rendered + '}'
+
+
+def _number(value):
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def render(snapshot, gauges):
+    """
+    Formato de exposición de texto de Prometheus (versión 0.0.4)
+    """
+    series = {}
+    for key, value in sorted(snapshot['counters'].items()):
+        name, pairs = json.loads(key)
+        series.setdefault(name, []).append(f'{name}{_labels(pairs)} {_number(value)}')
+    for key, histogram in sorted(snapshot['histograms'].items()):
+        name, pairs = json.loads(key)
+        lines = series.setdefault(name, [])
+        for bound, count in zip(histogram['buckets'], histogram['counts']):
+            lines.append(f'{name}_bucket{_labels(pairs, le=_number(bound))} {count}')
+        lines.append(f'{name}_bucket{_labels(pairs, le="+Inf")} {histogram["count"]}')
+        lines.append(f'{name}_sum{_labels(pairs)} {_number(histogram["sum"])}')
+        lines.append(f'{name}_count{_labels(pairs)} {histogram["count"]}')
+    for name, value in gauges.items():
+        series[name] = [f'{name} {_number(value)}']
+
+    output = []
+    for name in sorted(series):
+        kind, description = HELP.get(name, ('untyped', name))
+        output.append(f'# HELP {name} {description}')
+        output.append(f'# TYPE {name} {kind}')
+        output.extend(series[name])
+    return '\n'.join(output) + '\n'
@@ -0,0 +1,62 @@
+# Generated by Django 5.2.7 on 2026-10-18 03:05
+
+from django.db import migrations, models
+from django.db.models import Count
+
+
+# Copia congelada de apps.common.counters.COUNTED_MODELS
+COUNTED_MODELS = [
+    ('pets', 'Pet', {'pets': 'status', 'species': 'species'}),
+    ('adoptions', 'AdoptionApplication', {'adoptions': 'application_status'}),
+    ('adoptions', 'SimplifiedAdoptionRequest', {'requests': 'status'}),
+    ('contact', 'ContactMessage', {'messages': 'status'}),
+    ('content', 'NewsArticle', {'news': None}),
+    ('content', 'SuccessStory', {'success_stories': None}),
+]
+
+
+def populate_counters(apps, schema_editor):
+    StatusCounter = apps.get_model('common', 'StatusCounter')
+    counters = []
+    for app_label, model_name, kinds in COUNTED_MODELS:
+        queryset = apps.get_model(app_label, model_name).objects.filter(is_active=True).order_by()
+        for kind, field in kinds.items():
+            if field is None:
+                total = queryset.count()
+                if total:
+                    counters.append(StatusCounter(kind=kind, key='', count=total))
+                continue
+            for row in queryset.values(field).annotate(count=Count('pk')):
+                counters.append(StatusCounter(kind=kind, key=row[field], count=row['count']))
+    StatusCounter.objects.bulk_create(counters)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('common', '0001_initial'),
+        ('pets', '0001_initial'),
+        ('adoptions', '0002_initial'),
+        ('contact', '0001_initial'),
+        ('content', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StatusCounter',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(max_length=50, verbose_name='Tipo')),
+                ('key', models.CharField(blank=True, max_length=50, verbose_name='Valor')),
+                ('count', models.IntegerField(default=0, verbose_name='Total')),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Contador de estado',
+                'verbose_name_plural': 'Contadores de estado',
+                'ordering': ['kind', 'key'],
+                'constraints': [models.UniqueConstraint(fields=('kind', 'key'), name='unique_status_counter')],
+            },
+        ),
+        migrations.RunPython(populate_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 5.2.7 on 2026-10-18 03:28
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('common', '0002_statuscounter'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Task',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Fecha de creación')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Fecha de modificación')),
+                ('name', models.CharField(max_length=100, verbose_name='Tarea')),
+                ('payload', models.JSONField(blank=True, default=dict, verbose_name='Argumentos')),
+                ('status', models.CharField(choices=[('pending', 'Pendiente'), ('running', 'En ejecución'), ('done', 'Completada'), ('failed', 'Fallida')], default='pending', max_length=10, verbose_name='Estado')),
+                ('idempotency_key', models.CharField(blank=True, max_length=191, null=True, unique=True, verbose_name='Clave de idempotencia')),
+                ('attempts', models.PositiveIntegerField(default=0, verbose_name='Intentos')),
+                ('max_attempts', models.PositiveIntegerField(default=5, verbose_name='Intentos máximos')),
+                ('run_at', models.DateTimeField(default=django.utils.timezone.now, verbose_name='Ejecutar a partir de')),
+                ('locked_at', models.DateTimeField(blank=True, null=True, verbose_name='Tomada en')),
+                ('locked_by', models.CharField(blank=True, max_length=100, verbose_name='Worker')),
+                ('finished_at', models.DateTimeField(blank=True, null=True, verbose_name='Finalizada en')),
+                ('last_error', models.TextField(blank=True, verbose_name='Último error')),
+            ],
+            options={
+                'verbose_name': 'Tarea en segundo plano',
+                'verbose_name_plural': 'Tareas en segundo plano',
+                'ordering': ['run_at', 'id'],
+                'indexes': [models.Index(fields=['status', 'run_at'], name='task_status_run_at_idx')],
+            },
+        ),
+    ]
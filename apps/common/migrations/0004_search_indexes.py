@@ -0,0 +1,46 @@
+"""
+Índices de texto completo para ?search= (apps.common.search)
+
+No se pueden declarar en Meta.indexes: MySQL usa un índice FULLTEXT y SQLite
+una tabla FTS5 de contenido externo con triggers. Otros motores no tienen
+backend y siguen usando LIKE.
+"""
+from django.db import migrations
+
+
+# Columnas de cada índice en esta versión del esquema
+INDEXES = {
+    ('pets', 'Pet'): ['name', 'breed', 'description'],
+    ('content', 'NewsArticle'): ['title', 'summary', 'content'],
+    ('content', 'SuccessStory'): ['title', 'pet_name', 'adopter_name', 'story'],
+}
+
+
+def create_indexes(apps, schema_editor):
+    from apps.common.search import install_search_indexes
+
+    install_search_indexes(schema_editor.connection, {
+        apps.get_model(app_label, model_name): fields
+        for (app_label, model_name), fields in INDEXES.items()
+    })
+
+
+def drop_indexes(apps, schema_editor):
+    from apps.common.search import uninstall_search_indexes
+
+    uninstall_search_indexes(schema_editor.connection, [
+        apps.get_model(app_label, model_name) for app_label, model_name in INDEXES
+    ])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('common', '0003_task'),
+        ('pets', '0004_image_renditions'),
+        ('content', '0002_image_renditions'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_indexes, drop_indexes),
+    ]
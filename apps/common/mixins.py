@@ -0,0 +1,300 @@
+"""
+Mixins reutilizables para los ViewSets de la API
+"""
+import hashlib
+
+from django.core.cache import cache
+from django.db.models import Count, Max
+from django.utils import timezone
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
+from django.utils.http import http_date
+from django_filters.rest_framework import DjangoFilterBackend
+from rest_framework import serializers, status
+from rest_framework.decorators import action
+from rest_framework.response import Response
+
+from .bulk import (
+    MAX_BULK_IDS, BulkSelectionSerializer, BulkStatusSerializer,
+    bulk_update, status_changes
+)
+from .cache import CachedResponseMixin
+from .instrumentation import current_metrics, measure
+
+
+class SerializerTimingMixin:
+    """
+    Tiempo de serialización de los serializers del ViewSet en la
+    instrumentación por request (apps.common.instrumentation)
+
+    Se mide to_representation del serializer que retorna get_serializer; con
+    many=True es el ListSerializer, así que los hijos y los serializers
+    anidados no se cuentan dos veces.
+    """
+
+    def get_serializer(self, *args, **kwargs):
+        serializer = super().get_serializer(*args, **kwargs)
+        if current_metrics() is None:
+            return serializer
+
+        represent = serializer.to_representation
+
+        def to_representation(instance):
+            with measure('serializer'):
+                return represent(instance)
+
+        serializer.to_representation = to_representation
+        return serializer
+
+
+class ConditionalGetMixin(SerializerTimingMixin):
+    """
+    GET condicional (ETag / Last-Modified) para list y retrieve
+
+    - list: ETag débil a partir de MAX(updated_at) y COUNT del queryset filtrado
+    - retrieve: updated_at de la fila (y de las relaciones en `conditional_related`)
+
+    Si el cliente ya tiene la versión actual se responde 304 sin serializar.
+    Las páginas en modo cursor no llevan validadores.
+    En vistas con CachedResponseMixin los validadores también se guardan en la
+    caché versionada, así que una revalidación anónima no toca la base de datos.
+    """
+    conditional_related = ()
+
+    def get_list_validators(self):
+        summary = self.filter_queryset(self.get_queryset()).order_by().aggregate(
+            last_modified=Max('updated_at'),
+            total=Count('pk')
+        )
+        return summary['last_modified'], summary['total']
+
+    def get_detail_queryset(self):
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        return self.filter_queryset(self.get_queryset()).filter(
+            **{self.lookup_field: self.kwargs[lookup_url_kwarg]}
+        )
+
+    def get_detail_validators(self):
+        fields = ['updated_at', *(f'{related}__updated_at' for related in self.conditional_related)]
+        row = self.get_detail_queryset().order_by().values('pk').annotate(
+            **{f'last_{index}': Max(field) for index, field in enumerate(fields)}
+        ).first()
+        if row is None:
+            return None, None
+        dates = [row[f'last_{index}'] for index in range(len(fields))]
+        return max(date for date in dates if date is not None), row['pk']
+
+    def get_validators(self, request, compute):
+        if isinstance(self, CachedResponseMixin) and self.is_response_cacheable(request):
+            key = f'{self.get_response_cache_key(request, **self.kwargs)}:validators'
+            validators = cache.get(key)
+            if validators is None:
+                validators = compute()
+                cache.set(key, validators, self.cache_timeout)
+            return validators
+        return compute()
+
+    def build_etag(self, request, *parts):
+        raw = '|'.join(str(part) for part in (
+            type(self).__name__, self.action, request.get_full_path(),
+            request.user.is_authenticated, *parts
+        ))
+        return f'W/"{hashlib.md5(raw.encode("utf-8")).hexdigest()}"'
+
+    def conditional_response(self, request, last_modified, etag, handler, *args, **kwargs):
+        if last_modified is not None and timezone.is_naive(last_modified):
+            last_modified = timezone.make_aware(last_modified)
+        timestamp = int(last_modified.timestamp()) if last_modified else None
+
+        not_modified = get_conditional_response(request._request, etag=etag, last_modified=timestamp)
+        response = Response(status=304) if not_modified is not None else handler(request, *args, **kwargs)
+
+        if response.status_code in (200, 304):
+            response['ETag'] = etag
+            if timestamp is not None:
+                response['Last-Modified'] = http_date(timestamp)
+            # Obligar al navegador a revalidar en lugar de usar su copia a ciegas
+            patch_cache_control(response, no_cache=True)
+            patch_vary_headers(response, ['Authorization'])
+        return response
+
+    def list(self, request, *args, **kwargs):
+        # El modo cursor existe para evitar COUNT(*): no se calculan validadores
+        use_keyset = getattr(self.paginator, 'use_keyset', None)
+        if use_keyset is not None and use_keyset(request):
+            return super().list(request, *args, **kwargs)
+
+        last_modified, total = self.get_validators(request, self.get_list_validators)
+        etag = self.build_etag(request, last_modified, total)
+        return self.conditional_response(request, last_modified, etag, super().list, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        last_modified, pk = self.get_validators(request, self.get_detail_validators)
+        if last_modified is None:
+            # No existe: dejar que la vista responda 404
+            return super().retrieve(request, *args, **kwargs)
+        etag = self.build_etag(request, pk, last_modified)
+        return self.conditional_response(request, last_modified, etag, super().retrieve, *args, **kwargs)
+
+
+class FastListMixin(SerializerTimingMixin):
+    """
+    Listado servido con un FastListSerializer sobre `.values()`
+
+    fast_list_serializer: instancia de FastListSerializer para la acción list.
+    La paginación (también el modo cursor) recibe diccionarios en lugar de
+    instancias; el resto de acciones usa los serializers normales.
+    """
+    fast_list_serializer = None
+
+    def get_fast_list_columns(self):
+        # El modo cursor lee los campos de orden de cada fila
+        ordering = self.ordering or []
+        if isinstance(ordering, str):
+            ordering = [ordering]
+        return ['id', *(field.lstrip('-') for field in ordering)]
+
+    def fast_list_response(self, queryset, context=None):
+        fast = self.fast_list_serializer
+        rows = fast.values(queryset, *self.get_fast_list_columns())
+        page = self.paginate_queryset(rows)
+        if page is not None:
+            with measure('serializer'):
+                data = fast.to_representation(page, context)
+            return self.get_paginated_response(data)
+        with measure('serializer'):
+            data = fast.to_representation(rows, context)
+        return Response(data)
+
+    def list(self, request, *args, **kwargs):
+        if self.fast_list_serializer is None:
+            return super().list(request, *args, **kwargs)
+        queryset = self.filter_queryset(self.get_queryset())
+        return self.fast_list_response(queryset, self.get_serializer_context())
+
+
+class BulkSelectionMixin:
+    """
+    Filas elegidas para una acción masiva: {"ids": [...]} o {"filter": {...}}
+
+    El filtro usa el FilterSet del ViewSet (filterset_fields), así que acepta
+    los mismos campos que el listado; un campo desconocido es un error, no un
+    filtro ignorado que seleccione toda la tabla.
+    """
+
+    def bulk_ids(self, queryset, data):
+        if 'ids' in data:
+            return data['ids']
+        filterset_class = DjangoFilterBackend().get_filterset_class(self, queryset)
+        allowed = filterset_class.base_filters if filterset_class else {}
+        unknown = sorted(set(data['filter']) - set(allowed))
+        if unknown:
+            raise serializers.ValidationError({'filter': f'Campos no permitidos: {", ".join(unknown)}'})
+        filterset = filterset_class(data=data['filter'], queryset=queryset, request=self.request)
+        if not filterset.is_valid():
+            raise serializers.ValidationError({'filter': filterset.errors})
+        ids = list(filterset.qs.order_by('pk').values_list('pk', flat=True)[:MAX_BULK_IDS + 1])
+        if len(ids) > MAX_BULK_IDS:
+            raise serializers.ValidationError(
+                {'filter': f'El filtro selecciona más de {MAX_BULK_IDS} filas'}
+            )
+        return ids
+
+    def bulk_apply(self, request, serializer, changes, state=None):
+        """
+        Validar la selección y aplicar `changes(datos validados)`
+
+        Retorna (Response, pk actualizados); los pk son None si hubo error.
+        """
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST), None
+        queryset = self.get_queryset()
+        try:
+            ids = self.bulk_ids(queryset, serializer.validated_data)
+        except serializers.ValidationError as error:
+            return Response(error.detail, status=status.HTTP_400_BAD_REQUEST), None
+        data = serializer.validated_data
+        count, results = bulk_update(queryset, ids, changes(data), state(data) if state else None)
+        updated = [item['id'] for item in results if item['result'] == 'updated']
+        return Response({'count': count, 'results': results}), updated
+
+
+class SoftDeleteMixin(BulkSelectionMixin):
+    """
+    Borrado lógico para ViewSets de modelos que heredan de BaseModel
+
+    DELETE solo escribe is_active y updated_at. Además agrega, para admins:
+
+    - POST bulk_delete/  {"ids": [...]} o {"filter": {...}}: desactivar varias filas
+    - POST bulk_restore/ (misma selección): reactivarlas
+
+    Cada una es un solo UPDATE y responde el resultado por ID.
+    """
+
+    def perform_destroy(self, instance):
+        instance.soft_delete()
+
+    @action(detail=False, methods=['post'])
+    def bulk_delete(self, request):
+        """
+        POST /.../bulk_delete/  Body: {"ids": [1, 2, 3]}
+        """
+        serializer = BulkSelectionSerializer(data=request.data)
+        return self.bulk_apply(request, serializer, lambda data: {'is_active': False})[0]
+
+    @action(detail=False, methods=['post'])
+    def bulk_restore(self, request):
+        """
+        POST /.../bulk_restore/  Body: {"ids": [1, 2, 3]}
+        """
+        serializer = BulkSelectionSerializer(data=request.data)
+        return self.bulk_apply(request, serializer, lambda data: {'is_active': True})[0]
+
+
+class BulkStatusMixin(BulkSelectionMixin):
+    """
+    POST bulk_status/ para admins: cambiar el estado de varias filas
+
+        {"ids": [1, 2], "status": "resolved"}
+        {"filter": {"status": "new"}, "status": "in_progress"}
+
+    Un solo UPDATE con los mismos campos de auditoría que el cambio individual;
+    las filas que ya están en ese estado responden "unchanged" y no se tocan.
+
+    - bulk_status_fields: (campo de estado, usuario que hizo el cambio, fecha
+      del cambio), ver apps.common.bulk.status_changes; se toma de
+      Model.BULK_STATUS_FIELDS para que el admin use los mismos campos
+    - bulk_status_exclude: estados con su propio flujo, no aplicables en bloque
+    - bulk_status_changes: columnas a escribir (se puede extender)
+    - bulk_status_done: recibe los pk que cambiaron; update() no dispara
+      señales, así que aquí se encolan los efectos secundarios
+    """
+    bulk_status_fields = ('status', None, None)
+    bulk_status_exclude = ()
+
+    def bulk_status_changes(self, value):
+        return status_changes(self.bulk_status_fields, value, self.request.user)
+
+    def bulk_status_done(self, pks, value):
+        pass
+
+    @action(detail=False, methods=['post'])
+    def bulk_status(self, request):
+        """
+        POST /.../bulk_status/  Body: {"ids": [1, 2, 3], "status": "..."}
+        """
+        model = self.get_queryset().model
+        field = self.bulk_status_fields[0]
+        choices = [
+            choice for choice in model._meta.get_field(field).choices
+            if choice[0] not in self.bulk_status_exclude
+        ]
+        serializer = BulkStatusSerializer(data=request.data, choices=choices)
+        response, updated = self.bulk_apply(
+            request, serializer,
+            lambda data: self.bulk_status_changes(data['status']),
+            state=lambda data: {field: data['status']}
+        )
+        if updated:
+            self.bulk_status_done(updated, serializer.validated_data['status'])
+        return response
+
@@ -1,4 +1,5 @@
 from django.db import models
+from django.utils import timezone
 from django.core.validators import RegexValidator
 
 
@@ -29,6 +30,12 @@ class TimestampedModel(models.Model):
     class Meta:
         abstract = True
 
+    def save_fields(self, *fields):
+        """
+        Guardar solo las columnas indicadas (y updated_at) en lugar de toda la fila
+        """
+        self.save(update_fields=[*fields, 'updated_at'])
+
 
 class ActiveManager(models.Manager):
     """
@@ -54,6 +61,26 @@ class BaseModel(TimestampedModel):
     class Meta:
         abstract = True
 
+    def soft_delete(self):
+        """
+        Borrado lógico; retorna False si ya estaba inactivo
+        """
+        if not self.is_active:
+            return False
+        self.is_active = False
+        self.save_fields('is_active')
+        return True
+
+    def restore(self):
+        """
+        Reactivar un registro borrado lógicamente; retorna False si ya estaba activo
+        """
+        if self.is_active:
+            return False
+        self.is_active = True
+        self.save_fields('is_active')
+        return True
+
 
 class Address(BaseModel):
     """
@@ -160,4 +187,120 @@ class SiteConfiguration(models.Model):
         # Solo permitir una configuración
         if not self.pk and SiteConfiguration.objects.exists():
             raise ValueError('Solo puede existir una configuración del sitio')
-        super().save(*args, **kwargs)
\ No newline at end of file
+        super().save(*args, **kwargs)
+
+class StatusCounter(models.Model):
+    """
+    Totales materializados por estado/especie para los dashboards
+
+    Se mantiene de forma incremental mediante señales (apps.common.signals)
+    y puede reconstruirse con `python manage.py rebuild_counters`.
+    """
+    kind = models.CharField(
+        max_length=50,
+        verbose_name='Tipo'
+    )
+    key = models.CharField(
+        max_length=50,
+        blank=True,
+        verbose_name='Valor'
+    )
+    count = models.IntegerField(
+        default=0,
+        verbose_name='Total'
+    )
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = 'Contador de estado'
+        verbose_name_plural = 'Contadores de estado'
+        ordering = ['kind', 'key']
+        constraints = [
+            models.UniqueConstraint(fields=['kind', 'key'], name='unique_status_counter'),
+        ]
+
+    def __str__(self):
+        return f"{self.kind}:{self.key} = {self.count}"
+
+
+class Task(TimestampedModel):
+    """
+    Tarea en segundo plano (cola respaldada por la base de datos)
+
+    Se encola con apps.common.tasks.enqueue y la ejecuta
+    `python manage.py run_tasks`. Con `idempotency_key` la misma tarea
+    solo se encola una vez.
+    """
+
+    STATUS_CHOICES = [
+        ('pending', 'Pendiente'),
+        ('running', 'En ejecución'),
+        ('done', 'Completada'),
+        ('failed', 'Fallida'),
+    ]
+
+    name = models.CharField(
+        max_length=100,
+        verbose_name='Tarea'
+    )
+    payload = models.JSONField(
+        default=dict,
+        blank=True,
+        verbose_name='Argumentos'
+    )
+    status = models.CharField(
+        max_length=10,
+        choices=STATUS_CHOICES,
+        default='pending',
+        verbose_name='Estado'
+    )
+    idempotency_key = models.CharField(
+        max_length=191,
+        unique=True,
+        null=True,
+        blank=True,
+        verbose_name='Clave de idempotencia'
+    )
+    attempts = models.PositiveIntegerField(
+        default=0,
+        verbose_name='Intentos'
+    )
+    max_attempts = models.PositiveIntegerField(
+        default=5,
+        verbose_name='Intentos máximos'
+    )
+    run_at = models.DateTimeField(
+        default=timezone.now,
+        verbose_name='Ejecutar a partir de'
+    )
+    locked_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        verbose_name='Tomada en'
+    )
+    locked_by = models.CharField(
+        max_length=100,
+        blank=True,
+        verbose_name='Worker'
+    )
+    finished_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        verbose_name='Finalizada en'
+    )
+    last_error = models.TextField(
+        blank=True,
+        verbose_name='Último error'
+    )
+
+    class Meta:
+        verbose_name = 'Tarea en segundo plano'
+        verbose_name_plural = 'Tareas en segundo plano'
+        ordering = ['run_at', 'id']
+        indexes = [
+            # El worker busca las tareas pendientes que ya deben ejecutarse
+            models.Index(fields=['status', 'run_at'], name='task_status_run_at_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.name} ({self.get_status_display()})"
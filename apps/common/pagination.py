@@ -0,0 +1,208 @@
+"""
+Paginación de la API
+
+Por defecto se usa paginación por número de página (compatible con el
+frontend actual). Con `?pagination=cursor` se activa la paginación por
+cursor (keyset), que no ejecuta COUNT(*) ni OFFSET y mantiene el mismo costo
+en cualquier página.
+
+Contrato de orden del modo cursor: se usa el `ordering` de la vista (o el de
+Meta.ordering del modelo) más `id` como desempate, siempre en ese orden; el
+parámetro `?ordering=` se ignora. Los campos de orden no deben ser nulos.
+"""
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from datetime import date, datetime
+from decimal import Decimal
+from functools import partial
+
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+def _encode_value(value):
+    # isoformat conserva los microsegundos, necesarios para no repetir filas
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return str(value)
+    return value
+
+
+def _model_field(model, path):
+    """
+    Campo del modelo para una ruta de orden ('id', 'pk' o 'relacion__campo')
+    """
+    *relations, name = path.split('__')
+    for relation in relations:
+        model = model._meta.get_field(relation).related_model
+    if name == 'pk':
+        return model._meta.pk
+    return model._meta.get_field(name)
+
+
+def _invert(field):
+    return field[1:] if field.startswith('-') else f'-{field}'
+
+
+class KeysetPagination(BasePagination):
+    """
+    Paginación por cursor sobre (campos de orden de la vista, id)
+    """
+    cursor_query_param = 'cursor'
+    page_query_param = 'page'
+    page_size = api_settings.PAGE_SIZE
+    invalid_cursor_message = 'Cursor inválido'
+    display_page_controls = False
+
+    def get_ordering(self, queryset, view):
+        ordering = getattr(view, 'ordering', None) or queryset.model._meta.ordering or ['-created_at']
+        if isinstance(ordering, str):
+            ordering = [ordering]
+        ordering = list(ordering)
+
+        if not any(field.lstrip('-') in ('id', 'pk') for field in ordering):
+            ordering.append('-id' if ordering[0].startswith('-') else 'id')
+        return ordering
+
+    def decode_cursor(self, request, model):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None, False
+
+        try:
+            data = json.loads(urlsafe_b64decode(encoded.encode('ascii')))
+            values, reverse = data['v'], bool(data.get('r'))
+        except (TypeError, ValueError, KeyError, UnicodeError):
+            raise NotFound(self.invalid_cursor_message)
+
+        if not isinstance(values, list) or len(values) != len(self.ordering):
+            raise NotFound(self.invalid_cursor_message)
+        return [self.decode_value(model, field, value) for field, value in zip(self.ordering, values)], reverse
+
+    def decode_value(self, model, field, value):
+        """
+        Valor del cursor convertido al tipo del campo de orden
+
+        Un cursor armado a mano con valores de otro tipo o nulos es inválido
+        (404), no un error del servidor.
+        """
+        if value is None or isinstance(value, (dict, list)):
+            raise NotFound(self.invalid_cursor_message)
+        try:
+            return _model_field(model, field.lstrip('-')).to_python(value)
+        except FieldDoesNotExist:
+            # Anotación de la vista: se compara tal cual
+            return value
+        except (ValidationError, TypeError, ValueError):
+            raise NotFound(self.invalid_cursor_message)
+
+    def encode_cursor(self, instance, reverse=False):
+        # Las filas pueden ser instancias o diccionarios de .values()
+        read = instance.get if isinstance(instance, dict) else partial(getattr, instance)
+        values = [_encode_value(read(field.lstrip('-'))) for field in self.ordering]
+        data = {'v': values}
+        if reverse:
+            data['r'] = 1
+        encoded = urlsafe_b64encode(json.dumps(data).encode('ascii')).decode('ascii')
+        url = remove_query_param(self.base_url, self.page_query_param)
+        return replace_query_param(url, self.cursor_query_param, encoded)
+
+    def after_position(self, ordering, values):
+        """
+        Filtro lexicográfico: filas posteriores a `values` según `ordering`
+        """
+        condition = Q()
+        for index, field in enumerate(ordering):
+            lookup = 'lt' if field.startswith('-') else 'gt'
+            step = Q(**{f'{field.lstrip("-")}__{lookup}': values[index]})
+            for previous, value in zip(ordering[:index], values):
+                step &= Q(**{previous.lstrip('-'): value})
+            condition |= step
+        return condition
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.base_url = request.build_absolute_uri()
+        self.ordering = self.get_ordering(queryset, view)
+        values, reverse = self.decode_cursor(request, queryset.model)
+
+        ordering = [_invert(field) for field in self.ordering] if reverse else self.ordering
+        queryset = queryset.order_by(*ordering)
+        if values is not None:
+            queryset = queryset.filter(self.after_position(ordering, values))
+
+        results = list(queryset[:self.page_size + 1])
+        has_more = len(results) > self.page_size
+        results = results[:self.page_size]
+        if reverse:
+            results.reverse()
+
+        self.has_next = values is not None if reverse else has_more
+        self.has_previous = has_more if reverse else values is not None
+        self.page = results
+        return results
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_cursor(self.page[-1])
+
+    def get_previous_link(self):
+        if not self.has_previous or not self.page:
+            return None
+        return self.encode_cursor(self.page[0], reverse=True)
+
+    def get_paginated_response(self, data):
+        return Response({
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+            'results': data,
+        })
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'required': ['results'],
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'previous': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'results': schema,
+            },
+        }
+
+
+class StandardResultsPagination(PageNumberPagination):
+    """
+    Paginación por número de página con modo cursor opcional por request
+
+    ?pagination=cursor activa el modo cursor; los enlaces next/previous
+    incluyen `cursor`, que por sí solo también activa el modo.
+    """
+    mode_query_param = 'pagination'
+    keyset_class = KeysetPagination
+    keyset = None
+
+    def use_keyset(self, request):
+        return (
+            request.query_params.get(self.mode_query_param) == 'cursor'
+            or self.keyset_class.cursor_query_param in request.query_params
+        )
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.keyset = None
+        if self.use_keyset(request):
+            self.keyset = self.keyset_class()
+            self.keyset.page_size = self.get_page_size(request) or self.keyset.page_size
+            self.display_page_controls = False
+            return self.keyset.paginate_queryset(queryset, request, view)
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        if self.keyset is not None:
+            return self.keyset.get_paginated_response(data)
+        return super().get_paginated_response(data)
@@ -1,72 +1,130 @@
+"""
+Permisos por rol: un solo motor para todas las vistas y AdminUser.has_permission
+
+CAPABILITY_ROLES define qué roles tienen cada capacidad; al importar el
+módulo se compila una sola vez en ROLE_CAPABILITIES (rol -> frozenset). Las
+capacidades del usuario se calculan una vez por request y cada verificación
+es una búsqueda en un conjunto.
+
+Los ViewSets declaran la capacidad requerida en lugar de get_permissions:
+
+    permission_classes = [HasCapability]
+    required_capability = 'pets'                       # acciones no listadas
+    action_capabilities = {'list': PUBLIC, 'retrieve': PUBLIC}
+
+Las vistas de función usan require('metrics').
+"""
+from django.core.exceptions import ImproperlyConfigured
 from rest_framework import permissions
 
 
-class IsAdminUser(permissions.BasePermission):
+# Acción abierta a cualquier visitante
+PUBLIC = None
+
+# Capacidad -> roles que la tienen
+CAPABILITY_ROLES = {
+    'pets': ['super_admin', 'admin', 'volunteer', 'veterinarian'],
+    'adoptions': ['super_admin', 'admin', 'volunteer'],
+    'contact': ['super_admin', 'admin', 'volunteer'],
+    'content': ['super_admin', 'admin'],
+    'users': ['super_admin'],
+    'metrics': ['super_admin'],
+}
+
+ALL_CAPABILITIES = frozenset(CAPABILITY_ROLES)
+NO_CAPABILITIES = frozenset()
+
+
+def compile_roles(capability_roles):
+    roles = {}
+    for capability, role_names in capability_roles.items():
+        for role in role_names:
+            roles.setdefault(role, set()).add(capability)
+    return {role: frozenset(capabilities) for role, capabilities in roles.items()}
+
+
+ROLE_CAPABILITIES = compile_roles(CAPABILITY_ROLES)
+
+
+def user_capabilities(user):
     """
-    Permiso para usuarios administradores autenticados
+    Capacidades efectivas de un usuario (conjunto vacío si es anónimo)
     """
-    def has_permission(self, request, view):
-        return request.user and request.user.is_authenticated
+    if not user or not user.is_authenticated:
+        return NO_CAPABILITIES
+    if user.is_superuser:
+        return ALL_CAPABILITIES
+    return ROLE_CAPABILITIES.get(getattr(user, 'role', None), NO_CAPABILITIES)
 
 
-class IsSuperAdmin(permissions.BasePermission):
+def get_capabilities(request):
     """
-    Permiso solo para super administradores
+    Capacidades del usuario del request, calculadas una vez por request
     """
-    def has_permission(self, request, view):
-        return (
-            request.user and 
-            request.user.is_authenticated and 
-            request.user.role == 'super_admin'
-        )
+    # Se guardan en el HttpRequest para compartirlas entre vistas y permisos
+    target = getattr(request, '_request', request)
+    user = request.user
+    cached = getattr(target, '_capabilities', None)
+    if cached is None or cached[0] != user.pk:
+        cached = target._capabilities = (user.pk, user_capabilities(user))
+    return cached[1]
+
+
+def has_capability(request, capability):
+    return capability in get_capabilities(request)
 
 
-class CanManagePets(permissions.BasePermission):
+class HasCapability(permissions.BasePermission):
     """
-    Permiso para gestionar mascotas
+    Capacidad requerida por la acción del ViewSet
+
+    action_capabilities[acción] o, si la acción no está listada,
+    required_capability. PUBLIC (None) permite el acceso sin autenticación.
     """
+
+    def required(self, view):
+        action = getattr(view, 'action', None)
+        overrides = getattr(view, 'action_capabilities', {})
+        if action in overrides:
+            return overrides[action]
+        # Sin declaración no hay un valor por defecto seguro: ni público ni cerrado
+        if not hasattr(view, 'required_capability'):
+            raise ImproperlyConfigured(f'{type(view).__name__} debe declarar required_capability')
+        return view.required_capability
+
     def has_permission(self, request, view):
-        if not request.user or not request.user.is_authenticated:
-            return False
-        
-        # Roles que pueden gestionar mascotas
-        allowed_roles = ['super_admin', 'admin', 'volunteer', 'veterinarian']
-        return request.user.role in allowed_roles
+        capability = self.required(view)
+        return capability is PUBLIC or capability in get_capabilities(request)
 
 
-class CanManageAdoptions(permissions.BasePermission):
+class RequiresCapability(HasCapability):
     """
-    Permiso para gestionar adopciones
+    Capacidad fija, sin importar la vista (ver require)
     """
-    def has_permission(self, request, view):
-        if not request.user or not request.user.is_authenticated:
-            return False
-        
-        # Roles que pueden gestionar adopciones
-        allowed_roles = ['super_admin', 'admin', 'volunteer']
-        return request.user.role in allowed_roles
+    capability = PUBLIC
+
+    def required(self, view):
+        return self.capability
 
 
-class CanManageContent(permissions.BasePermission):
+def require(capability):
     """
-    Permiso para gestionar contenido (noticias, historias)
+    Clase de permiso para una capacidad fija (vistas de función)
     """
-    def has_permission(self, request, view):
-        if not request.user or not request.user.is_authenticated:
-            return False
-        
-        # Roles que pueden gestionar contenido
-        allowed_roles = ['super_admin', 'admin']
-        return request.user.role in allowed_roles
+    return type(f'Requires_{capability}', (RequiresCapability,), {'capability': capability})
 
 
-class CanManageUsers(permissions.BasePermission):
+class IsAdminUser(permissions.BasePermission):
     """
-    Permiso para gestionar usuarios (solo super_admin)
+    Permiso para usuarios administradores autenticados (cualquier rol)
     """
     def has_permission(self, request, view):
-        return (
-            request.user and 
-            request.user.is_authenticated and 
-            request.user.role == 'super_admin'
-        )
\ No newline at end of file
+        return bool(get_capabilities(request))
+
+
+# Clases anteriores, ahora respaldadas por el mismo motor
+IsSuperAdmin = require('users')
+CanManagePets = require('pets')
+CanManageAdoptions = require('adoptions')
+CanManageContent = require('content')
+CanManageUsers = require('users')
@@ -0,0 +1,204 @@
+"""
+Lecturas públicas desde una réplica de la base de datos
+
+Con un alias `replica` en DATABASES (DB_REPLICA_HOST en production.py y
+development.py), ReadReplicaMiddleware marca los requests que pueden leer de
+la réplica y ReadReplicaRouter envía ahí sus lecturas:
+
+- métodos seguros (GET, HEAD) sin token ni sesión de administrador
+- acciones PUBLIC de los ViewSets (action_capabilities) y las vistas async
+  públicas (apps.common.async_api)
+- solo modelos de READ_REPLICA_APPS (mascotas y contenido); tokens, sesiones,
+  caché en base de datos y contadores siempre se leen del primario
+
+Las escrituras y las lecturas de administradores van a `default`. Después de
+una escritura exitosa, el mismo cliente lee del primario durante
+READ_REPLICA_PIN_SECONDS segundos, así ve su propio cambio aunque la réplica
+tenga retraso (read-your-writes). El cliente es el usuario autenticado; solo
+las escrituras anónimas (formularios públicos) se identifican por IP, que se
+comparte detrás de un NAT. La marca se guarda en la caché, compartida entre
+workers en producción.
+
+`migrate` no crea tablas en la réplica (recibe el esquema por replicación),
+salvo con READ_REPLICA_MIGRATE (tests, donde la réplica es otra base).
+
+La caché de respuestas (apps.common.cache) se llena desde el primario durante
+esos mismos segundos después de cambiar uno de sus modelos: si no, un cliente
+que lee de una réplica atrasada dejaría en la caché la versión anterior con la
+generación nueva.
+"""
+import hashlib
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, connections
+
+from .permissions import PUBLIC
+from .utils import get_client_ip
+
+
+REPLICA_ALIAS = 'replica'
+SAFE_METHODS = ('GET', 'HEAD')
+
+_state = ContextVar('read_replica', default=None)
+
+
+class ReadState:
+    """
+    Decisión del request en curso; la vista la puede cambiar antes de consultar
+    """
+    replica = False
+
+
+def replica_configured():
+    return REPLICA_ALIAS in connections.settings
+
+
+def pin_key(request):
+    # DRF copia al HttpRequest el usuario autenticado por token
+    user = getattr(request, 'user', None)
+    if user is not None and user.is_authenticated:
+        return f'replica-pin:user:{user.pk}'
+    digest = hashlib.sha256((get_client_ip(request) or '').encode('utf-8')).hexdigest()
+    return f'replica-pin:{digest}'
+
+
+def is_pinned(request):
+    return cache.get(pin_key(request)) is not None
+
+
+def pin_to_primary(request):
+    """
+    Leer del primario durante READ_REPLICA_PIN_SECONDS (el cliente acaba de escribir)
+    """
+    seconds = getattr(settings, 'READ_REPLICA_PIN_SECONDS', 5)
+    if seconds:
+        cache.set(pin_key(request), 1, seconds)
+
+
+def written_key(model):
+    return f'replica-written:{model._meta.label_lower}'
+
+
+def mark_written(model):
+    """
+    El modelo cambió: las respuestas que se guarden en caché durante
+    READ_REPLICA_PIN_SECONDS se leen del primario (bump_generation)
+    """
+    seconds = getattr(settings, 'READ_REPLICA_PIN_SECONDS', 5)
+    if seconds and replica_configured():
+        cache.set(written_key(model), 1, seconds)
+
+
+def read_primary_if_written(models):
+    """
+    Antes de llenar la caché de respuestas: leer del primario si alguno de los
+    modelos cambió hace poco
+    """
+    state = _state.get()
+    if state is not None and state.replica and cache.get_many([written_key(model) for model in models]):
+        state.replica = False
+
+
+async def aread_primary_if_written(models):
+    """
+    Versión async de read_primary_if_written
+    """
+    state = _state.get()
+    if state is not None and state.replica and await cache.aget_many([written_key(model) for model in models]):
+        state.replica = False
+
+
+def is_public_read(request, view_func):
+    """
+    Request seguro y anónimo a una acción pública
+    """
+    if request.method not in SAFE_METHODS or 'HTTP_AUTHORIZATION' in request.META:
+        return False
+    cls = getattr(view_func, 'cls', None)
+    if cls is None:
+        return getattr(view_func, 'replica_reads', False)
+    actions = getattr(view_func, 'actions', None) or {}
+    # HEAD usa la acción de GET
+    action = actions.get(request.method.lower()) or actions.get('get')
+    capabilities = getattr(cls, 'action_capabilities', {})
+    if action not in capabilities or capabilities[action] is not PUBLIC:
+        return False
+    # Sesión de Django (admin): mismas lecturas que con token
+    return not request.user.is_authenticated
+
+
+class ReadReplicaMiddleware:
+    """
+    Decide por request si las lecturas pueden ir a la réplica; va después de
+    AuthenticationMiddleware
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        token = _state.set(ReadState())
+        try:
+            response = self.get_response(request)
+        finally:
+            _state.reset(token)
+        self.finish(request, response)
+        return response
+
+    async def __acall__(self, request):
+        token = _state.set(ReadState())
+        try:
+            response = await self.get_response(request)
+        finally:
+            _state.reset(token)
+        await sync_to_async(self.finish)(request, response)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        state = _state.get()
+        if state is not None and replica_configured() and is_public_read(request, view_func):
+            state.replica = not is_pinned(request)
+
+    def finish(self, request, response):
+        if replica_configured() and request.method not in SAFE_METHODS and response.status_code < 400:
+            pin_to_primary(request)
+
+
+class ReadReplicaRouter:
+    """
+    Lecturas de los requests marcados por ReadReplicaMiddleware a `replica`;
+    todo lo demás a `default`
+    """
+
+    def db_for_read(self, model, **hints):
+        instance = hints.get('instance')
+        if instance is not None and instance._state.db:
+            # Relaciones de un objeto: de la misma base que el objeto
+            return instance._state.db
+        state = _state.get()
+        if state is not None and state.replica and model._meta.app_label in settings.READ_REPLICA_APPS:
+            return REPLICA_ALIAS
+        return DEFAULT_DB_ALIAS
+
+    def db_for_write(self, model, **hints):
+        # También para objetos leídos de la réplica
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Las dos bases tienen los mismos datos
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        if db == REPLICA_ALIAS:
+            return getattr(settings, 'READ_REPLICA_MIGRATE', False)
+        return None
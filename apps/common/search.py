@@ -0,0 +1,255 @@
+"""
+Búsqueda de texto completo para el parámetro `?search=`
+
+SearchFilter de DRF genera `LIKE '%termino%'` sobre columnas de texto, que
+siempre recorre la tabla completa. FullTextSearchFilter usa en su lugar un
+índice de texto completo según el motor de la base de datos:
+
+- MySQL: índice FULLTEXT (InnoDB), MATCH ... AGAINST en modo booleano.
+  Con la colación utf8mb4 (*_ai_ci) las comparaciones ignoran acentos.
+- SQLite: tabla virtual FTS5 con tokenizer `unicode61 remove_diacritics 2`,
+  sincronizada con triggers.
+
+Cada término busca por prefijo y todos deben aparecer ("peque" encuentra
+"pequeño" y "pequeno" encuentra "pequeño"). Los resultados se ordenan por
+relevancia salvo que se pida `?ordering=`. Los modelos sin índice
+registrado o los motores sin backend usan el SearchFilter de DRF.
+
+Los índices se crean en la migración common.0004_search_indexes (con su
+operación inversa). En SQLite, una migración que reconstruya una de estas
+tablas borra sus triggers: debe volver a llamar a install_search_indexes.
+Los tests, que corren sin migraciones, los crean al terminar `migrate`.
+"""
+import logging
+import re
+
+from django.conf import settings
+from django.db import DatabaseError, connections
+from django.db.models.expressions import RawSQL
+from django.utils.module_loading import import_string
+from rest_framework import filters
+
+from apps.content.models import NewsArticle, SuccessStory
+from apps.pets.models import Pet
+
+
+logger = logging.getLogger(__name__)
+
+# Modelo -> columnas del índice de texto completo
+SEARCH_INDEXES = {
+    Pet: ['name', 'breed', 'description'],
+    NewsArticle: ['title', 'summary', 'content'],
+    SuccessStory: ['title', 'pet_name', 'adopter_name', 'story'],
+}
+
+WORD_RE = re.compile(r'\w+')
+
+
+def search_words(terms):
+    """
+    Palabras de la búsqueda, sin operadores del lenguaje de consulta
+    """
+    return [word for term in terms for word in WORD_RE.findall(term)]
+
+
+class SearchBackend:
+    """
+    Interfaz de un backend de búsqueda
+
+    install: crear el índice si no existe
+    uninstall: borrarlo si existe
+    search: filtrar el queryset y anotar `search_rank` (mayor es más relevante)
+    """
+
+    def index_name(self, model):
+        return f'{model._meta.db_table}_search'
+
+    def columns(self, connection, model, fields):
+        return [connection.ops.quote_name(model._meta.get_field(field).column) for field in fields]
+
+    def install(self, connection, model, fields):
+        raise NotImplementedError
+
+    def uninstall(self, connection, model):
+        raise NotImplementedError
+
+    def search(self, queryset, fields, words):
+        raise NotImplementedError
+
+
+class SQLiteFTS5Backend(SearchBackend):
+    """
+    Tabla FTS5 de contenido externo sobre la tabla del modelo
+    """
+    tokenizer = 'unicode61 remove_diacritics 2'
+
+    def install(self, connection, model, fields):
+        quote = connection.ops.quote_name
+        table, index = quote(model._meta.db_table), quote(self.index_name(model))
+        pk = quote(model._meta.pk.column)
+        columns = self.columns(connection, model, fields)
+        column_list = ', '.join(columns)
+        new_values = ', '.join(f'new.{column}' for column in columns)
+        old_values = ', '.join(f'old.{column}' for column in columns)
+        trigger = self.index_name(model)
+
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"CREATE VIRTUAL TABLE IF NOT EXISTS {index} USING fts5("
+                f"{column_list}, content={table}, content_rowid={pk}, tokenize='{self.tokenizer}')"
+            )
+            cursor.execute(
+                f'CREATE TRIGGER IF NOT EXISTS {quote(trigger + "_ai")} AFTER INSERT ON {table} BEGIN '
+                f'INSERT INTO {index}(rowid, {column_list}) VALUES (new.{pk}, {new_values}); END'
+            )
+            cursor.execute(
+                f'CREATE TRIGGER IF NOT EXISTS {quote(trigger + "_ad")} AFTER DELETE ON {table} BEGIN '
+                f"INSERT INTO {index}({index}, rowid, {column_list}) VALUES ('delete', old.{pk}, {old_values}); END"
+            )
+            cursor.execute(
+                f'CREATE TRIGGER IF NOT EXISTS {quote(trigger + "_au")} AFTER UPDATE ON {table} BEGIN '
+                f"INSERT INTO {index}({index}, rowid, {column_list}) VALUES ('delete', old.{pk}, {old_values}); "
+                f'INSERT INTO {index}(rowid, {column_list}) VALUES (new.{pk}, {new_values}); END'
+            )
+            # Indexar las filas que existían antes de crear la tabla
+            cursor.execute(f"INSERT INTO {index}({index}) VALUES ('rebuild')")
+
+    def uninstall(self, connection, model):
+        quote = connection.ops.quote_name
+        trigger = self.index_name(model)
+        with connection.cursor() as cursor:
+            for suffix in ('_ai', '_ad', '_au'):
+                cursor.execute(f'DROP TRIGGER IF EXISTS {quote(trigger + suffix)}')
+            cursor.execute(f'DROP TABLE IF EXISTS {quote(self.index_name(model))}')
+
+    def search(self, queryset, fields, words):
+        connection = connections[queryset.db]
+        quote = connection.ops.quote_name
+        index = quote(self.index_name(queryset.model))
+        table = quote(queryset.model._meta.db_table)
+        pk = quote(queryset.model._meta.pk.column)
+        query = ' '.join('"{}"*'.format(word.replace('"', '')) for word in words)
+
+        return queryset.filter(
+            pk__in=RawSQL(f'SELECT rowid FROM {index} WHERE {index} MATCH %s', [query])
+        ).annotate(search_rank=RawSQL(
+            # bm25: más negativo es más relevante
+            f'SELECT -rank FROM {index} WHERE {index} MATCH %s AND rowid = {table}.{pk}', [query]
+        ))
+
+
+class MySQLFullTextBackend(SearchBackend):
+    """
+    Índice FULLTEXT de InnoDB sobre las columnas del modelo
+
+    InnoDB ignora palabras más cortas que innodb_ft_min_token_size (3 por defecto).
+    """
+
+    def exists(self, connection, model):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                'SELECT 1 FROM information_schema.statistics '
+                'WHERE table_schema = DATABASE() AND table_name = %s AND index_name = %s LIMIT 1',
+                [model._meta.db_table, self.index_name(model)]
+            )
+            return cursor.fetchone() is not None
+
+    def install(self, connection, model, fields):
+        if self.exists(connection, model):
+            return
+        quote = connection.ops.quote_name
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'ALTER TABLE {quote(model._meta.db_table)} ADD FULLTEXT INDEX '
+                f'{quote(self.index_name(model))} ({", ".join(self.columns(connection, model, fields))})'
+            )
+
+    def uninstall(self, connection, model):
+        if not self.exists(connection, model):
+            return
+        quote = connection.ops.quote_name
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'ALTER TABLE {quote(model._meta.db_table)} DROP INDEX {quote(self.index_name(model))}'
+            )
+
+    def search(self, queryset, fields, words):
+        connection = connections[queryset.db]
+        table = connection.ops.quote_name(queryset.model._meta.db_table)
+        columns = ', '.join(
+            f'{table}.{column}' for column in self.columns(connection, queryset.model, fields)
+        )
+        query = ' '.join(f'+{word}*' for word in words)
+        return queryset.annotate(search_rank=RawSQL(
+            f'MATCH ({columns}) AGAINST (%s IN BOOLEAN MODE)', [query]
+        )).filter(search_rank__gt=0)
+
+
+BACKENDS = {
+    'sqlite': SQLiteFTS5Backend,
+    'mysql': MySQLFullTextBackend,
+}
+
+
+def get_backend(using='default'):
+    """
+    Backend para la conexión; SEARCH_BACKENDS permite reemplazarlo por motor
+    """
+    vendor = connections[using].vendor
+    path = getattr(settings, 'SEARCH_BACKENDS', {}).get(vendor)
+    backend_class = import_string(path) if path else BACKENDS.get(vendor)
+    return backend_class() if backend_class else None
+
+
+def install_search_indexes(connection, indexes=None):
+    """
+    Crear los índices de `indexes` ({modelo: columnas}, por defecto
+    SEARCH_INDEXES) con el backend del motor de la conexión
+
+    La migración pasa los modelos históricos y las columnas de ese momento.
+    """
+    backend = get_backend(connection.alias)
+    if backend is None:
+        return
+    for model, fields in (indexes or SEARCH_INDEXES).items():
+        try:
+            backend.install(connection, model, fields)
+        except DatabaseError:
+            # Sin soporte (p. ej. SQLite sin FTS5): ?search= usa LIKE
+            logger.warning('No se pudo crear el índice de búsqueda de %s', model._meta.label, exc_info=True)
+
+
+def uninstall_search_indexes(connection, models=None):
+    """
+    Borrar los índices de `models` (por defecto los de SEARCH_INDEXES)
+    """
+    backend = get_backend(connection.alias)
+    if backend is None:
+        return
+    for model in models or SEARCH_INDEXES:
+        backend.uninstall(connection, model)
+
+
+class FullTextSearchFilter(filters.SearchFilter):
+    """
+    SearchFilter sobre el índice de texto completo, ordenado por relevancia
+
+    Debe ir después de OrderingFilter en filter_backends para que la
+    relevancia reemplace el orden por defecto.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        fields = SEARCH_INDEXES.get(queryset.model)
+        backend = get_backend(queryset.db) if fields else None
+        if backend is None:
+            return super().filter_queryset(request, queryset, view)
+
+        words = search_words(self.get_search_terms(request))
+        if not words:
+            return queryset
+
+        queryset = backend.search(queryset, fields, words)
+        if request.query_params.get(filters.OrderingFilter.ordering_param):
+            return queryset
+        ordering = list(queryset.query.order_by) or list(queryset.model._meta.ordering)
+        return queryset.order_by('-search_rank', *ordering)
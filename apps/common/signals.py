@@ -0,0 +1,113 @@
+from django.db import transaction
+from django.db.models.signals import post_init, pre_save, post_save, pre_delete, post_delete
+from apps.pets.models import Pet, PetImage
+from apps.content.models import NewsArticle, SuccessStory
+from .cache import bump_generation
+from .images import IMAGE_FIELDS, delete_renditions, renditions_field, schedule_renditions, stored_name
+from .counters import COUNTED_MODELS, SNAPSHOT_ATTR, apply_change, counter_keys, stored_keys, take_snapshot
+
+
+# Modelos cuyas respuestas públicas se guardan en caché (ver apps.common.cache)
+CACHE_VERSIONED_MODELS = [Pet, PetImage, NewsArticle, SuccessStory]
+
+
+def snapshot_counters(sender, instance, **kwargs):
+    """
+    Recordar a qué contadores aporta la fila al cargarla
+    """
+    take_snapshot(instance)
+
+
+def ensure_counter_snapshot(sender, instance, **kwargs):
+    """
+    Si la instancia se cargó con campos diferidos, leer su estado guardado
+    antes de que la escritura lo reemplace
+    """
+    if instance.pk and not instance._state.adding and not hasattr(instance, SNAPSHOT_ATTR):
+        setattr(instance, SNAPSHOT_ATTR, stored_keys(instance))
+
+
+def update_counters_on_save(sender, instance, created, **kwargs):
+    """
+    Ajustar los contadores al crear, editar o desactivar (soft delete)
+    """
+    old_keys = {} if created else getattr(instance, SNAPSHOT_ATTR, {})
+    new_keys = counter_keys(instance)
+    apply_change(old_keys, new_keys)
+    setattr(instance, SNAPSHOT_ATTR, new_keys)
+
+
+def update_counters_on_delete(sender, instance, **kwargs):
+    """
+    Descontar la fila al eliminarla definitivamente
+    """
+    apply_change(getattr(instance, SNAPSHOT_ATTR, {}), {})
+    setattr(instance, SNAPSHOT_ATTR, {})
+
+
+for model in COUNTED_MODELS:
+    label = model._meta.label
+    post_init.connect(snapshot_counters, sender=model, dispatch_uid=f'counters_init_{label}')
+    pre_save.connect(ensure_counter_snapshot, sender=model, dispatch_uid=f'counters_pre_save_{label}')
+    post_save.connect(update_counters_on_save, sender=model, dispatch_uid=f'counters_save_{label}')
+    pre_delete.connect(ensure_counter_snapshot, sender=model, dispatch_uid=f'counters_pre_delete_{label}')
+    post_delete.connect(update_counters_on_delete, sender=model, dispatch_uid=f'counters_delete_{label}')
+
+
+
+def bump_cache_generation(sender, **kwargs):
+    """
+    Invalidar las respuestas en caché que dependen del modelo modificado
+    """
+    bump_generation(sender)
+
+
+for model in CACHE_VERSIONED_MODELS:
+    label = model._meta.label
+    post_save.connect(bump_cache_generation, sender=model, dispatch_uid=f'cache_save_{label}')
+    post_delete.connect(bump_cache_generation, sender=model, dispatch_uid=f'cache_delete_{label}')
+
+
+IMAGE_SNAPSHOT_ATTR = '_image_snapshot'
+
+
+def snapshot_images(sender, instance, **kwargs):
+    """
+    Recordar los nombres de las imágenes cargadas (los diferidos quedan fuera)
+    """
+    setattr(instance, IMAGE_SNAPSHOT_ATTR, {
+        field: stored_name(instance, field)
+        for field in IMAGE_FIELDS[sender]
+        if instance._meta.get_field(field).attname in instance.__dict__
+    })
+
+
+def process_changed_images(sender, instance, created, **kwargs):
+    """
+    Generar versiones de las imágenes nuevas y descartar las de las reemplazadas
+    """
+    snapshot = getattr(instance, IMAGE_SNAPSHOT_ATTR, {})
+    for field in IMAGE_FIELDS[sender]:
+        if not created and field not in snapshot:
+            continue
+        name = getattr(instance, field).name or ''
+        if name == ('' if created else snapshot[field]):
+            continue
+
+        target = renditions_field(field)
+        stale = getattr(instance, target)
+        if stale:
+            sender.objects.filter(pk=instance.pk).update(**{target: {}})
+            setattr(instance, target, {})
+            storage = getattr(instance, field).storage
+            transaction.on_commit(lambda storage=storage, stale=stale: delete_renditions(storage, stale))
+        if name:
+            schedule_renditions(instance, field)
+        snapshot[field] = name
+    setattr(instance, IMAGE_SNAPSHOT_ATTR, snapshot)
+
+
+for model in IMAGE_FIELDS:
+    label = model._meta.label
+    post_init.connect(snapshot_images, sender=model, dispatch_uid=f'images_init_{label}')
+    post_save.connect(process_changed_images, sender=model, dispatch_uid=f'images_save_{label}')
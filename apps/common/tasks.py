@@ -0,0 +1,168 @@
+"""
+Cola de tareas en segundo plano respaldada por la base de datos
+
+Los efectos secundarios que no necesitan responder en el request (cambiar el
+estado de la mascota al aprobar una adopción, enviar correos) se declaran con
+@task y se encolan con enqueue():
+
+    @task(max_attempts=3)
+    def send_welcome(user_id):
+        ...
+
+    enqueue(send_welcome, user_id=user.pk, key=f'welcome:{user.pk}')
+
+La fila de la tarea se inserta en la misma transacción que el cambio que la
+origina: si el request falla, la tarea no existe. `python manage.py run_tasks`
+toma las tareas pendientes, las ejecuta y reintenta los fallos con espera
+exponencial (TASK_RETRY_DELAY * 2^(intento - 1)).
+
+`key` es una clave de idempotencia: una tarea con la misma clave solo se
+encola una vez. Con TASKS_EAGER (tests) la tarea se ejecuta en el momento.
+"""
+import logging
+import os
+import socket
+import traceback
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .models import Task
+
+
+logger = logging.getLogger(__name__)
+
+# Nombre -> función de cada tarea registrada con @task
+TASKS = {}
+
+
+def task(name=None, max_attempts=5):
+    """
+    Registrar una función como tarea; sus argumentos deben ser serializables a JSON
+    """
+    def decorator(function):
+        function.task_name = name or f'{function.__module__}.{function.__name__}'
+        function.max_attempts = max_attempts
+        TASKS[function.task_name] = function
+        return function
+    return decorator
+
+
+def enqueue(function, key=None, delay=0, **kwargs):
+    """
+    Encolar `function(**kwargs)`; retorna la fila Task (la existente si `key` ya se usó)
+    """
+    defaults = {
+        'name': function.task_name,
+        'payload': kwargs,
+        'max_attempts': function.max_attempts,
+        'run_at': timezone.now() + timedelta(seconds=delay),
+    }
+    eager = getattr(settings, 'TASKS_EAGER', False)
+    if eager:
+        defaults.update(status='running', attempts=1, locked_at=timezone.now(), locked_by='eager')
+
+    if key is None:
+        queued, created = Task.objects.create(**defaults), True
+    else:
+        queued, created = Task.objects.get_or_create(idempotency_key=key, defaults=defaults)
+
+    if eager and created:
+        run_task(queued)
+    return queued
+
+
+def worker_name():
+    return f'{socket.gethostname()}:{os.getpid()}'
+
+
+def release_stale(timeout=None):
+    """
+    Devolver a la cola las tareas de workers que murieron durante la ejecución
+    """
+    timeout = timeout if timeout is not None else getattr(settings, 'TASK_LOCK_TIMEOUT', 600)
+    return Task.objects.filter(
+        status='running', locked_at__lt=timezone.now() - timedelta(seconds=timeout)
+    ).update(status='pending', locked_at=None, locked_by='')
+
+
+def claim_next(worker):
+    """
+    Tomar la siguiente tarea pendiente; retorna None si no hay ninguna
+
+    La toma es un UPDATE condicionado al estado, así que dos workers nunca
+    ejecutan la misma tarea, en MySQL y en SQLite.
+    """
+    now = timezone.now()
+    candidates = Task.objects.filter(status='pending', run_at__lte=now).values_list('pk', flat=True)[:10]
+    for pk in candidates:
+        claimed = Task.objects.filter(pk=pk, status='pending').update(
+            status='running', attempts=F('attempts') + 1, locked_at=now, locked_by=worker
+        )
+        if claimed:
+            return Task.objects.get(pk=pk)
+    return None
+
+
+def retry_delay(attempts):
+    base = getattr(settings, 'TASK_RETRY_DELAY', 10)
+    return min(base * 2 ** (attempts - 1), getattr(settings, 'TASK_RETRY_MAX_DELAY', 3600))
+
+
+def run_task(queued):
+    """
+    Ejecutar una tarea ya tomada y registrar el resultado
+    """
+    function = TASKS.get(queued.name)
+    try:
+        if function is None:
+            raise LookupError(f'Tarea no registrada: {queued.name}')
+        with transaction.atomic():
+            function(**queued.payload)
+    except Exception:
+        queued.last_error = traceback.format_exc()[-4000:]
+        if queued.attempts < queued.max_attempts and function is not None:
+            queued.status = 'pending'
+            queued.run_at = timezone.now() + timedelta(seconds=retry_delay(queued.attempts))
+            logger.warning('Tarea %s (%s) falló; reintento %s', queued.name, queued.pk, queued.attempts)
+        else:
+            queued.status = 'failed'
+            queued.finished_at = timezone.now()
+            logger.error('Tarea %s (%s) falló definitivamente', queued.name, queued.pk)
+    else:
+        queued.status = 'done'
+        queued.finished_at = timezone.now()
+        queued.last_error = ''
+    queued.locked_at, queued.locked_by = None, ''
+    queued.save(update_fields=[
+        'status', 'run_at', 'finished_at', 'last_error', 'locked_at', 'locked_by', 'updated_at'
+    ])
+    return queued.status
+
+
+def run_pending(worker=None, limit=None):
+    """
+    Ejecutar las tareas pendientes hasta vaciar la cola; retorna cuántas se ejecutaron
+    """
+    worker = worker or worker_name()
+    processed = 0
+    while limit is None or processed < limit:
+        queued = claim_next(worker)
+        if queued is None:
+            break
+        run_task(queued)
+        processed += 1
+    return processed
+
+
+def purge_finished(days):
+    """
+    Borrar las tareas completadas hace más de `days` días
+    """
+    deleted, _ = Task.objects.filter(
+        status='done', finished_at__lt=timezone.now() - timedelta(days=days)
+    ).delete()
+    return deleted
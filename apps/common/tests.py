@@ -1,3 +1,802 @@
-from django.test import TestCase
+import json
+import logging
+import os
+import runpy
+import tempfile
+import threading
+from base64 import urlsafe_b64encode
+from concurrent.futures import ThreadPoolExecutor
+from io import StringIO
+from unittest.mock import PropertyMock, patch
 
-# Create your tests here.
+from django.conf import settings
+from django.contrib.auth.models import AnonymousUser
+from django.core.exceptions import ImproperlyConfigured
+from django.core.handlers.wsgi import WSGIHandler
+from django.core.management import CommandError, call_command
+from datetime import datetime, timedelta
+
+from django.db.models import BooleanField
+from django.core.cache import cache
+from django.db import connection
+from django.db.backends.signals import connection_created
+from django.test import RequestFactory, TestCase, TransactionTestCase, override_settings
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from apps.authentication.models import AdminUser
+from apps.adoptions.models import AdoptionApplication, PersonalReference
+from apps.adoptions.serializers import (
+    AdoptionApplicationListSerializer, fast_adoption_application_list_serializer
+)
+from apps.pets.models import Pet
+from apps.pets.serializers import PetListSerializer, fast_pet_list_serializer
+from apps.contact.models import ContactMessage
+from apps.contact.serializers import ContactMessageSerializer, fast_contact_message_serializer
+from apps.content.models import NewsArticle
+from apps.common.benchmarks import run_benchmarks, seed_benchmark_data
+from apps.common.counters import find_drift, read_counters
+from apps.common import instrumentation
+from apps.common.db import warm_up_connections, warm_up_worker
+from apps.common.instrumentation import RequestMetrics, fingerprint
+from apps.common.metrics import MetricsRegistry, render
+from apps.common.models import Task
+from apps.common.permissions import (
+    ALL_CAPABILITIES, ROLE_CAPABILITIES, HasCapability, get_capabilities
+)
+from apps.common.tasks import claim_next, enqueue, release_stale, run_pending, task
+
+
+# Llamadas registradas por las tareas de prueba de TaskQueueTests
+TASK_CALLS = []
+
+
+@task(name='tests.record', max_attempts=3)
+def record_task(value, failures=0):
+    TASK_CALLS.append(value)
+    if TASK_CALLS.count(value) <= failures:
+        raise RuntimeError('fallo de prueba')
+
+
+class DashboardStatisticsTests(TestCase):
+    """
+    El dashboard debe costar un número fijo de consultas
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = AdminUser.objects.create_user(
+            username='admin', password='secreto123', role='admin'
+        )
+        for index, (species, status) in enumerate([
+            ('dog', 'available'), ('dog', 'adopted'), ('cat', 'available'), ('cat', 'in_process'),
+        ]):
+            Pet.objects.create(
+                name=f'Mascota {index}', species=species, status=status,
+                gender='M', size='small'
+            )
+        Pet.objects.create(name='Inactiva', species='other', gender='F', size='large', is_active=False)
+        ContactMessage.objects.create(
+            full_name='Ana', email='ana@example.com', subject='general', message='Hola'
+        )
+        NewsArticle.objects.create(title='Noticia', slug='noticia', summary='r', content='c')
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def test_statistics_shape_and_counts(self):
+        with self.assertNumQueries(4):
+            response = self.client.get('/api/dashboard/statistics/')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['pets'], {
+            'total': 4,
+            'available': 2,
+            'adopted': 1,
+            'in_process': 1,
+            'by_species': [{'species': 'dog', 'count': 2}, {'species': 'cat', 'count': 2}],
+        })
+        self.assertEqual(response.data['adoptions']['total'], 0)
+        self.assertEqual(response.data['messages'], {'total': 1, 'pending': 1, 'resolved': 0})
+        self.assertEqual(response.data['content'], {'news': 1, 'success_stories': 0})
+        self.assertEqual(len(response.data['recent_activity']['pets']), 4)
+
+    def test_quick_stats_single_query(self):
+        with self.assertNumQueries(1):
+            response = self.client.get('/api/dashboard/quick-stats/')
+
+        self.assertEqual(response.data, {
+            'pending_applications': 0,
+            'available_pets': 2,
+            'pending_messages': 1,
+            'total_adoptions': 1,
+        })
+
+
+class StatusCounterTests(TestCase):
+    """
+    Los contadores materializados deben coincidir con un recálculo completo
+    """
+
+    def create_pet(self, **kwargs):
+        return Pet.objects.create(**{'name': 'Firulais', 'gender': 'M', 'size': 'small', **kwargs})
+
+    def test_counters_follow_lifecycle(self):
+        dog = self.create_pet()
+        cat = self.create_pet(species='cat')
+        self.create_pet(species='cat', is_active=False)
+        message = ContactMessage.objects.create(
+            full_name='Ana', email='ana@example.com', subject='general', message='Hola'
+        )
+
+        dog.status = 'adopted'
+        dog.save()
+        cat.is_active = False
+        cat.save()
+        message.status = 'resolved'
+        message.save()
+        Pet.objects.only('id', 'name').get(pk=dog.pk).save()
+        Pet.objects.get(pk=dog.pk).delete()
+
+        self.assertEqual(find_drift(), [])
+        self.assertEqual(read_counters()['messages'], {'new': 0, 'resolved': 1})
+
+    def test_rebuild_repairs_drift(self):
+        self.create_pet()
+        # update() no dispara señales y deja los contadores desfasados
+        Pet.objects.update(status='adopted')
+        self.assertEqual(len(find_drift()), 2)
+
+        call_command('rebuild_counters', stdout=StringIO())
+
+        self.assertEqual(find_drift(), [])
+        self.assertEqual(read_counters()['pets'], {'adopted': 1})
+
+
+class KeysetPaginationTests(TestCase):
+    """
+    El modo cursor recorre la lista completa sin COUNT ni OFFSET
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        pets = Pet.objects.bulk_create([
+            Pet(name=f'Mascota {index}', gender='M', size='small') for index in range(45)
+        ])
+        # Fechas repetidas para probar el desempate por id
+        for index, pet in enumerate(pets):
+            Pet.objects.filter(pk=pet.pk).update(created_at=datetime(2025, 1, 1 + index // 4))
+
+    def test_page_number_is_default(self):
+        response = APIClient().get('/api/pets/')
+        self.assertEqual(response.data['count'], 45)
+
+    def test_cursor_walks_all_rows_in_order(self):
+        client = APIClient()
+        expected = list(Pet.objects.order_by('-created_at', '-id').values_list('id', flat=True))
+
+        seen, pages = [], []
+        url = '/api/pets/?pagination=cursor'
+        while url:
+            with self.assertNumQueries(1):
+                response = client.get(url)
+            self.assertNotIn('count', response.data)
+            pages.append(response.data)
+            seen += [pet['id'] for pet in response.data['results']]
+            url = response.data['next']
+
+        self.assertEqual(seen, expected)
+        self.assertEqual(len(pages), 3)
+
+        previous = client.get(pages[-1]['previous'])
+        self.assertEqual(
+            [pet['id'] for pet in previous.data['results']],
+            [pet['id'] for pet in pages[1]['results']]
+        )
+
+    def test_invalid_cursor(self):
+        response = APIClient().get('/api/pets/?cursor=no-es-valido')
+        self.assertEqual(response.status_code, 404)
+
+    def test_cursor_values_of_the_wrong_type(self):
+        for values in [['x', 'x'], [None, None], [{'a': 1}, {'a': 1}], ['2026-01-01T00:00:00', 'x']]:
+            with self.subTest(values=values):
+                cursor = urlsafe_b64encode(json.dumps({'v': values}).encode('ascii')).decode('ascii')
+                response = APIClient().get(f'/api/pets/?cursor={cursor}')
+                self.assertEqual(response.status_code, 404)
+
+
+class FastListSerializerTests(TestCase):
+    """
+    La versión rápida debe producir exactamente los mismos bytes que DRF
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        admin = AdminUser.objects.create_user(
+            username='admin', password='secreto123', first_name='Ana', last_name='López'
+        )
+        cls.pets = [
+            Pet.objects.create(name='Luna', species='cat', gender='F', size='small', age_months=5),
+            Pet.objects.create(
+                name='Rocky', species='dog', gender='M', size='large', age_years=3, age_months=2,
+                main_image='pets/main/rocky.jpg', status='in_process', energy_level='high'
+            ),
+            Pet.objects.create(name='Sol', species='other', gender='M', size='medium', age_years=1),
+        ]
+        booleans = {
+            field.name: True for field in AdoptionApplication._meta.fields
+            if isinstance(field, BooleanField) and not field.has_default()
+        }
+        for pet in cls.pets[:2]:
+            AdoptionApplication.objects.create(
+                pet=pet, full_name='Carlos Pérez', age=30, email='carlos@example.com',
+                cell_phone='5555-5555', adults_in_home=2, **booleans
+            )
+        ContactMessage.objects.create(
+            full_name='Ana', email='ana@example.com', subject='general', message='Hola'
+        )
+        ContactMessage.objects.create(
+            full_name='Luis', email='luis@example.com', subject='adoption', message='Info',
+            status='resolved', admin_response='Gracias', responded_by=admin
+        )
+
+    def assertSameJson(self, serializer_class, fast, queryset, context=None):
+        expected = serializer_class(queryset, many=True, context=context or {}).data
+        actual = fast.to_representation(fast.values(queryset), context)
+        renderer = JSONRenderer()
+        self.assertEqual(renderer.render(actual), renderer.render(expected))
+
+    def test_pet_list_matches_drf(self):
+        request = RequestFactory().get('/api/pets/', HTTP_HOST='localhost')
+        queryset = Pet.objects.order_by('id')
+        self.assertSameJson(PetListSerializer, fast_pet_list_serializer, queryset)
+        self.assertSameJson(PetListSerializer, fast_pet_list_serializer, queryset, {'request': request})
+
+    def test_adoption_and_contact_lists_match_drf(self):
+        self.assertSameJson(
+            AdoptionApplicationListSerializer, fast_adoption_application_list_serializer,
+            AdoptionApplication.objects.order_by('id')
+        )
+        self.assertSameJson(
+            ContactMessageSerializer, fast_contact_message_serializer,
+            ContactMessage.objects.order_by('id')
+        )
+
+    def test_list_endpoints_use_fast_path(self):
+        client = APIClient()
+        with self.assertNumQueries(1):
+            response = client.get('/api/pets/?pagination=cursor')
+        self.assertEqual([pet['name'] for pet in response.data['results']], ['Sol', 'Rocky', 'Luna'])
+        self.assertEqual(response.data['results'][1]['age_display'], '3 años, 2 meses')
+
+        client.force_authenticate(AdminUser.objects.get(username='admin'))
+        messages = client.get('/api/contact/messages/').data['results']
+        self.assertEqual(messages[0]['responded_by_name'], 'Ana López')
+        self.assertNotIn('responded_by_name', messages[1])
+
+
+class BenchmarkSuiteTests(TestCase):
+    """
+    El generador de datos y el runner de benchmarks funcionan de punta a punta
+    """
+
+    def test_seed_and_run(self):
+        created = seed_benchmark_data(
+            pets=12, images_per_pet=2, applications=4, messages=3, news=2, stories=2, faqs=2
+        )
+        self.assertEqual(Pet.objects.count(), created['pets'])
+        self.assertEqual(AdoptionApplication.objects.get(pk=1).references.count(), 3)
+        self.assertEqual(find_drift(), [])
+
+        results = run_benchmarks(
+            iterations=2, warmup=0, only=['pets-list', 'dashboard-statistics', 'adoptions-create']
+        )
+        self.assertEqual(set(results), {'pets-list', 'dashboard-statistics', 'adoptions-create'})
+        self.assertEqual(results['pets-list']['status'], 200)
+        self.assertEqual(results['dashboard-statistics']['status'], 200)
+        self.assertEqual(results['adoptions-create']['status'], 201)
+        self.assertGreater(results['pets-list']['queries'], 0)
+        self.assertLessEqual(results['pets-list']['p50_ms'], results['pets-list']['p95_ms'])
+
+    def test_seed_command_requires_debug_or_force(self):
+        with override_settings(DEBUG=False), self.assertRaises(CommandError):
+            call_command('seed_benchmark_data', pets=1, stdout=StringIO())
+        self.assertFalse(Pet.objects.exists())
+
+        call_command('seed_benchmark_data', pets=2, applications=1, force=True, stdout=StringIO())
+        self.assertEqual(Pet.objects.count(), 2)
+        self.assertEqual(PersonalReference.objects.count(), 3)
+
+
+class RequestInstrumentationTests(TestCase):
+    """
+    Cada request medido reporta consultas y tiempos en Server-Timing y en el log
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        Pet.objects.create(name='Luna', gender='F', size='small')
+
+    def test_server_timing_and_log_line(self):
+        with self.assertLogs('apps.requests', 'INFO') as logs:
+            response = APIClient().get('/api/pets/')
+
+        timing = response['Server-Timing']
+        self.assertIn('db;dur=', timing)
+        self.assertIn('serializer;dur=', timing)
+        self.assertIn('total;dur=', timing)
+
+        line = json.loads(logs.records[0].getMessage())
+        self.assertEqual(line['view'], 'PetViewSet.list')
+        self.assertEqual(line['status'], 200)
+        self.assertEqual(line['queries'], 3)
+        self.assertIn('serializer_ms', line)
+
+    def test_serializer_timing_without_fast_list(self):
+        pet = Pet.objects.get()
+        response = APIClient().get(f'/api/pets/{pet.pk}/')
+        self.assertIn('serializer;dur=', response['Server-Timing'])
+
+    def test_serializers_are_not_patched(self):
+        # La medición es del ViewSet; DRF queda intacto fuera de los requests
+        from rest_framework.serializers import BaseSerializer
+
+        self.assertEqual(BaseSerializer.data.fget.__module__, 'rest_framework.serializers')
+        self.assertEqual(PetListSerializer(Pet.objects.get()).data['name'], 'Luna')
+
+    def test_fingerprint_groups_repeated_queries(self):
+        self.assertEqual(
+            fingerprint('SELECT * FROM pets_pet WHERE id = 1 AND name = \'Luna\''),
+            fingerprint('SELECT *  FROM pets_pet WHERE id = 25 AND name = \'Sol\''),
+        )
+        self.assertEqual(
+            fingerprint('SELECT * FROM t WHERE id IN (%s, %s, %s)'),
+            fingerprint('SELECT * FROM t WHERE id IN (%s)'),
+        )
+
+    @override_settings(REQUEST_INSTRUMENTATION_SAMPLE_RATE=0)
+    def test_unsampled_requests_are_not_measured(self):
+        response = APIClient().get('/api/pets/')
+        self.assertNotIn('Server-Timing', response)
+
+
+class MetricsEndpointTests(TestCase):
+    """
+    /api/metrics/ expone histogramas, contadores de caché y gauges
+    """
+
+    def setUp(self):
+        self.superadmin = AdminUser.objects.create_user(
+            username='root', password='secreto123', role='super_admin'
+        )
+        ContactMessage.objects.create(
+            full_name='Ana', email='ana@example.com', subject='general', message='Hola'
+        )
+
+    def test_only_super_admins(self):
+        client = APIClient()
+        self.assertEqual(client.get('/api/metrics/').status_code, 401)
+        client.force_authenticate(AdminUser.objects.create_user(username='vol', password='x', role='admin'))
+        self.assertEqual(client.get('/api/metrics/').status_code, 403)
+
+    def test_exposition_format(self):
+        APIClient().get('/api/pets/')
+        client = APIClient()
+        client.force_authenticate(self.superadmin)
+        response = client.get('/api/metrics/')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response['Content-Type'].startswith('text/plain; version=0.0.4'))
+        body = response.content.decode()
+        self.assertIn('# TYPE http_request_duration_seconds histogram', body)
+        self.assertIn('http_request_queries_bucket{view="PetViewSet.list",le="+Inf"}', body)
+        self.assertIn('contact_messages_new 1', body)
+        self.assertIn('adoption_applications_pending 0', body)
+
+    def test_workers_are_merged_through_files(self):
+        with tempfile.TemporaryDirectory() as directory:
+            first, second = MetricsRegistry(directory), MetricsRegistry(directory)
+            second.pid += 1
+            for registry, duration in [(first, 0.02), (second, 0.3)]:
+                registry.inc('response_cache_requests_total', {'view': 'PetViewSet.list', 'result': 'hit'})
+                registry.observe('http_request_duration_seconds', duration, (0.1, 1.0), {'view': 'v'})
+            second.flush()
+
+            body = render(first.collect(), {})
+        self.assertIn('response_cache_requests_total{result="hit",view="PetViewSet.list"} 2', body)
+        self.assertIn('http_request_duration_seconds_bucket{view="v",le="0.1"} 1', body)
+        self.assertIn('http_request_duration_seconds_bucket{view="v",le="1.0"} 2', body)
+        self.assertIn('http_request_duration_seconds_count{view="v"} 2', body)
+
+
+@override_settings(TASK_RETRY_DELAY=10)
+class TaskQueueTests(TestCase):
+    """
+    Cola de tareas: idempotencia, reintentos con espera exponencial y worker
+    """
+
+    def setUp(self):
+        TASK_CALLS.clear()
+
+    def make_due(self):
+        Task.objects.update(run_at=timezone.now())
+
+    def test_idempotency_key_runs_once(self):
+        first = enqueue(record_task, key='registro:1', value='a')
+        second = enqueue(record_task, key='registro:1', value='a')
+        self.assertEqual(first.pk, second.pk)
+        self.assertEqual(TASK_CALLS, ['a'])
+        self.assertEqual(Task.objects.get().status, 'done')
+
+    def test_failures_are_retried_with_backoff(self):
+        with self.assertLogs('apps.common.tasks', 'WARNING'):
+            queued = enqueue(record_task, value='b', failures=2)
+            queued.refresh_from_db()
+            self.assertEqual((queued.status, queued.attempts), ('pending', 1))
+            self.assertIn('fallo de prueba', queued.last_error)
+            delay = (queued.run_at - timezone.now()).total_seconds()
+            self.assertTrue(5 < delay <= 10)
+
+            # Aún no toca reintentar
+            self.assertEqual(run_pending(), 0)
+
+            self.make_due()
+            self.assertEqual(run_pending(), 1)
+            queued.refresh_from_db()
+            self.assertEqual(queued.attempts, 2)
+            self.assertTrue(15 < (queued.run_at - timezone.now()).total_seconds() <= 20)
+
+            self.make_due()
+            run_pending()
+            queued.refresh_from_db()
+            self.assertEqual((queued.status, queued.attempts, queued.last_error), ('done', 3, ''))
+
+    def test_gives_up_after_max_attempts(self):
+        with self.assertLogs('apps.common.tasks', 'WARNING'):
+            queued = enqueue(record_task, value='c', failures=5)
+            for _ in range(3):
+                self.make_due()
+                run_pending()
+            queued.refresh_from_db()
+            self.assertEqual((queued.status, queued.attempts), ('failed', 3))
+            self.assertEqual(TASK_CALLS, ['c'] * 3)
+
+    @override_settings(TASKS_EAGER=False)
+    def test_worker_command_runs_queued_tasks(self):
+        queued = enqueue(record_task, value='d')
+        self.assertEqual(TASK_CALLS, [])
+
+        out = StringIO()
+        call_command('run_tasks', '--once', stdout=out)
+        queued.refresh_from_db()
+        self.assertEqual(queued.status, 'done')
+        self.assertEqual(TASK_CALLS, ['d'])
+        self.assertIn('1 tarea(s) ejecutada(s)', out.getvalue())
+
+    @override_settings(TASKS_EAGER=False)
+    def test_claims_are_exclusive_and_stale_locks_are_released(self):
+        enqueue(record_task, value='e')
+        self.assertIsNotNone(claim_next('worker-1'))
+        self.assertIsNone(claim_next('worker-2'))
+
+        Task.objects.update(locked_at=timezone.now() - timedelta(hours=1))
+        self.assertEqual(release_stale(timeout=60), 1)
+        self.assertEqual(claim_next('worker-2').locked_by, 'worker-2')
+
+
+class PermissionEngineTests(TestCase):
+    """
+    Una sola matriz rol -> capacidades para vistas y AdminUser.has_permission
+    """
+
+    def client_for(self, role):
+        user, _ = AdminUser.objects.get_or_create(username=role, defaults={'role': role})
+        client = APIClient()
+        client.force_authenticate(user)
+        return client
+
+    def test_matrix_is_compiled_to_frozensets(self):
+        self.assertEqual(ROLE_CAPABILITIES['super_admin'], ALL_CAPABILITIES)
+        self.assertEqual(ROLE_CAPABILITIES['veterinarian'], frozenset({'pets'}))
+        for capabilities in ROLE_CAPABILITIES.values():
+            self.assertIsInstance(capabilities, frozenset)
+
+    def test_model_agrees_with_engine(self):
+        for role, _ in AdminUser.ROLE_CHOICES:
+            user = AdminUser(username=role, role=role)
+            for capability in ALL_CAPABILITIES:
+                self.assertEqual(user.has_permission(capability), capability in ROLE_CAPABILITIES[role])
+
+    def test_views_check_the_action_capability(self):
+        self.assertEqual(self.client_for('veterinarian').get('/api/images/').status_code, 200)
+        self.assertEqual(self.client_for('veterinarian').get('/api/adoptions/applications/').status_code, 403)
+        self.assertEqual(self.client_for('volunteer').get('/api/contact/messages/').status_code, 200)
+        self.assertEqual(self.client_for('volunteer').post('/api/content/faqs/', {}).status_code, 403)
+        self.assertEqual(self.client_for('admin').post('/api/content/faqs/', {}).status_code, 400)
+        self.assertEqual(APIClient().get('/api/content/faqs/').status_code, 200)
+        self.assertEqual(APIClient().post('/api/pets/', {}).status_code, 401)
+
+    def test_capabilities_are_resolved_once_per_request(self):
+        request = RequestFactory().get('/')
+        request.user = AdminUser.objects.create_user(username='ana', password='x', role='admin')
+        with patch('apps.common.permissions.user_capabilities', return_value=frozenset({'pets'})) as resolve:
+            get_capabilities(request)
+            get_capabilities(request)
+        resolve.assert_called_once()
+
+    def test_view_without_declaration_is_a_configuration_error(self):
+        request = RequestFactory().get('/')
+        with self.assertRaises(ImproperlyConfigured):
+            HasCapability().has_permission(request, object())
+
+
+class GunicornConfigTests(TestCase):
+    """
+    gunicorn.conf.py se carga, respeta las variables de entorno y sus hooks funcionan
+    """
+    path = str(settings.BASE_DIR / 'gunicorn.conf.py')
+
+    def load(self, **env):
+        clean = {key: value for key, value in os.environ.items()
+                 if not key.startswith('GUNICORN_') and key not in ('WEB_CONCURRENCY', 'PORT')}
+        with patch.dict(os.environ, {**clean, **env}, clear=True):
+            return runpy.run_path(self.path)
+
+    def test_defaults(self):
+        config = self.load()
+        self.assertEqual(config['workers'], config['cpu_count']() * 2 + 1)
+        self.assertEqual(config['worker_class'], 'gthread')
+        self.assertTrue(config['preload_app'])
+        self.assertEqual((config['max_requests'], config['max_requests_jitter']), (1000, 100))
+        self.assertEqual(config['bind'], '0.0.0.0:8000')
+
+    def test_environment_overrides(self):
+        config = self.load(
+            PORT='10000', WEB_CONCURRENCY='3', GUNICORN_THREADS='8', GUNICORN_PRELOAD='False',
+            GUNICORN_WORKER_CLASS='uvicorn_worker.UvicornWorker', GUNICORN_MAX_REQUESTS='0',
+        )
+        self.assertEqual(config['bind'], '0.0.0.0:10000')
+        self.assertEqual((config['workers'], config['threads']), (3, 8))
+        self.assertFalse(config['preload_app'])
+        self.assertEqual(config['worker_class'], 'uvicorn_worker.UvicornWorker')
+        self.assertEqual(config['max_requests'], 0)
+        self.assertEqual(self.load(GUNICORN_WORKERS='2', WEB_CONCURRENCY='5')['workers'], 2)
+
+    def test_gunicorn_accepts_settings(self):
+        try:
+            from gunicorn.config import Config
+        except ImportError:
+            self.skipTest('gunicorn no está instalado')
+        config = Config()
+        for name, value in self.load().items():
+            if name in config.settings:
+                config.set(name, value)
+        self.assertTrue(config.preload_app)
+        self.assertEqual(config.max_requests_jitter, 100)
+
+    def test_hooks(self):
+        config = self.load()
+        server = type('Server', (), {'log': logging.getLogger('gunicorn.error')})()
+
+        with tempfile.TemporaryDirectory() as directory:
+            open(os.path.join(directory, 'metrics-123.json'), 'w').close()
+            with override_settings(METRICS_DIR=directory):
+                config['on_starting'](server)
+            self.assertEqual(os.listdir(directory), [])
+
+            # Sin preload_app Django todavía no está configurado: no se elige un módulo de settings
+            open(os.path.join(directory, 'metrics-123.json'), 'w').close()
+            configured = patch.object(type(settings), 'configured', new_callable=PropertyMock, return_value=False)
+            with configured, patch.dict(os.environ, {'METRICS_DIR': directory}):
+                environment = dict(os.environ)
+                config['on_starting'](server)
+                self.assertEqual(dict(os.environ), environment)
+            self.assertEqual(os.listdir(directory), [])
+
+        with patch('django.db.connections.close_all') as close_all:
+            config['post_fork'](server, None)
+        close_all.assert_called_once()
+
+        with patch('apps.authentication.activity.flush_activity') as flush_activity, \
+                patch('apps.common.metrics.flush_metrics') as flush_metrics:
+            config['worker_exit'](server, None)
+        flush_activity.assert_called_once()
+        flush_metrics.assert_called_once()
+
+
+class ConnectionReuseTests(TransactionTestCase):
+    """
+    Conexiones persistentes: se reutilizan entre requests y se cuentan por request
+
+    Los tests de reutilización necesitan una base que se pueda cerrar; se
+    ejecutan con core.settings.testing_connections.
+    """
+    def setUp(self):
+        self.handler = WSGIHandler()
+
+    def wsgi_get(self, path):
+        # Handler WSGI real: request_started/request_finished cierran las conexiones
+        # vencidas como en producción (el cliente de pruebas desconecta esas señales)
+        response = self.handler(RequestFactory().get(path).environ, lambda status, headers: None)
+        response.close()
+        return response
+
+    def opened_per_request(self, requests):
+        connection.close()
+        with self.assertLogs('apps.requests', 'INFO') as logs:
+            for _ in range(requests):
+                self.assertEqual(self.wsgi_get('/api/pets/').status_code, 200)
+        return [json.loads(record.getMessage())['connections_opened'] for record in logs.records]
+
+    def require_closable_database(self):
+        if connection.vendor == 'sqlite' and connection.is_in_memory_db():
+            self.skipTest('Ejecutar con DJANGO_SETTINGS_MODULE=core.settings.testing_connections')
+
+    def test_connection_opens_are_counted(self):
+        metrics = RequestMetrics()
+        token = instrumentation._current.set(metrics)
+        try:
+            connection_created.send(sender=type(connection), connection=connection)
+        finally:
+            instrumentation._current.reset(token)
+        self.assertEqual(metrics.connections, 1)
+        metrics.finish()
+        self.assertIn('1 conexiones nuevas', metrics.server_timing())
+
+    def test_connections_are_reused(self):
+        self.require_closable_database()
+        self.assertEqual(self.opened_per_request(5), [1, 0, 0, 0, 0])
+
+    def test_without_max_age_every_request_reconnects(self):
+        self.require_closable_database()
+        with patch.dict(connection.settings_dict, {'CONN_MAX_AGE': 0}):
+            self.assertEqual(self.opened_per_request(3), [1, 1, 1])
+
+    def test_warm_up(self):
+        self.require_closable_database()
+        connection.close()
+        with override_settings(DB_CONN_MAX_AGE=60):
+            self.assertEqual(len(warm_up_worker(object())), 1)
+        self.assertIsNotNone(connection.connection)
+
+        worker = type('Worker', (), {})()
+        worker.cfg = type('Config', (), {'threads': 3})()
+        opened = set()
+        with ThreadPoolExecutor(3) as worker.tpool, override_settings(DB_CONN_MAX_AGE=60):
+            def record(original=warm_up_connections):
+                opened.add(threading.get_ident())
+                result = original()
+                connection.close()
+                return result
+            with patch('apps.common.db.warm_up_connections', record):
+                self.assertEqual(len(warm_up_worker(worker)), 3)
+        # Una conexión por hilo del pool
+        self.assertEqual(len(opened), 3)
+
+        with override_settings(DB_CONN_MAX_AGE=0):
+            self.assertEqual(warm_up_worker(object()), [])
+
+    def test_warm_up_only_opens_configured_aliases(self):
+        # La réplica no se abre al arrancar; un alias inexistente se ignora
+        self.assertEqual(set(warm_up_connections()), {'default'})
+        with override_settings(DB_WARMUP_ALIASES=['default', 'otra']):
+            self.assertEqual(set(warm_up_connections()), {'default'})
+
+    def test_asgi_disables_persistent_connections(self):
+        base = str(settings.BASE_DIR / 'core' / 'settings' / 'base.py')
+        with patch.dict(os.environ):
+            os.environ.pop('DB_CONN_MAX_AGE', None)
+            runpy.run_path(str(settings.BASE_DIR / 'core' / 'asgi.py'))
+            self.assertEqual(runpy.run_path(base)['DB_CONNECTION_POLICY']['CONN_MAX_AGE'], 0)
+
+            # Un valor explícito del operador se respeta
+            os.environ['DB_CONN_MAX_AGE'] = '60'
+            self.assertEqual(runpy.run_path(base)['DB_CONNECTION_POLICY']['CONN_MAX_AGE'], 60)
+
+            os.environ.pop('DB_CONN_MAX_AGE')
+            os.environ['DJANGO_ASGI'] = 'False'
+            self.assertEqual(runpy.run_path(base)['DB_CONNECTION_POLICY']['CONN_MAX_AGE'], 300)
+
+
+@override_settings(
+    READ_REPLICA_APPS=['pets', 'content'],
+    CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}},
+)
+class ReadReplicaRouterTests(TestCase):
+    """
+    Lecturas públicas desde la réplica; escrituras y administradores al primario
+    """
+    databases = {'default', 'replica'}
+
+    def setUp(self):
+        # La réplica todavía no recibió el último cambio del primario
+        self.pet = Pet.objects.create(name='Luna', gender='F', size='small')
+        Pet.objects.using('replica').bulk_create([
+            Pet(pk=self.pet.pk, name='Luna (réplica)', gender='F', size='small')
+        ])
+        self.admin = AdminUser.objects.create_user(username='admin', password='x', role='super_admin')
+        self.token = Token.objects.create(user=self.admin)
+        # Ya pasó READ_REPLICA_PIN_SECONDS desde que se creó la mascota
+        cache.clear()
+
+    def test_public_reads_use_the_replica(self):
+        for url in ['/api/pets/', f'/api/pets/{self.pet.pk}/']:
+            with self.subTest(url=url):
+                response = APIClient().get(url)
+                self.assertEqual(response.status_code, 200)
+                self.assertIn('Luna (réplica)', response.content.decode())
+
+    async def test_async_public_reads_use_the_replica(self):
+        response = await self.async_client.get(f'/api/async/pets/{self.pet.pk}/')
+        self.assertEqual(response.json()['name'], 'Luna (réplica)')
+
+    def test_admin_reads_use_the_primary(self):
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f'Token {self.token.key}')
+        response = client.get(f'/api/pets/{self.pet.pk}/')
+        self.assertEqual(response.data['name'], 'Luna')
+
+    def patch_pet(self, name):
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f'Token {self.token.key}')
+        response = client.patch(f'/api/pets/{self.pet.pk}/', {'name': name}, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(Pet.objects.using('replica').get(pk=self.pet.pk).name, 'Luna (réplica)')
+
+    def test_writes_pin_the_writer_to_the_primary(self):
+        from apps.common.routers import is_pinned
+
+        self.patch_pet('Luna II')
+        # Se fija el usuario que escribió, no la IP (compartida detrás de un NAT)
+        request = RequestFactory().get('/', REMOTE_ADDR='10.0.0.9')
+        request.user = self.admin
+        self.assertTrue(is_pinned(request))
+        request.user = AnonymousUser()
+        self.assertFalse(is_pinned(request))
+
+    def test_anonymous_writes_pin_the_ip(self):
+        response = APIClient().post('/api/contact/messages/', {
+            'full_name': 'Ana López', 'email': 'ana@example.com',
+            'subject': ContactMessage.SUBJECT_CHOICES[0][0], 'message': 'Hola',
+        }, format='json')
+        self.assertEqual(response.status_code, 201)
+        # Misma IP: lee del primario; otra IP sigue en la réplica
+        response = APIClient().get(f'/api/pets/{self.pet.pk}/')
+        self.assertEqual(response.data['name'], 'Luna')
+        response = APIClient(REMOTE_ADDR='10.0.0.2').get('/api/pets/')
+        self.assertEqual(response.data['results'][0]['name'], 'Luna (réplica)')
+
+        cache.clear()  # Venció READ_REPLICA_PIN_SECONDS
+        response = APIClient().get(f'/api/pets/{self.pet.pk}/')
+        self.assertEqual(response.data['name'], 'Luna (réplica)')
+
+    def test_migrate_skips_the_replica(self):
+        from apps.common.routers import ReadReplicaRouter
+
+        router = ReadReplicaRouter()
+        self.assertIsNone(router.allow_migrate('default', 'pets', 'pet'))
+        with override_settings(READ_REPLICA_MIGRATE=False):
+            self.assertFalse(router.allow_migrate('replica', 'pets', 'pet'))
+
+    def test_responses_cached_after_a_write_come_from_the_primary(self):
+        self.patch_pet('Luna II')
+        # Otro cliente no está fijado, pero la respuesta que queda en caché no
+        # puede ser la de la réplica atrasada
+        other = APIClient(REMOTE_ADDR='10.0.0.2')
+        self.assertEqual(other.get(f'/api/pets/{self.pet.pk}/').data['name'], 'Luna II')
+        self.assertEqual(other.get('/api/pets/').data['results'][0]['name'], 'Luna II')
+
+    def test_objects_read_from_the_replica_are_saved_to_the_primary(self):
+        from apps.common.routers import ReadReplicaRouter
+
+        replica_pet = Pet.objects.using('replica').get(pk=self.pet.pk)
+        self.assertEqual(ReadReplicaRouter().db_for_write(Pet, instance=replica_pet), 'default')
+
+    def test_without_replica_everything_uses_the_primary(self):
+        with patch('apps.common.routers.replica_configured', return_value=False):
+            response = APIClient().get(f'/api/pets/{self.pet.pk}/')
+        self.assertEqual(response.data['name'], 'Luna')
@@ -1,9 +1,10 @@
 from django.urls import path
-from .views import dashboard_statistics, quick_stats
+from .views import dashboard_statistics, metrics, quick_stats
 
 app_name = 'common'
 
 urlpatterns = [
     path('dashboard/statistics/', dashboard_statistics, name='dashboard-statistics'),
     path('dashboard/quick-stats/', quick_stats, name='quick-stats'),
+    path('metrics/', metrics, name='metrics'),
 ]
\ No newline at end of file
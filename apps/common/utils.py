@@ -0,0 +1,13 @@
+"""
+Utilidades de requests compartidas por las apps
+"""
+
+
+def get_client_ip(request):
+    """Obtener IP del cliente"""
+    x_forwarded_for = request.META.get('HTTP_X_FORWARDED_FOR')
+    if x_forwarded_for:
+        ip = x_forwarded_for.split(',')[0]
+    else:
+        ip = request.META.get('REMOTE_ADDR')
+    return ip
@@ -1,5 +1,6 @@
 from django.contrib import admin
 from django.utils.html import format_html
+from apps.common.bulk import bulk_update, status_changes
 from .models import ContactMessage
 
 
@@ -104,20 +105,28 @@ class ContactMessageAdmin(admin.ModelAdmin):
     status_display.short_description = 'Estado'
     
     # Acciones rápidas para cambiar estado
+    def set_status(self, request, queryset, value):
+        """Un solo UPDATE con responded_by/response_date, como la API"""
+        count, _ = bulk_update(
+            queryset,
+            list(queryset.values_list('pk', flat=True)),
+            status_changes(ContactMessage.BULK_STATUS_FIELDS, value, request.user),
+            state={'status': value}
+        )
+        label = dict(ContactMessage.STATUS_CHOICES)[value]
+        self.message_user(request, f'{count} mensaje(s) marcado(s) como "{label}".')
+    
     @admin.action(description='Marcar como "En proceso"')
     def mark_as_in_progress(self, request, queryset):
-        updated = queryset.update(status='in_progress')
-        self.message_user(request, f'{updated} mensaje(s) marcado(s) como "En proceso".')
+        self.set_status(request, queryset, 'in_progress')
     
     @admin.action(description='Marcar como "Resuelto"')
     def mark_as_resolved(self, request, queryset):
-        updated = queryset.update(status='resolved')
-        self.message_user(request, f'{updated} mensaje(s) marcado(s) como "Resuelto".')
+        self.set_status(request, queryset, 'resolved')
     
     @admin.action(description='Marcar como "Cerrado"')
     def mark_as_closed(self, request, queryset):
-        updated = queryset.update(status='closed')
-        self.message_user(request, f'{updated} mensaje(s) marcado(s) como "Cerrado".')
+        self.set_status(request, queryset, 'closed')
     
     def has_add_permission(self, request):
         """Los mensajes solo se crean desde el frontend"""
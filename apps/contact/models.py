@@ -23,6 +23,10 @@ class ContactMessage(BaseModel):
         ('closed', 'Cerrado'),
     ]
     
+    # Estado, quién lo cambió y cuándo (apps.common.bulk.status_changes):
+    # bulk_status de la API y las acciones del admin
+    BULK_STATUS_FIELDS = ('status', 'responded_by', 'response_date')
+    
     # Datos del contacto
     full_name = models.CharField(
         max_length=100,
@@ -1,4 +1,6 @@
 from rest_framework import serializers
+from apps.authentication.models import AdminUser
+from apps.common.serializers import FastListSerializer, from_property
 from .models import ContactMessage
 
 
@@ -21,6 +23,14 @@ class ContactMessageSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'created_at', 'updated_at', 'responded_by', 'response_date']
 
 
+# Mismo JSON que ContactMessageSerializer, generado desde .values() para el listado
+fast_contact_message_serializer = FastListSerializer(ContactMessageSerializer, computed={
+    'responded_by_name': from_property(
+        AdminUser.full_name, 'first_name', 'last_name', 'username', relation='responded_by'
+    ),
+})
+
+
 class ContactMessageCreateSerializer(serializers.ModelSerializer):
     """
     Serializer para crear mensaje de contacto (público)
@@ -45,6 +55,6 @@ class ContactMessageResponseSerializer(serializers.ModelSerializer):
         instance.status = validated_data.get('status', instance.status)
         instance.responded_by = self.context['request'].user
         instance.response_date = timezone.now()
-        instance.save()
+        instance.save_fields('admin_response', 'status', 'responded_by', 'response_date')
         
         return instance
\ No newline at end of file
@@ -1,3 +1,106 @@
-from django.test import TestCase
+from unittest.mock import patch
 
-# Create your tests here.
+from django.contrib.admin.sites import site
+from django.db import connection
+from django.test import RequestFactory, TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from apps.authentication.models import AdminUser
+from apps.common.counters import find_drift, rebuild_counters
+from .models import ContactMessage
+
+
+class ContactBulkStatusTests(TestCase):
+    """
+    Cambio de estado en bloque con los mismos campos de auditoría que `respond`
+    """
+
+    def setUp(self):
+        self.admin = AdminUser.objects.create_user(username='voluntaria', password='x', role='admin')
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+        self.messages = [
+            ContactMessage.objects.create(
+                full_name=f'Persona {index}', email=f'persona{index}@example.com',
+                subject='volunteer' if index < 3 else 'other', message='Hola'
+            )
+            for index in range(4)
+        ]
+        self.closed = ContactMessage.objects.create(
+            full_name='Cerrado', email='cerrado@example.com', subject='other', message='Hola', status='closed'
+        )
+        rebuild_counters()
+
+    def test_bulk_status_by_ids(self):
+        ids = [self.messages[0].pk, self.messages[1].pk, self.closed.pk, 9999]
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post(
+                '/api/contact/messages/bulk_status/', {'ids': ids, 'status': 'closed'}, format='json'
+            )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['count'], 2)
+        self.assertEqual(
+            [item['result'] for item in response.data['results']],
+            ['updated', 'updated', 'unchanged', 'not_found']
+        )
+        updates = [query['sql'] for query in queries if query['sql'].startswith('UPDATE "contact_contactmessage"')]
+        self.assertEqual(len(updates), 1)
+
+        message = ContactMessage.objects.get(pk=self.messages[0].pk)
+        self.assertEqual(message.status, 'closed')
+        self.assertEqual(message.responded_by, self.admin)
+        self.assertIsNotNone(message.response_date)
+        # La fila que ya estaba cerrada conserva su auditoría
+        self.assertIsNone(ContactMessage.objects.get(pk=self.closed.pk).responded_by)
+        self.assertEqual(find_drift(), [])
+
+    def test_bulk_status_by_filter(self):
+        response = self.client.post(
+            '/api/contact/messages/bulk_status/',
+            {'filter': {'subject': 'volunteer', 'status': 'new'}, 'status': 'in_progress'},
+            format='json'
+        )
+        self.assertEqual(response.data['count'], 3)
+        self.assertEqual(
+            set(ContactMessage.objects.filter(status='in_progress').values_list('pk', flat=True)),
+            {message.pk for message in self.messages[:3]}
+        )
+
+    def test_bulk_status_rejects_unknown_filter(self):
+        response = self.client.post(
+            '/api/contact/messages/bulk_status/',
+            {'filter': {'email': 'persona0@example.com'}, 'status': 'closed'},
+            format='json'
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(ContactMessage.objects.filter(status='closed').exclude(pk=self.closed.pk).exists())
+
+    def test_bulk_status_validates_selection_and_status(self):
+        url = '/api/contact/messages/bulk_status/'
+        for payload in [
+            {'status': 'closed'},
+            {'ids': [1], 'filter': {'status': 'new'}, 'status': 'closed'},
+            {'ids': [1], 'status': 'archivado'},
+        ]:
+            self.assertEqual(self.client.post(url, payload, format='json').status_code, 400)
+
+    def test_bulk_delete_by_filter(self):
+        response = self.client.post(
+            '/api/contact/messages/bulk_delete/', {'filter': {'subject': 'other'}}, format='json'
+        )
+        self.assertEqual(response.data['count'], 2)
+        self.assertEqual(find_drift(), [])
+
+    def test_admin_action_sets_audit_fields(self):
+        request = RequestFactory().post('/admin/contact/contactmessage/')
+        request.user = self.admin
+        model_admin = site._registry[ContactMessage]
+        with patch.object(model_admin, 'message_user') as message_user:
+            model_admin.mark_as_resolved(request, ContactMessage.objects.filter(pk=self.messages[0].pk))
+        message_user.assert_called_once_with(request, '1 mensaje(s) marcado(s) como "Resuelto".')
+
+        message = ContactMessage.objects.get(pk=self.messages[0].pk)
+        self.assertEqual(message.status, 'resolved')
+        self.assertEqual(message.responded_by, self.admin)
+        self.assertIsNotNone(message.response_date)
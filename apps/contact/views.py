@@ -1,18 +1,19 @@
 from rest_framework import viewsets, status, filters
 from rest_framework.decorators import action
 from rest_framework.response import Response
-from rest_framework.permissions import IsAuthenticated, AllowAny
 from django_filters.rest_framework import DjangoFilterBackend
 from .models import ContactMessage
 from .serializers import (
     ContactMessageSerializer,
     ContactMessageCreateSerializer,
-    ContactMessageResponseSerializer
+    ContactMessageResponseSerializer,
+    fast_contact_message_serializer
 )
-from apps.common.permissions import IsAdminUser
+from apps.common.permissions import PUBLIC, HasCapability
+from apps.common.mixins import BulkStatusMixin, FastListMixin, SoftDeleteMixin
 
 
-class ContactMessageViewSet(viewsets.ModelViewSet):
+class ContactMessageViewSet(SoftDeleteMixin, BulkStatusMixin, FastListMixin, viewsets.ModelViewSet):
     """
     ViewSet para mensajes de contacto
     
@@ -21,13 +22,19 @@ class ContactMessageViewSet(viewsets.ModelViewSet):
     create: POST /api/contact/messages/ - Crear mensaje (público)
     update: PUT/PATCH /api/contact/messages/{id}/ - Actualizar (admin)
     destroy: DELETE /api/contact/messages/{id}/ - Eliminar (admin)
+    bulk_status: POST /api/contact/messages/bulk_status/ - Cambiar estado en bloque (admin)
     """
+    permission_classes = [HasCapability]
+    required_capability = 'contact'
+    action_capabilities = {'create': PUBLIC}
     queryset = ContactMessage.objects.all()
     filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
     filterset_fields = ['subject', 'status']
     search_fields = ['full_name', 'email', 'message']
     ordering_fields = ['created_at', 'status']
     ordering = ['-created_at']
+    fast_list_serializer = fast_contact_message_serializer
+    bulk_status_fields = ContactMessage.BULK_STATUS_FIELDS
     
     def get_serializer_class(self):
         if self.action == 'create':
@@ -36,14 +43,6 @@ class ContactMessageViewSet(viewsets.ModelViewSet):
             return ContactMessageResponseSerializer
         return ContactMessageSerializer
     
-    def get_permissions(self):
-        # Solo 'create' es público
-        if self.action == 'create':
-            permission_classes = [AllowAny]
-        else:
-            permission_classes = [IsAuthenticated, IsAdminUser]
-        return [permission() for permission in permission_classes]
-    
     def create(self, request, *args, **kwargs):
         """
         Crear nuevo mensaje de contacto (público)
@@ -60,7 +59,7 @@ class ContactMessageViewSet(viewsets.ModelViewSet):
         
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
     
-    @action(detail=True, methods=['patch'], permission_classes=[IsAuthenticated, IsAdminUser])
+    @action(detail=True, methods=['patch'])
     def respond(self, request, pk=None):
         """
         Responder a un mensaje de contacto
@@ -87,7 +86,7 @@ class ContactMessageViewSet(viewsets.ModelViewSet):
         
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
     
-    @action(detail=False, methods=['get'], permission_classes=[IsAuthenticated, IsAdminUser])
+    @action(detail=False, methods=['get'])
     def pending(self, request):
         """
         Obtener mensajes sin responder
@@ -97,7 +96,7 @@ class ContactMessageViewSet(viewsets.ModelViewSet):
         serializer = ContactMessageSerializer(messages, many=True)
         return Response(serializer.data)
     
-    @action(detail=False, methods=['get'], permission_classes=[IsAuthenticated, IsAdminUser])
+    @action(detail=False, methods=['get'])
     def statistics(self, request):
         """
         Estadísticas de mensajes
@@ -114,8 +113,3 @@ class ContactMessageViewSet(viewsets.ModelViewSet):
             'in_progress': in_progress,
             'resolved': resolved
         })
-    
-    def perform_destroy(self, instance):
-        # Soft delete
-        instance.is_active = False
-        instance.save()
\ No newline at end of file
@@ -0,0 +1,10 @@
+from django.urls import path
+from . import async_views
+
+app_name = 'content-async'
+
+urlpatterns = [
+    path('news/featured/', async_views.news_featured, name='news-featured'),
+    path('success-stories/featured/', async_views.stories_featured, name='success-story-featured'),
+    path('faqs/by_category/', async_views.faqs_by_category, name='faq-by-category'),
+]
@@ -0,0 +1,43 @@
+"""
+Contenido público con el ORM async (ver apps/common/async_api.py)
+
+Mismas respuestas que las acciones featured y by_category para visitantes.
+"""
+from apps.common.async_api import public_endpoint, public_viewset
+from .models import NewsArticle, SuccessStory
+from .serializers import FAQSerializer, NewsArticleSerializer, SuccessStorySerializer
+from .views import FAQViewSet, NewsArticleViewSet, SuccessStoryViewSet
+
+
+@public_endpoint('news.featured', cache_models=[NewsArticle])
+async def news_featured(request):
+    """
+    GET /api/async/content/news/featured/
+    """
+    view = public_viewset(NewsArticleViewSet, request, 'featured')
+    # El ORM async no carga relaciones al acceder a ellas: el autor va en la misma consulta
+    queryset = view.get_queryset().filter(is_featured=True, is_active=True).select_related('author')[:3]
+    articles = [article async for article in queryset]
+    return NewsArticleSerializer(articles, many=True, context={'request': request}).data
+
+
+@public_endpoint('success-stories.featured', cache_models=[SuccessStory])
+async def stories_featured(request):
+    """
+    GET /api/async/content/success-stories/featured/
+    """
+    view = public_viewset(SuccessStoryViewSet, request, 'featured')
+    stories = [story async for story in view.get_queryset().filter(is_featured=True, is_active=True)[:4]]
+    return SuccessStorySerializer(stories, many=True, context={'request': request}).data
+
+
+@public_endpoint('faqs.by_category')
+async def faqs_by_category(request):
+    """
+    GET /api/async/content/faqs/by_category/
+    """
+    view = public_viewset(FAQViewSet, request, 'by_category')
+    grouped = {}
+    async for faq in view.get_queryset().filter(is_active=True):
+        grouped.setdefault(faq.get_category_display(), []).append(FAQSerializer(faq).data)
+    return grouped
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.7 on 2026-10-18 03:21
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('content', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='newsarticle',
+            name='featured_image_renditions',
+            field=models.JSONField(blank=True, default=dict, editable=False, help_text='Versiones reducidas generadas en segundo plano', verbose_name='Versiones de la imagen destacada'),
+        ),
+        migrations.AddField(
+            model_name='successstory',
+            name='after_image_renditions',
+            field=models.JSONField(blank=True, default=dict, editable=False, help_text='Versiones reducidas generadas en segundo plano', verbose_name='Versiones de la imagen actual'),
+        ),
+        migrations.AddField(
+            model_name='successstory',
+            name='before_image_renditions',
+            field=models.JSONField(blank=True, default=dict, editable=False, help_text='Versiones reducidas generadas en segundo plano', verbose_name='Versiones de la imagen anterior'),
+        ),
+    ]
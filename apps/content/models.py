@@ -27,6 +27,13 @@ class NewsArticle(BaseModel):
         blank=True,
         null=True
     )
+    featured_image_renditions = models.JSONField(
+        default=dict,
+        blank=True,
+        editable=False,
+        verbose_name='Versiones de la imagen destacada',
+        help_text='Versiones reducidas generadas en segundo plano'
+    )
     is_featured = models.BooleanField(
         default=False,
         verbose_name='Artículo destacado'
@@ -84,6 +91,20 @@ class SuccessStory(BaseModel):
         blank=True,
         null=True
     )
+    before_image_renditions = models.JSONField(
+        default=dict,
+        blank=True,
+        editable=False,
+        verbose_name='Versiones de la imagen anterior',
+        help_text='Versiones reducidas generadas en segundo plano'
+    )
+    after_image_renditions = models.JSONField(
+        default=dict,
+        blank=True,
+        editable=False,
+        verbose_name='Versiones de la imagen actual',
+        help_text='Versiones reducidas generadas en segundo plano'
+    )
     is_featured = models.BooleanField(
         default=False,
         verbose_name='Historia destacada'
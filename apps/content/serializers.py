@@ -1,9 +1,11 @@
 from rest_framework import serializers
+from apps.common.serializers import RenditionsField
 from .models import NewsArticle, SuccessStory, FAQ
 
 
 class NewsArticleSerializer(serializers.ModelSerializer):
     author_name = serializers.CharField(source='author.full_name', read_only=True)
+    featured_image_renditions = RenditionsField()
     
     class Meta:
         model = NewsArticle
@@ -17,12 +19,15 @@ class SuccessStorySerializer(serializers.ModelSerializer):
     """
     # Usar after_image como la imagen principal para el frontend
     imagen = serializers.SerializerMethodField()
+    before_image_renditions = RenditionsField()
+    after_image_renditions = RenditionsField()
     
     class Meta:
         model = SuccessStory
         fields = [
             'id', 'title', 'pet_name', 'adopter_name', 'story',
             'before_image', 'after_image', 'imagen', 'is_featured',
+            'before_image_renditions', 'after_image_renditions',
             'created_at', 'is_active'
         ]
         read_only_fields = ['id', 'created_at']
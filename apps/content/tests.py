@@ -1,3 +1,83 @@
+from asgiref.sync import sync_to_async
 from django.test import TestCase
+from rest_framework.test import APIClient
 
-# Create your tests here.
+from apps.authentication.models import AdminUser
+from .models import FAQ, NewsArticle, SuccessStory
+
+
+class ContentConditionalGetTests(TestCase):
+    """
+    Noticias y preguntas frecuentes responden 304 si no hubo cambios
+    """
+
+    def setUp(self):
+        self.client = APIClient()
+        self.faq = FAQ.objects.create(question='¿Cómo adopto?', answer='Llenando el formulario', category='adoption')
+        NewsArticle.objects.create(title='Jornada', slug='jornada', summary='r', content='c')
+
+    def test_faq_list_and_detail(self):
+        for url in ['/api/content/faqs/', f'/api/content/faqs/{self.faq.pk}/']:
+            with self.subTest(url=url):
+                etag = self.client.get(url)['ETag']
+                self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+        etag = self.client.get('/api/content/faqs/')['ETag']
+        self.faq.answer = 'Descargando el formulario'
+        self.faq.save()
+        self.assertEqual(self.client.get('/api/content/faqs/', HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_news_detail_by_slug(self):
+        etag = self.client.get('/api/content/news/jornada/')['ETag']
+        response = self.client.get('/api/content/news/jornada/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+
+class ContentFullTextSearchTests(TestCase):
+    """
+    Noticias e historias se buscan con el índice de texto completo
+    """
+
+    def test_news_and_stories_search(self):
+        NewsArticle.objects.create(
+            title='Campaña de vacunación', slug='vacunacion', summary='Vacunas gratis', content='Sábado'
+        )
+        NewsArticle.objects.create(title='Jornada', slug='jornada', summary='r', content='c')
+        SuccessStory.objects.create(
+            title='Un nuevo hogar', pet_name='Tomás', adopter_name='Familia Pérez', story='Feliz'
+        )
+
+        client = APIClient()
+        news = client.get('/api/content/news/', {'search': 'campana vacunacion'}).data['results']
+        self.assertEqual([article['slug'] for article in news], ['vacunacion'])
+        stories = client.get('/api/content/success-stories/', {'search': 'tomas perez'}).data['results']
+        self.assertEqual([story['pet_name'] for story in stories], ['Tomás'])
+
+
+class ContentAsyncEndpointTests(TestCase):
+    """
+    Destacados y FAQs async: mismo JSON que los endpoints síncronos
+    """
+
+    def setUp(self):
+        author = AdminUser.objects.create_user(username='editor', password='secreto123', first_name='Ana')
+        for index in range(5):
+            NewsArticle.objects.create(
+                title=f'Noticia {index}', slug=f'noticia-{index}', summary='r', content='c',
+                author=author, is_featured=index != 2
+            )
+            SuccessStory.objects.create(
+                title=f'Historia {index}', pet_name='Luna', adopter_name='Familia', story='s',
+                is_featured=True, is_active=index != 0
+            )
+        FAQ.objects.create(question='¿Cómo adopto?', answer='Formulario', category='adoption')
+        FAQ.objects.create(question='¿Puedo donar?', answer='Sí', category='donation')
+        FAQ.objects.create(question='Oculta', answer='-', category='adoption', is_active=False)
+
+    async def test_same_json_as_sync(self):
+        for url in ['news/featured/', 'success-stories/featured/', 'faqs/by_category/']:
+            with self.subTest(url=url):
+                expected = await sync_to_async(self.client.get)(f'/api/content/{url}')
+                response = await self.async_client.get(f'/api/async/content/{url}')
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(response.json(), expected.json())
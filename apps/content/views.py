@@ -1,28 +1,48 @@
 from rest_framework import viewsets, filters
 from rest_framework.decorators import action
 from rest_framework.response import Response
-from rest_framework.permissions import IsAuthenticated, AllowAny
 from django_filters.rest_framework import DjangoFilterBackend
+from django.db.models import Q
 from .models import NewsArticle, SuccessStory, FAQ
 from .serializers import (
     NewsArticleSerializer,
     SuccessStorySerializer,
     FAQSerializer
 )
-from apps.common.permissions import IsAdminUser
+from apps.common.permissions import PUBLIC, HasCapability
+from apps.common.cache import CachedResponseMixin, cache_response
+from apps.common.search import FullTextSearchFilter
+from apps.authentication.activity import ActivityLogMixin
+from apps.common.mixins import ConditionalGetMixin, SoftDeleteMixin
 
 
-class NewsArticleViewSet(viewsets.ModelViewSet):
+# Acciones de noticias, historias y FAQs registradas en AdminActivityLog
+CONTENT_ACTIVITY_ACTIONS = {
+    'create': 'create_content',
+    'update': 'update_content',
+    'partial_update': 'update_content',
+    'bulk_restore': 'update_content',
+    'destroy': 'delete_content',
+    'bulk_delete': 'delete_content',
+}
+
+
+class NewsArticleViewSet(ActivityLogMixin, SoftDeleteMixin, ConditionalGetMixin, CachedResponseMixin, viewsets.ModelViewSet):
     """
     ViewSet para artículos de noticias
     """
+    permission_classes = [HasCapability]
+    required_capability = 'content'
+    action_capabilities = {'list': PUBLIC, 'retrieve': PUBLIC, 'featured': PUBLIC}
     queryset = NewsArticle.objects.all()
     serializer_class = NewsArticleSerializer
-    filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
+    filter_backends = [DjangoFilterBackend, filters.OrderingFilter, FullTextSearchFilter]
     filterset_fields = ['is_featured', 'is_active']
     search_fields = ['title', 'summary', 'content']
     ordering_fields = ['published_date', 'title']
     ordering = ['-published_date']
+    cache_models = [NewsArticle]
+    activity_actions = CONTENT_ACTIVITY_ACTIONS
     # lookup_field = 'slug'  # ← COMENTAR O ELIMINAR ESTA LÍNEA
     
     def get_object(self):
@@ -46,12 +66,13 @@ class NewsArticleViewSet(viewsets.ModelViewSet):
             from django.http import Http404
             raise Http404("Noticia no encontrada")
     
-    def get_permissions(self):
-        if self.action in ['list', 'retrieve', 'featured']:
-            permission_classes = [AllowAny]
-        else:
-            permission_classes = [IsAuthenticated, IsAdminUser]
-        return [permission() for permission in permission_classes]
+    def get_detail_queryset(self):
+        # Mismo criterio que get_object: por ID si es numérico, si no por slug
+        lookup_value = self.kwargs.get('pk')
+        queryset = self.filter_queryset(self.get_queryset())
+        if lookup_value.isdigit():
+            return queryset.filter(Q(pk=int(lookup_value)) | Q(slug=lookup_value))
+        return queryset.filter(slug=lookup_value)
     
     def get_queryset(self):
         queryset = NewsArticle.objects.all()
@@ -66,7 +87,8 @@ class NewsArticleViewSet(viewsets.ModelViewSet):
         # Asignar el usuario actual como autor
         serializer.save(author=self.request.user)
     
-    @action(detail=False, methods=['get'], permission_classes=[AllowAny])
+    @action(detail=False, methods=['get'])
+    @cache_response
     def featured(self, request):
         """
         Obtener artículos destacados
@@ -75,14 +97,9 @@ class NewsArticleViewSet(viewsets.ModelViewSet):
         articles = self.get_queryset().filter(is_featured=True, is_active=True)[:3]
         serializer = self.get_serializer(articles, many=True)
         return Response(serializer.data)
-    
-    def perform_destroy(self, instance):
-        # Soft delete
-        instance.is_active = False
-        instance.save()
 
 
-class SuccessStoryViewSet(viewsets.ModelViewSet):
+class SuccessStoryViewSet(ActivityLogMixin, SoftDeleteMixin, ConditionalGetMixin, CachedResponseMixin, viewsets.ModelViewSet):
     """
     ViewSet para historias de éxito
     
@@ -92,20 +109,18 @@ class SuccessStoryViewSet(viewsets.ModelViewSet):
     update: PUT/PATCH /api/content/success-stories/{id}/ - Actualizar (admin)
     destroy: DELETE /api/content/success-stories/{id}/ - Eliminar (admin)
     """
+    permission_classes = [HasCapability]
+    required_capability = 'content'
+    action_capabilities = {'list': PUBLIC, 'retrieve': PUBLIC, 'featured': PUBLIC}
     queryset = SuccessStory.objects.all()
     serializer_class = SuccessStorySerializer
-    filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
+    filter_backends = [DjangoFilterBackend, filters.OrderingFilter, FullTextSearchFilter]
     filterset_fields = ['is_featured', 'is_active']
     search_fields = ['title', 'pet_name', 'adopter_name', 'story']
     ordering_fields = ['created_at', 'title']
     ordering = ['-created_at']
-    
-    def get_permissions(self):
-        if self.action in ['list', 'retrieve', 'featured']:
-            permission_classes = [AllowAny]
-        else:
-            permission_classes = [IsAuthenticated, IsAdminUser]
-        return [permission() for permission in permission_classes]
+    cache_models = [SuccessStory]
+    activity_actions = CONTENT_ACTIVITY_ACTIONS
     
     def get_queryset(self):
         queryset = SuccessStory.objects.all()
@@ -116,7 +131,8 @@ class SuccessStoryViewSet(viewsets.ModelViewSet):
         
         return queryset
     
-    @action(detail=False, methods=['get'], permission_classes=[AllowAny])
+    @action(detail=False, methods=['get'])
+    @cache_response
     def featured(self, request):
         """
         Obtener historias destacadas
@@ -125,14 +141,9 @@ class SuccessStoryViewSet(viewsets.ModelViewSet):
         stories = self.get_queryset().filter(is_featured=True, is_active=True)[:4]
         serializer = self.get_serializer(stories, many=True)
         return Response(serializer.data)
-    
-    def perform_destroy(self, instance):
-        # Soft delete
-        instance.is_active = False
-        instance.save()
 
 
-class FAQViewSet(viewsets.ModelViewSet):
+class FAQViewSet(ActivityLogMixin, SoftDeleteMixin, ConditionalGetMixin, viewsets.ModelViewSet):
     """
     ViewSet para preguntas frecuentes
     
@@ -142,19 +153,16 @@ class FAQViewSet(viewsets.ModelViewSet):
     update: PUT/PATCH /api/content/faqs/{id}/ - Actualizar (admin)
     destroy: DELETE /api/content/faqs/{id}/ - Eliminar (admin)
     """
+    permission_classes = [HasCapability]
+    required_capability = 'content'
+    action_capabilities = {'list': PUBLIC, 'retrieve': PUBLIC, 'by_category': PUBLIC}
     queryset = FAQ.objects.all()
     serializer_class = FAQSerializer
     filter_backends = [DjangoFilterBackend, filters.OrderingFilter]
     filterset_fields = ['category', 'is_active']
     ordering_fields = ['order', 'category']
     ordering = ['category', 'order']
-    
-    def get_permissions(self):
-        if self.action in ['list', 'retrieve', 'by_category']:
-            permission_classes = [AllowAny]
-        else:
-            permission_classes = [IsAuthenticated, IsAdminUser]
-        return [permission() for permission in permission_classes]
+    activity_actions = CONTENT_ACTIVITY_ACTIONS
     
     def get_queryset(self):
         queryset = FAQ.objects.all()
@@ -165,7 +173,7 @@ class FAQViewSet(viewsets.ModelViewSet):
         
         return queryset
     
-    @action(detail=False, methods=['get'], permission_classes=[AllowAny])
+    @action(detail=False, methods=['get'])
     def by_category(self, request):
         """
         Obtener FAQs agrupados por categoría
@@ -182,8 +190,3 @@ class FAQViewSet(viewsets.ModelViewSet):
             grouped[category].append(FAQSerializer(faq).data)
         
         return Response(grouped)
-    
-    def perform_destroy(self, instance):
-        # Soft delete
-        instance.is_active = False
-        instance.save()
\ No newline at end of file
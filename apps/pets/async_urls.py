@@ -0,0 +1,10 @@
+from django.urls import path
+from . import async_views
+
+app_name = 'pets-async'
+
+urlpatterns = [
+    path('pets/', async_views.pet_list, name='pet-list'),
+    path('pets/available/', async_views.pet_available, name='pet-available'),
+    path('pets/<int:pk>/', async_views.pet_detail, name='pet-detail'),
+]
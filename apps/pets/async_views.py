@@ -0,0 +1,47 @@
+"""
+Catálogo público de mascotas con el ORM async (ver apps/common/async_api.py)
+
+Mismas respuestas que PetViewSet.list, retrieve y available para visitantes.
+"""
+from django.shortcuts import aget_object_or_404
+
+from apps.common.async_api import paginate, public_endpoint, public_viewset
+from .models import Pet, PetImage
+from .serializers import PetDetailSerializer, fast_pet_list_serializer
+from .views import PetViewSet
+
+
+def list_rows(view, queryset):
+    return fast_pet_list_serializer.values(queryset, *view.get_fast_list_columns())
+
+
+@public_endpoint('pets.list', cache_models=[Pet, PetImage])
+async def pet_list(request):
+    """
+    GET /api/async/pets/
+    """
+    view = public_viewset(PetViewSet, request, 'list')
+    rows = list_rows(view, view.filter_queryset(view.get_queryset()))
+    context = {'request': request}
+    return await paginate(request, rows, lambda page: fast_pet_list_serializer.to_representation(page, context))
+
+
+@public_endpoint('pets.available', cache_models=[Pet, PetImage])
+async def pet_available(request):
+    """
+    GET /api/async/pets/available/
+    """
+    view = public_viewset(PetViewSet, request, 'available')
+    pets = view.get_available_queryset()
+    # Sin contexto: URL relativa de las imágenes, como el endpoint síncrono
+    return await paginate(request, list_rows(view, pets), fast_pet_list_serializer.to_representation)
+
+
+@public_endpoint('pets.retrieve', cache_models=[Pet, PetImage])
+async def pet_detail(request, pk):
+    """
+    GET /api/async/pets/{id}/
+    """
+    view = public_viewset(PetViewSet, request, 'retrieve')
+    pet = await aget_object_or_404(view.get_queryset(), pk=pk)
+    return PetDetailSerializer(pet, context={'request': request}).data
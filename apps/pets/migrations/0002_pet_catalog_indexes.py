@@ -0,0 +1,29 @@
+# Generated by Django 5.2.7 on 2026-10-18 03:06
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pets', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='pet',
+            index=models.Index(fields=['-created_at', 'is_active'], name='pet_created_active_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='pet',
+            index=models.Index(fields=['status', '-created_at', 'is_active'], name='pet_status_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='pet',
+            index=models.Index(fields=['species', 'status', 'is_active'], name='pet_species_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='pet',
+            index=models.Index(fields=['size', 'gender', 'is_active'], name='pet_size_gender_idx'),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.7 on 2026-10-18 03:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pets', '0002_pet_catalog_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='pet',
+            index=models.Index(fields=['updated_at', 'is_active'], name='pet_updated_active_idx'),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.7 on 2026-10-18 03:21
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pets', '0003_pet_updated_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='pet',
+            name='main_image_renditions',
+            field=models.JSONField(blank=True, default=dict, editable=False, help_text='Versiones reducidas generadas en segundo plano', verbose_name='Versiones de la imagen principal'),
+        ),
+        migrations.AddField(
+            model_name='petimage',
+            name='image_renditions',
+            field=models.JSONField(blank=True, default=dict, editable=False, help_text='Versiones reducidas generadas en segundo plano', verbose_name='Versiones de la imagen'),
+        ),
+    ]
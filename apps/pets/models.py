@@ -164,11 +164,29 @@ class Pet(BaseModel):
         blank=True,
         null=True
     )
+    main_image_renditions = models.JSONField(
+        default=dict,
+        blank=True,
+        editable=False,
+        verbose_name='Versiones de la imagen principal',
+        help_text='Versiones reducidas generadas en segundo plano'
+    )
     
     class Meta:
         verbose_name = 'Mascota'
         verbose_name_plural = 'Mascotas'
         ordering = ['-created_at']
+        # Índices para los filtros del catálogo público (/api/pets/ y /api/pets/available/).
+        # is_active va al final: Django genera "WHERE is_active" (sin "= 1"), que no
+        # permite buscar por la primera columna del índice pero sí filtrar dentro de él.
+        indexes = [
+            models.Index(fields=['-created_at', 'is_active'], name='pet_created_active_idx'),
+            models.Index(fields=['status', '-created_at', 'is_active'], name='pet_status_created_idx'),
+            models.Index(fields=['species', 'status', 'is_active'], name='pet_species_status_idx'),
+            models.Index(fields=['size', 'gender', 'is_active'], name='pet_size_gender_idx'),
+            # Validadores ETag del listado: MAX(updated_at) y COUNT sin leer la tabla
+            models.Index(fields=['updated_at', 'is_active'], name='pet_updated_active_idx'),
+        ]
     
     def __str__(self):
         return f"{self.name} ({self.get_species_display()})"
@@ -203,6 +221,13 @@ class PetImage(BaseModel):
         upload_to='pets/gallery/',
         verbose_name='Imagen'
     )
+    image_renditions = models.JSONField(
+        default=dict,
+        blank=True,
+        editable=False,
+        verbose_name='Versiones de la imagen',
+        help_text='Versiones reducidas generadas en segundo plano'
+    )
     caption = models.CharField(
         max_length=200,
         verbose_name='Descripción',
@@ -1,4 +1,9 @@
+from django.db import transaction
+from django.utils import timezone
 from rest_framework import serializers
+from apps.common.cache import bump_generation
+from apps.common.images import UPLOAD_FORMATS, read_image_header, schedule_renditions
+from apps.common.serializers import FastListSerializer, RenditionsField, from_property
 from .models import Pet, PetImage
 
 
@@ -6,12 +11,101 @@ class PetImageSerializer(serializers.ModelSerializer):
     """
     Serializer para imágenes de mascotas
     """
+    image_renditions = RenditionsField()
+
     class Meta:
         model = PetImage
-        fields = ['id', 'image', 'caption', 'order', 'created_at']
+        fields = ['id', 'image', 'image_renditions', 'caption', 'order', 'created_at']
         read_only_fields = ['id', 'created_at']
 
 
+class PetGalleryUploadSerializer(serializers.Serializer):
+    """
+    Subida masiva y reordenamiento de la galería de una mascota
+
+    images: archivos nuevos, se agregan al final de la galería en el orden recibido
+    order: IDs de imágenes en el orden deseado; las no incluidas quedan después
+    """
+    images = serializers.ListField(child=serializers.FileField(), required=False, default=list)
+    caption = serializers.CharField(max_length=200, required=False, allow_blank=True, default='')
+    order = serializers.ListField(child=serializers.IntegerField(), required=False, default=list)
+
+    def validate_images(self, images):
+        errors = {}
+        for index, image in enumerate(images):
+            # Solo la cabecera: no se decodifica la imagen completa en el request
+            header = read_image_header(image)
+            if header is None or header[0] not in UPLOAD_FORMATS:
+                errors[index] = f'{image.name}: el archivo debe ser una imagen JPG, PNG o WEBP'
+        if errors:
+            raise serializers.ValidationError(errors)
+        return images
+
+    def validate_order(self, order):
+        if len(set(order)) != len(order):
+            raise serializers.ValidationError('Hay imágenes repetidas')
+        unknown = set(order) - {image.pk for image in self.context['gallery']}
+        if unknown:
+            raise serializers.ValidationError(
+                f'Imágenes que no pertenecen a la galería: {", ".join(map(str, sorted(unknown)))}'
+            )
+        return order
+
+    def reorder(self, gallery, order):
+        """
+        Asignar `order` 0..n-1 a toda la galería; retorna las filas que cambiaron
+        """
+        position = {pk: index for index, pk in enumerate(order)}
+        ordered = sorted(gallery, key=lambda image: position.get(image.pk, len(order)))
+        changed = []
+        now = timezone.now()
+        for index, image in enumerate(ordered):
+            if image.order != index:
+                image.order, image.updated_at = index, now
+                changed.append(image)
+        return changed
+
+    def save(self, pet):
+        """
+        Un bulk_update para el orden y un bulk_create para las imágenes nuevas
+        """
+        gallery = self.context['gallery']
+        images = self.validated_data['images']
+        order = self.validated_data['order']
+        changed = self.reorder(gallery, order) if order else []
+        next_order = len(gallery) if order else max((image.order + 1 for image in gallery), default=0)
+
+        field = PetImage._meta.get_field('image')
+        new_images, names = [], set()
+        try:
+            # storage.save copia en bloques (o mueve el archivo temporal) sin leerlo entero
+            for offset, upload in enumerate(images):
+                image = PetImage(pet=pet, caption=self.validated_data['caption'], order=next_order + offset)
+                name = field.storage.save(
+                    field.generate_filename(image, upload.name), upload, max_length=field.max_length
+                )
+                image.image = name
+                new_images.append(image)
+                names.add(name)
+
+            with transaction.atomic():
+                if changed:
+                    PetImage.objects.bulk_update(changed, ['order', 'updated_at'])
+                PetImage.objects.bulk_create(new_images)
+        except Exception:
+            for name in names:
+                field.storage.delete(name)
+            raise
+
+        # bulk_create y bulk_update no disparan señales
+        bump_generation(PetImage)
+        gallery = list(pet.images.filter(is_active=True))
+        for image in gallery:
+            if image.image.name in names:
+                schedule_renditions(image, 'image')
+        return gallery, len(new_images)
+
+
 class PetListSerializer(serializers.ModelSerializer):
     """
     Serializer resumido para listado de mascotas
@@ -21,6 +115,7 @@ class PetListSerializer(serializers.ModelSerializer):
     status_display = serializers.CharField(source='get_status_display', read_only=True)
     size_display = serializers.CharField(source='get_size_display', read_only=True)
     age_display = serializers.ReadOnlyField()
+    main_image_renditions = RenditionsField()
     
     class Meta:
         model = Pet
@@ -28,12 +123,18 @@ class PetListSerializer(serializers.ModelSerializer):
             'id', 'name', 'species', 'species_display', 'breed', 
             'gender', 'gender_display', 'age_years', 'age_months', 'age_display',
             'size', 'size_display', 'status', 'status_display', 
-            'main_image', 'description',
+            'main_image', 'main_image_renditions', 'description',
             'friendly_with_kids', 'adapts_to_indoor_living', 'energy_level',
             'is_active', 'created_at'
         ]
 
 
+# Mismo JSON que PetListSerializer, generado desde .values() para listados grandes
+fast_pet_list_serializer = FastListSerializer(PetListSerializer, computed={
+    'age_display': from_property(Pet.age_display, 'age_years', 'age_months'),
+})
+
+
 class PetDetailSerializer(serializers.ModelSerializer):
     """
     Serializer completo para detalle de mascota
@@ -45,6 +146,7 @@ class PetDetailSerializer(serializers.ModelSerializer):
     age_display = serializers.ReadOnlyField()
     is_available = serializers.ReadOnlyField()
     images = PetImageSerializer(many=True, read_only=True)
+    main_image_renditions = RenditionsField()
     
     class Meta:
         model = Pet
@@ -54,7 +156,7 @@ class PetDetailSerializer(serializers.ModelSerializer):
             'age_display', 'size', 'size_display', 'weight', 'color',
             'status', 'status_display', 'is_sterilized', 'is_vaccinated', 
             'is_dewormed', 'description', 'characteristics', 'special_needs',
-            'arrival_date', 'adoption_date', 'main_image', 'images',
+            'arrival_date', 'adoption_date', 'main_image', 'main_image_renditions', 'images',
             'friendly_with_kids', 'adapts_to_indoor_living', 'easy_to_train', 'energy_level',
             'is_active', 'is_available', 'created_at', 'updated_at'
         ]
@@ -1,3 +1,579 @@
-from django.test import TestCase
+from io import BytesIO
+from itertools import cycle, islice
+from unittest.mock import patch
 
-# Create your tests here.
+from PIL import Image
+from asgiref.sync import sync_to_async
+from django.core.cache import cache
+from django.core.files.storage import FileSystemStorage, default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from apps.authentication.models import AdminUser
+from apps.common.counters import find_drift
+from apps.common.images import RENDITIONS
+from apps.common.serializers import FastListSerializer
+from .models import Pet, PetImage
+from .serializers import PetDetailSerializer, PetListSerializer, fast_pet_list_serializer
+
+
+def seed_pets(total):
+    """
+    Crear un catálogo variado de mascotas con bulk_create
+    """
+    combos = cycle([
+        (species, status, size, gender)
+        for species, _ in Pet.SPECIES_CHOICES
+        for status, _ in Pet.STATUS_CHOICES
+        for size, _ in Pet.SIZE_CHOICES
+        for gender, _ in Pet.GENDER_CHOICES
+    ])
+    Pet.objects.bulk_create([
+        Pet(
+            name=f'Mascota {index}', species=species, status=status,
+            size=size, gender=gender, is_active=index % 10 != 0
+        )
+        for index, (species, status, size, gender) in enumerate(islice(combos, total))
+    ])
+
+
+class PetCatalogIndexTests(TestCase):
+    """
+    Las consultas del catálogo público no deben recorrer toda la tabla
+    """
+    CATALOG_URLS = [
+        '/api/pets/',
+        '/api/pets/available/',
+        '/api/pets/?species=cat',
+        '/api/pets/?species=dog&status=available',
+        '/api/pets/?status=in_process',
+        '/api/pets/?size=large&gender=F',
+        '/api/pets/?search=mascota',
+    ]
+
+    @classmethod
+    def setUpTestData(cls):
+        seed_pets(500)
+
+    def table_scans(self, sql):
+        with connection.cursor() as cursor:
+            cursor.execute(f'EXPLAIN QUERY PLAN {sql}')
+            plan = [row[-1] for row in cursor.fetchall()]
+        return [
+            step for step in plan
+            if step.startswith('SCAN pets_pet') and 'INDEX' not in step
+        ]
+
+    def test_catalog_queries_use_indexes(self):
+        if connection.vendor != 'sqlite':
+            self.skipTest('El plan de ejecución se verifica con SQLite')
+
+        client = APIClient()
+        for url in self.CATALOG_URLS:
+            with self.subTest(url=url):
+                with CaptureQueriesContext(connection) as context:
+                    response = client.get(url)
+                self.assertEqual(response.status_code, 200)
+
+                pet_queries = [q['sql'] for q in context.captured_queries if 'FROM "pets_pet"' in q['sql']]
+                self.assertTrue(pet_queries)
+                for sql in pet_queries:
+                    self.assertEqual(self.table_scans(sql), [], sql)
+
+
+@override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+class PetResponseCacheTests(TestCase):
+    """
+    El tráfico anónimo se sirve desde la caché hasta que cambia una mascota
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.pet = Pet.objects.create(name='Luna', gender='F', size='small')
+        self.client = APIClient()
+
+    def test_anonymous_responses_are_cached_until_edit(self):
+        for url in ['/api/pets/', f'/api/pets/{self.pet.pk}/', '/api/pets/available/']:
+            with self.subTest(url=url):
+                self.client.get(url)
+                with self.assertNumQueries(0):
+                    self.assertEqual(self.client.get(url).status_code, 200)
+
+        admin = AdminUser.objects.create_user(username='admin', password='secreto123')
+        admin_client = APIClient()
+        admin_client.force_authenticate(admin)
+        admin_client.patch(f'/api/pets/{self.pet.pk}/', {'name': 'Luna II'}, format='json')
+
+        response = self.client.get(f'/api/pets/{self.pet.pk}/')
+        self.assertEqual(response.data['name'], 'Luna II')
+
+        admin_client.delete(f'/api/pets/{self.pet.pk}/')
+        self.assertEqual(self.client.get('/api/pets/').data['count'], 0)
+        self.assertEqual(self.client.get(f'/api/pets/{self.pet.pk}/').status_code, 404)
+
+    def test_query_params_are_part_of_the_key(self):
+        self.client.get('/api/pets/?species=dog')
+        self.assertEqual(self.client.get('/api/pets/?species=cat').data['count'], 0)
+
+
+class PetConditionalGetTests(TestCase):
+    """
+    Los clientes con la versión actual reciben 304 sin cuerpo
+    """
+
+    def setUp(self):
+        self.pet = Pet.objects.create(name='Luna', gender='F', size='small')
+        self.client = APIClient()
+
+    def test_list_not_modified_until_change(self):
+        response = self.client.get('/api/pets/')
+        etag = response['ETag']
+        self.assertTrue(etag.startswith('W/"'))
+        self.assertIn('Last-Modified', response)
+
+        response = self.client.get('/api/pets/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.content, b'')
+
+        Pet.objects.create(name='Sol', gender='M', size='large')
+        response = self.client.get('/api/pets/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_detail_tracks_gallery_changes(self):
+        url = f'/api/pets/{self.pet.pk}/'
+        etag = self.client.get(url)['ETag']
+        with self.assertNumQueries(1):
+            self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+        PetImage.objects.create(pet=self.pet, image='pets/gallery/luna.jpg')
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_missing_detail_is_404(self):
+        self.assertEqual(self.client.get('/api/pets/999/').status_code, 404)
+
+
+class PetQueryShapeTests(TestCase):
+    """
+    El número de consultas del catálogo no depende del número de imágenes
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        for index in range(5):
+            pet = Pet.objects.create(name=f'Mascota {index}', gender='M', size='small')
+            for order in range(3):
+                PetImage.objects.create(pet=pet, image=f'pets/gallery/{index}-{order}.jpg', order=order)
+        cls.pet = pet
+        PetImage.objects.create(pet=pet, image='pets/gallery/oculta.jpg', is_active=False)
+
+    def setUp(self):
+        self.client = APIClient()
+
+    def test_list_skips_heavy_columns(self):
+        # Validadores ETag + COUNT de la paginación + página
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get('/api/pets/')
+        self.assertEqual(len(context.captured_queries), 3)
+        self.assertEqual(response.data['count'], 5)
+        self.assertNotIn('characteristics', context.captured_queries[-1]['sql'])
+
+    def test_detail_prefetches_active_images(self):
+        # Validadores ETag + mascota + galería
+        with self.assertNumQueries(3):
+            response = self.client.get(f'/api/pets/{self.pet.pk}/')
+        self.assertEqual(len(response.data['images']), 3)
+
+    def test_available_is_paginated(self):
+        Pet.objects.create(name='Adoptado', gender='F', size='large', status='adopted')
+        with self.assertNumQueries(2):
+            response = self.client.get('/api/pets/available/')
+        self.assertEqual(response.data['count'], 5)
+        self.assertEqual(len(response.data['results']), 5)
+
+        # Los filtros del listado no aplican: siempre todas las disponibles
+        response = self.client.get('/api/pets/available/?size=large&search=Adoptado')
+        self.assertEqual(response.data['count'], 5)
+
+
+class PetFullTextSearchTests(TestCase):
+    """
+    ?search= usa el índice de texto completo: sin acentos, por prefijo y por relevancia
+    """
+
+    def setUp(self):
+        self.client = APIClient()
+        self.small = Pet.objects.create(
+            name='Canela', breed='Mestizo', gender='F', size='small',
+            description='Perrita pequeña y juguetona'
+        )
+        self.named = Pet.objects.create(
+            name='Pequeño', breed='Pequeño terrier', gender='M', size='small',
+            description='Muy pequeño, ideal para departamento'
+        )
+        Pet.objects.create(name='Trueno', breed='Pastor alemán', gender='M', size='large')
+
+    def search(self, term, **params):
+        response = self.client.get('/api/pets/', {'search': term, **params})
+        self.assertEqual(response.status_code, 200)
+        return [pet['name'] for pet in response.data['results']]
+
+    def test_accent_insensitive_prefix_matching(self):
+        self.assertEqual(self.search('pequeno'), ['Pequeño'])
+        self.assertEqual(set(self.search('PEQUE')), {'Canela', 'Pequeño'})
+        self.assertEqual(self.search('pastor aleman'), ['Trueno'])
+        self.assertEqual(self.search('pastor gato'), [])
+
+    def test_results_are_ranked_unless_ordering_is_requested(self):
+        self.assertEqual(self.search('peque'), ['Pequeño', 'Canela'])
+        self.assertEqual(self.search('peque', ordering='name'), ['Canela', 'Pequeño'])
+
+    def test_index_follows_updates_and_deletes(self):
+        self.small.description = 'Gata tranquila'
+        self.small.save()
+        self.assertEqual(self.search('peque'), ['Pequeño'])
+        self.assertEqual(self.search('tranquila'), ['Canela'])
+
+        Pet.objects.filter(pk=self.named.pk).delete()
+        self.assertEqual(self.search('peque'), [])
+
+
+def jpeg_upload(name, size=(2400, 1200), orientation=None):
+    """
+    JPEG real generado con Pillow, opcionalmente con orientación EXIF
+    """
+    exif = Image.Exif()
+    exif[0x010F] = 'Cámara de prueba'
+    if orientation:
+        exif[0x0112] = orientation
+    output = BytesIO()
+    Image.new('RGB', size, (200, 120, 40)).save(output, 'JPEG', exif=exif)
+    return SimpleUploadedFile(name, output.getvalue(), content_type='image/jpeg')
+
+
+IN_MEMORY_STORAGES = {
+    'default': {'BACKEND': 'django.core.files.storage.InMemoryStorage'},
+    'staticfiles': {'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage'},
+}
+
+
+@override_settings(STORAGES=IN_MEMORY_STORAGES)
+class PetImageRenditionsTests(TestCase):
+    """
+    Las imágenes subidas generan versiones reducidas sin EXIF, expuestas por la API
+    """
+
+    def setUp(self):
+        self.admin = AdminUser.objects.create_user(
+            username='fotos', password='clave-segura-123', role='super_admin'
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+        self.pet = Pet.objects.create(name='Canela', gender='F', size='small')
+
+    def open(self, name):
+        with default_storage.open(name) as handle:
+            image = Image.open(handle)
+            image.load()
+        return image
+
+    def test_upload_generates_every_rendition_without_exif(self):
+        response = self.client.post(
+            f'/api/pets/{self.pet.pk}/upload_images/',
+            {'images': [jpeg_upload('galeria.jpg', orientation=6)]}, format='multipart'
+        )
+        self.assertEqual(response.status_code, 201)
+
+        image = PetImage.objects.get(pet=self.pet)
+        self.assertEqual(set(image.image_renditions), set(RENDITIONS))
+        for version, (width, height) in RENDITIONS.items():
+            self.assertEqual(set(image.image_renditions[version]), {'webp', 'jpeg'})
+            for image_format, name in image.image_renditions[version].items():
+                rendition = self.open(name)
+                self.assertEqual(rendition.format, image_format.upper())
+                self.assertLessEqual(rendition.width, width)
+                self.assertLessEqual(rendition.height, height)
+                # Orientación 6 aplicada: la imagen horizontal queda vertical
+                self.assertGreater(rendition.height, rendition.width)
+                self.assertEqual(len(rendition.getexif()), 0)
+
+    def test_api_exposes_rendition_urls(self):
+        self.pet.main_image = jpeg_upload('principal.jpg')
+        self.pet.save()
+        self.pet.refresh_from_db()
+        card = self.pet.main_image_renditions['card']['webp']
+
+        detail = self.client.get(f'/api/pets/{self.pet.pk}/').data
+        self.assertEqual(detail['main_image_renditions']['card']['webp'], f'http://testserver/media/{card}')
+
+        listed = self.client.get('/api/pets/').data['results'][0]
+        self.assertEqual(listed['main_image_renditions'], detail['main_image_renditions'])
+
+    def test_rendition_urls_use_the_image_field_storage(self):
+        self.pet.main_image = jpeg_upload('principal.jpg')
+        self.pet.save()
+        self.pet.refresh_from_db()
+        card = self.pet.main_image_renditions['card']['webp']
+
+        storage = FileSystemStorage(location=default_storage.location, base_url='https://cdn.example.com/')
+        with patch.object(Pet._meta.get_field('main_image'), 'storage', storage):
+            detail = PetDetailSerializer(self.pet).data
+            # El plan del serializer rápido se compila en el primer uso
+            fast = FastListSerializer(PetListSerializer, computed=fast_pet_list_serializer.computed)
+            listed = fast.to_representation(fast.values(Pet.objects.filter(pk=self.pet.pk)))[0]
+
+        self.assertEqual(detail['main_image_renditions']['card']['webp'], f'https://cdn.example.com/{card}')
+        self.assertEqual(listed['main_image_renditions'], detail['main_image_renditions'])
+
+    def test_replacing_the_image_regenerates_renditions(self):
+        self.pet.main_image = jpeg_upload('antes.jpg')
+        self.pet.save()
+        self.pet.refresh_from_db()
+        stale = self.pet.main_image_renditions['thumbnail']['jpeg']
+
+        self.pet.main_image = jpeg_upload('despues.jpg')
+        # Los archivos viejos se borran al confirmar la transacción
+        with self.captureOnCommitCallbacks(execute=True):
+            self.pet.save()
+        self.pet.refresh_from_db()
+        self.assertIn('despues', self.pet.main_image_renditions['thumbnail']['jpeg'])
+        self.assertFalse(default_storage.exists(stale))
+
+        # Guardar sin cambiar la imagen no vuelve a procesarla
+        renditions = self.pet.main_image_renditions
+        self.pet.name = 'Canela II'
+        self.pet.save()
+        self.pet.refresh_from_db()
+        self.assertEqual(self.pet.main_image_renditions, renditions)
+
+    def test_invalid_file_does_not_break_the_upload(self):
+        self.pet.main_image = SimpleUploadedFile('roto.jpg', b'no es una imagen', content_type='image/jpeg')
+        with self.assertLogs('apps.common.images', 'ERROR'):
+            self.pet.save()
+        self.pet.refresh_from_db()
+        self.assertEqual(self.pet.main_image_renditions, {})
+
+
+
+@override_settings(STORAGES=IN_MEMORY_STORAGES)
+class PetGalleryUploadTests(TestCase):
+    """
+    upload_images: validación por cabecera, un bulk_create y reordenamiento en bloque
+    """
+
+    def setUp(self):
+        self.admin = AdminUser.objects.create_user(
+            username='galeria', password='clave-segura-123', role='super_admin'
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+        self.pet = Pet.objects.create(name='Rocky', gender='M', size='medium')
+        self.url = f'/api/pets/{self.pet.pk}/upload_images/'
+
+    def request_queries(self, context):
+        return len([query for query in context.captured_queries if 'renditions' not in query['sql']])
+
+    def upload(self, count, start=0):
+        files = [jpeg_upload(f'foto-{start + index}.jpg', size=(40, 30)) for index in range(count)]
+        return self.client.post(self.url, {'images': files, 'caption': 'Galería'}, format='multipart')
+
+    def test_bulk_upload_appends_in_order_and_returns_gallery(self):
+        self.assertEqual(self.upload(2).status_code, 201)
+        response = self.upload(3, start=2)
+        self.assertEqual(response.status_code, 201)
+
+        images = response.data['images']
+        self.assertEqual([image['order'] for image in images], [0, 1, 2, 3, 4])
+        self.assertEqual([image['caption'] for image in images], ['Galería'] * 5)
+        self.assertTrue(images[4]['image'].startswith('http://testserver/media/pets/gallery/foto-4'))
+
+    def test_query_count_does_not_grow_with_files(self):
+        self.upload(1)
+        with CaptureQueriesContext(connection) as few:
+            self.upload(2)
+        with CaptureQueriesContext(connection) as many:
+            self.upload(6)
+        inserts = [q for q in many.captured_queries if q['sql'].startswith('INSERT INTO "pets_petimage"')]
+        self.assertEqual(len(inserts), 1)
+        self.assertEqual(PetImage.objects.filter(pet=self.pet).count(), 9)
+        # Sin contar las versiones reducidas (inmediatas en tests), el costo es fijo
+        self.assertEqual(self.request_queries(few), self.request_queries(many))
+
+    def test_invalid_file_rejects_the_whole_batch(self):
+        files = [
+            jpeg_upload('buena.jpg', size=(40, 30)),
+            SimpleUploadedFile('falsa.jpg', b'GIF89a no es una imagen', content_type='image/jpeg'),
+        ]
+        response = self.client.post(self.url, {'images': files}, format='multipart')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('1', {str(key) for key in response.data['images']})
+        self.assertFalse(PetImage.objects.exists())
+        # Se valida antes de escribir: ningún archivo llega al almacenamiento
+        self.assertFalse(default_storage.exists('pets/gallery/buena.jpg'))
+
+    def test_order_payload_reorders_with_one_update(self):
+        ids = [image['id'] for image in self.upload(3).data['images']]
+        desired = [ids[2], ids[0]]
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.post(self.url, {'order': desired}, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([image['id'] for image in response.data['images']], [ids[2], ids[0], ids[1]])
+        updates = [q for q in context.captured_queries if q['sql'].startswith('UPDATE "pets_petimage"')]
+        self.assertEqual(len(updates), 1)
+
+        response = self.client.post(self.url, {'order': [ids[0], 999]}, format='json')
+        self.assertEqual(response.status_code, 400)
+
+    def test_empty_request_is_rejected(self):
+        response = self.client.post(self.url, {}, format='multipart')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data['error'], 'No se enviaron imágenes')
+
+
+class PetSoftDeleteTests(TestCase):
+    """
+    Borrado lógico individual y masivo
+    """
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(
+            AdminUser.objects.create_user(username='admin', password='x', role='admin')
+        )
+        self.luna = Pet.objects.create(name='Luna', gender='F', size='small')
+        self.sol = Pet.objects.create(name='Sol', gender='M', size='large', status='adopted')
+        self.nube = Pet.objects.create(name='Nube', gender='F', size='medium', is_active=False)
+
+    def test_delete_writes_only_is_active(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.delete(f'/api/pets/{self.luna.pk}/')
+        self.assertEqual(response.status_code, 204)
+        updates = [query['sql'] for query in queries if query['sql'].startswith('UPDATE "pets_pet"')]
+        self.assertEqual(len(updates), 1)
+        self.assertIn('"is_active"', updates[0])
+        self.assertNotIn('"name"', updates[0])
+        self.luna.refresh_from_db()
+        self.assertFalse(self.luna.is_active)
+
+    def test_bulk_delete_reports_each_id(self):
+        ids = [self.luna.pk, self.sol.pk, self.nube.pk, 9999]
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post('/api/pets/bulk_delete/', {'ids': ids}, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['count'], 2)
+        self.assertEqual(
+            [item['result'] for item in response.data['results']],
+            ['updated', 'updated', 'unchanged', 'not_found']
+        )
+        updates = [query['sql'] for query in queries if query['sql'].startswith('UPDATE "pets_pet"')]
+        self.assertEqual(len(updates), 1)
+        self.assertFalse(Pet.objects.filter(is_active=True).exists())
+        self.assertEqual(find_drift(), [])
+
+    def test_bulk_restore(self):
+        response = self.client.post(
+            '/api/pets/bulk_restore/', {'ids': [self.nube.pk, self.luna.pk]}, format='json'
+        )
+        self.assertEqual(response.data['count'], 1)
+        self.assertEqual(response.data['results'], [
+            {'id': self.nube.pk, 'result': 'updated'},
+            {'id': self.luna.pk, 'result': 'unchanged'},
+        ])
+        self.nube.refresh_from_db()
+        self.assertTrue(self.nube.is_active)
+        self.assertEqual(find_drift(), [])
+
+    def test_bulk_gallery_delete(self):
+        image = PetImage.objects.create(pet=self.luna, image='pets/gallery/a.jpg')
+        response = self.client.post('/api/images/bulk_delete/', {'ids': [image.pk]}, format='json')
+        self.assertEqual(response.data['results'], [{'id': image.pk, 'result': 'updated'}])
+
+    def test_bulk_requires_ids(self):
+        response = self.client.post('/api/pets/bulk_delete/', {'ids': []}, format='json')
+        self.assertEqual(response.status_code, 400)
+
+    def test_bulk_requires_admin(self):
+        response = APIClient().post('/api/pets/bulk_delete/', {'ids': [self.luna.pk]}, format='json')
+        self.assertIn(response.status_code, (401, 403))
+        self.assertTrue(Pet.objects.get(pk=self.luna.pk).is_active)
+
+
+class PetAsyncEndpointTests(TestCase):
+    """
+    Los endpoints async del catálogo responden lo mismo que los síncronos
+    """
+    URLS = [
+        '/api/pets/',
+        '/api/pets/?page=2',
+        '/api/pets/?page=last',
+        '/api/pets/?species=cat&ordering=name',
+        '/api/pets/?search=mascota',
+        '/api/pets/available/',
+        '/api/pets/available/?size=large',
+        '/api/pets/?page=9',
+        '/api/pets/?species=dragon',
+    ]
+
+    @classmethod
+    def setUpTestData(cls):
+        seed_pets(45)
+        cls.pet = Pet.objects.filter(is_active=True).first()
+        PetImage.objects.create(pet=cls.pet, image='pets/gallery/luna.jpg', order=0)
+        PetImage.objects.create(pet=cls.pet, image='pets/gallery/oculta.jpg', order=1, is_active=False)
+        cls.hidden = Pet.objects.filter(is_active=False).first()
+
+    def async_url(self, url):
+        return url.replace('/api/', '/api/async/', 1)
+
+    async def assertSameResponse(self, url):
+        expected = await sync_to_async(self.client.get)(url)
+        response = await self.async_client.get(self.async_url(url))
+        self.assertEqual(response.status_code, expected.status_code)
+        data = response.json()
+        if isinstance(data, dict) and 'results' in data:
+            for link in ('next', 'previous'):
+                if expected.json()[link]:
+                    self.assertEqual(data[link], self.async_url(expected.json()[link]))
+                data[link] = expected.json()[link]
+        self.assertEqual(data, expected.json())
+
+    async def test_list_matches_sync(self):
+        for url in self.URLS:
+            with self.subTest(url=url):
+                await self.assertSameResponse(url)
+
+    async def test_detail_matches_sync(self):
+        for pk in [self.pet.pk, self.hidden.pk, 999999]:
+            with self.subTest(pk=pk):
+                await self.assertSameResponse(f'/api/pets/{pk}/')
+
+    async def test_only_public_reads(self):
+        admin = await AdminUser.objects.acreate(username='admin', role='admin')
+        token = await sync_to_async(Token.objects.create)(user=admin)
+        # El token se ignora: el catálogo async solo muestra mascotas activas
+        response = await self.async_client.get('/api/async/pets/', HTTP_AUTHORIZATION=f'Token {token.key}')
+        self.assertEqual(response.json()['count'], await Pet.objects.filter(is_active=True).acount())
+
+        response = await self.async_client.post('/api/async/pets/', {})
+        self.assertEqual(response.status_code, 405)
+
+    async def test_queries_are_instrumented(self):
+        response = await self.async_client.get('/api/async/pets/')
+        self.assertIn('db;dur=', response['Server-Timing'])
+        self.assertNotIn('desc="0 consultas', response['Server-Timing'])
+
+    @override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+    async def test_responses_are_cached_until_edit(self):
+        await sync_to_async(cache.clear)()
+        url = f'/api/async/pets/{self.pet.pk}/'
+        await self.async_client.get(url)
+        response = await self.async_client.get(url)
+        self.assertIn('desc="0 consultas', response['Server-Timing'])
+
+        self.pet.name = 'Luna II'
+        await sync_to_async(self.pet.save)()
+        self.assertEqual((await self.async_client.get(url)).json()['name'], 'Luna II')
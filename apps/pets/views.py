@@ -1,19 +1,28 @@
 from rest_framework import viewsets, status, filters
 from rest_framework.decorators import action
 from rest_framework.response import Response
-from rest_framework.permissions import IsAuthenticated, AllowAny
 from django_filters.rest_framework import DjangoFilterBackend
+from django.core.files.uploadhandler import TemporaryFileUploadHandler
+from django.db.models import Prefetch
 from .models import Pet, PetImage
 from .serializers import (
     PetListSerializer, 
     PetDetailSerializer, 
     PetCreateUpdateSerializer,
-    PetImageSerializer
+    PetImageSerializer,
+    PetGalleryUploadSerializer,
+    fast_pet_list_serializer
+)
+from apps.common.permissions import PUBLIC, HasCapability
+from apps.common.cache import CachedResponseMixin, cache_response
+from apps.common.search import FullTextSearchFilter
+from apps.authentication.activity import ActivityLogMixin
+from apps.common.mixins import (
+    BulkStatusMixin, ConditionalGetMixin, FastListMixin, SerializerTimingMixin, SoftDeleteMixin
 )
-from apps.common.permissions import IsAdminUser
 
 
-class PetViewSet(viewsets.ModelViewSet):
+class PetViewSet(ActivityLogMixin, SoftDeleteMixin, BulkStatusMixin, ConditionalGetMixin, CachedResponseMixin, FastListMixin, viewsets.ModelViewSet):
     """
     ViewSet para gestionar mascotas
     
@@ -23,13 +32,38 @@ class PetViewSet(viewsets.ModelViewSet):
     update: PUT /api/pets/{id}/ - Actualizar mascota (admin)
     partial_update: PATCH /api/pets/{id}/ - Actualizar parcial (admin)
     destroy: DELETE /api/pets/{id}/ - Eliminar mascota (admin)
+    bulk_status: POST /api/pets/bulk_status/ - Cambiar estado en bloque (admin)
     """
+    permission_classes = [HasCapability]
+    required_capability = 'pets'
+    action_capabilities = {'list': PUBLIC, 'retrieve': PUBLIC, 'available': PUBLIC}
     queryset = Pet.objects.all()
-    filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
+    filter_backends = [DjangoFilterBackend, filters.OrderingFilter, FullTextSearchFilter]
     filterset_fields = ['species', 'gender', 'size', 'status', 'is_sterilized', 'is_vaccinated']
     search_fields = ['name', 'breed', 'description']
     ordering_fields = ['created_at', 'name', 'age_years']
     ordering = ['-created_at']
+    cache_models = [Pet, PetImage]
+    conditional_related = ['images']
+    fast_list_serializer = fast_pet_list_serializer
+    activity_actions = {
+        'create': 'create_pet',
+        'update': 'update_pet',
+        'partial_update': 'update_pet',
+        'change_status': 'update_pet',
+        'upload_images': 'update_pet',
+        'bulk_status': 'update_pet',
+        'bulk_restore': 'update_pet',
+        'destroy': 'delete_pet',
+        'bulk_delete': 'delete_pet',
+    }
+    
+    def initialize_request(self, request, *args, **kwargs):
+        drf_request = super().initialize_request(request, *args, **kwargs)
+        # La galería se escribe a disco en bloques en lugar de retener cada archivo en memoria
+        if self.action == 'upload_images':
+            request.upload_handlers = [TemporaryFileUploadHandler(request)]
+        return drf_request
     
     def get_serializer_class(self):
         if self.action == 'list':
@@ -38,14 +72,6 @@ class PetViewSet(viewsets.ModelViewSet):
             return PetCreateUpdateSerializer
         return PetDetailSerializer
     
-    def get_permissions(self):
-        # Público puede ver (list, retrieve), solo admins pueden modificar
-        if self.action in ['list', 'retrieve', 'available']:
-            permission_classes = [AllowAny]
-        else:
-            permission_classes = [IsAuthenticated, IsAdminUser]
-        return [permission() for permission in permission_classes]
-    
     def get_queryset(self):
         queryset = Pet.objects.all()
         
@@ -53,47 +79,61 @@ class PetViewSet(viewsets.ModelViewSet):
         if not self.request.user.is_authenticated:
             queryset = queryset.filter(is_active=True)
         
+        # El detalle incluye la galería: una sola consulta para todas las imágenes activas
+        # (list y available leen solo las columnas del serializer rápido con values())
+        if self.action in ['retrieve', 'change_status']:
+            queryset = queryset.prefetch_related(
+                Prefetch('images', queryset=PetImage.objects.filter(is_active=True))
+            )
+        
         return queryset
     
-    @action(detail=False, methods=['get'], permission_classes=[AllowAny])
+    def get_available_queryset(self):
+        return Pet.objects.filter(status='available', is_active=True)
+    
+    @action(detail=False, methods=['get'])
+    @cache_response
     def available(self, request):
         """
-        Obtener solo mascotas disponibles para adopción
+        Obtener solo mascotas disponibles para adopción (paginado)
         GET /api/pets/available/
+        Sin búsqueda, filtros ni ?ordering=: solo ?page= (o ?cursor=)
         """
-        pets = Pet.objects.filter(status='available', is_active=True)
-        serializer = PetListSerializer(pets, many=True)
-        return Response(serializer.data)
+        pets = self.get_available_queryset()
+        # Sin contexto: las imágenes se entregan con URL relativa, como antes
+        return self.fast_list_response(pets)
     
-    @action(detail=True, methods=['post'], permission_classes=[IsAuthenticated, IsAdminUser])
+    @action(detail=True, methods=['post'])
     def upload_images(self, request, pk=None):
         """
-        Subir imágenes adicionales a una mascota
+        Subir varias imágenes y/o reordenar la galería de una mascota
         POST /api/pets/{id}/upload_images/
+        Body (multipart): images=[archivos], caption, order=[ids en el orden deseado]
+        Retorna la galería completa
         """
         pet = self.get_object()
-        images = request.FILES.getlist('images')
         
-        if not images:
+        if not request.FILES.getlist('images') and 'order' not in request.data:
             return Response({
                 'error': 'No se enviaron imágenes'
             }, status=status.HTTP_400_BAD_REQUEST)
         
-        created_images = []
-        for image in images:
-            pet_image = PetImage.objects.create(
-                pet=pet,
-                image=image,
-                caption=request.data.get('caption', '')
-            )
-            created_images.append(PetImageSerializer(pet_image).data)
+        serializer = PetGalleryUploadSerializer(
+            data=request.data,
+            context={'request': request, 'gallery': list(pet.images.filter(is_active=True))}
+        )
+        
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        
+        gallery, created = serializer.save(pet)
         
         return Response({
-            'message': f'{len(created_images)} imágenes subidas exitosamente',
-            'images': created_images
-        }, status=status.HTTP_201_CREATED)
+            'message': f'{created} imágenes subidas exitosamente' if created else 'Galería reordenada exitosamente',
+            'images': PetImageSerializer(gallery, many=True, context={'request': request}).data
+        }, status=status.HTTP_201_CREATED if created else status.HTTP_200_OK)
     
-    @action(detail=True, methods=['patch'], permission_classes=[IsAuthenticated, IsAdminUser])
+    @action(detail=True, methods=['patch'])
     def change_status(self, request, pk=None):
         """
         Cambiar el estado de una mascota
@@ -115,28 +155,23 @@ class PetViewSet(viewsets.ModelViewSet):
             if adoption_date:
                 pet.adoption_date = adoption_date
         
-        pet.save()
+        pet.save_fields('status', 'adoption_date')
         
         return Response({
             'message': 'Estado actualizado exitosamente',
             'pet': PetDetailSerializer(pet).data
         })
-    
-    def perform_destroy(self, instance):
-        # Soft delete: marcar como inactivo en lugar de eliminar
-        instance.is_active = False
-        instance.save()
 
 
-class PetImageViewSet(viewsets.ModelViewSet):
+class PetImageViewSet(ActivityLogMixin, SoftDeleteMixin, SerializerTimingMixin, viewsets.ModelViewSet):
     """
     ViewSet para gestionar imágenes de mascotas
     """
     queryset = PetImage.objects.all()
     serializer_class = PetImageSerializer
-    permission_classes = [IsAuthenticated, IsAdminUser]
-    
-    def perform_destroy(self, instance):
-        # Soft delete
-        instance.is_active = False
-        instance.save()
\ No newline at end of file
+    permission_classes = [HasCapability]
+    required_capability = 'pets'
+    # Cambiar la galería es actualizar la mascota
+    activity_actions = dict.fromkeys(
+        ['create', 'update', 'partial_update', 'destroy', 'bulk_delete', 'bulk_restore'], 'update_pet'
+    )
@@ -12,5 +12,7 @@ import os
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'core.settings')
+# Las settings ajustan la política de conexiones a ASGI (DB_CONNECTION_POLICY en base.py)
+os.environ['DJANGO_ASGI'] = 'True'
 
 application = get_asgi_application()
@@ -50,12 +50,16 @@ LOCAL_APPS = [
 INSTALLED_APPS = DJANGO_APPS + THIRD_PARTY_APPS + LOCAL_APPS
 
 MIDDLEWARE = [
+    # Primero, para que el tiempo total incluya al resto de middlewares
+    'apps.common.instrumentation.RequestInstrumentationMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    # Después de AuthenticationMiddleware: los administradores leen del primario
+    'apps.common.routers.ReadReplicaMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -119,13 +123,14 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 # REST Framework Configuration
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework.authentication.TokenAuthentication',
+        'apps.authentication.authentication.CachedTokenAuthentication',
         'rest_framework.authentication.SessionAuthentication',
     ],
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.AllowAny',  # Por defecto público, cada view define su permiso
     ],
-    'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
+    # Página por número por defecto; ?pagination=cursor activa el modo keyset
+    'DEFAULT_PAGINATION_CLASS': 'apps.common.pagination.StandardResultsPagination',
     'PAGE_SIZE': 20,
     'DEFAULT_FILTER_BACKENDS': [
         'django_filters.rest_framework.DjangoFilterBackend',
@@ -139,6 +144,15 @@ REST_FRAMEWORK = {
     'EXCEPTION_HANDLER': 'rest_framework.views.exception_handler',
 }
 
+# Caché (respuestas públicas versionadas, ver apps.common.cache)
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'huellitas',
+        'TIMEOUT': 300,
+    }
+}
+
 # CORS Settings (para desarrollo)
 CORS_ALLOW_ALL_ORIGINS = True
 CORS_ALLOWED_ORIGINS = [
@@ -171,6 +185,10 @@ LOGGING = {
             'format': '{levelname} {message}',
             'style': '{',
         },
+        'json': {
+            'format': '{message}',
+            'style': '{',
+        },
     },
     'handlers': {
         'file': {
@@ -184,6 +202,12 @@ LOGGING = {
             'class': 'logging.StreamHandler',
             'formatter': 'simple',
         },
+        'requests': {
+            'level': 'INFO',
+            'class': 'logging.FileHandler',
+            'filename': BASE_DIR / 'requests.log',
+            'formatter': 'json',
+        },
     },
     'loggers': {
         'django': {
@@ -196,5 +220,77 @@ LOGGING = {
             'level': 'DEBUG',
             'propagate': True,
         },
+        'apps.requests': {  # Una línea JSON por request medido
+            'handlers': ['requests'],
+            'level': 'INFO',
+            'propagate': False,
+        },
     },
-}
\ No newline at end of file
+}
+
+
+# Instrumentación por request (apps.common.instrumentation)
+# Fracción de requests medidos: 1.0 = todos, 0.1 = uno de cada diez
+REQUEST_INSTRUMENTATION_SAMPLE_RATE = float(os.environ.get('REQUEST_INSTRUMENTATION_SAMPLE_RATE', '1.0'))
+REQUEST_INSTRUMENTATION_SERVER_TIMING = os.environ.get('REQUEST_INSTRUMENTATION_SERVER_TIMING', 'True') == 'True'
+
+# Métricas de /api/metrics/ (apps.common.metrics)
+# Con varios workers, METRICS_DIR debe ser un directorio compartido por todos
+METRICS_ENABLED = os.environ.get('METRICS_ENABLED', 'True') == 'True'
+METRICS_DIR = os.environ.get('METRICS_DIR') or None
+METRICS_FLUSH_INTERVAL = float(os.environ.get('METRICS_FLUSH_INTERVAL', '5'))
+
+# Versiones reducidas de imágenes (apps.common.images)
+# Se generan en un pool de hilos después del commit; EAGER procesa en el request
+IMAGE_WORKERS = int(os.environ.get('IMAGE_WORKERS', '2'))
+IMAGE_PROCESSING_EAGER = os.environ.get('IMAGE_PROCESSING_EAGER', 'False') == 'True'
+
+# Cola de tareas en segundo plano (apps.common.tasks, `python manage.py run_tasks`)
+TASKS_EAGER = os.environ.get('TASKS_EAGER', 'False') == 'True'
+TASK_POLL_INTERVAL = float(os.environ.get('TASK_POLL_INTERVAL', '1'))
+TASK_RETRY_DELAY = int(os.environ.get('TASK_RETRY_DELAY', '10'))  # segundos; se duplica en cada reintento
+TASK_LOCK_TIMEOUT = int(os.environ.get('TASK_LOCK_TIMEOUT', '600'))  # tareas "en ejecución" abandonadas
+
+# Correos del flujo de adopción
+DEFAULT_FROM_EMAIL = os.environ.get('DEFAULT_FROM_EMAIL', 'webmaster@localhost')
+ADOPTION_NOTIFICATION_EMAILS = [
+    email.strip() for email in os.environ.get('ADOPTION_NOTIFICATION_EMAILS', '').split(',') if email.strip()
+]
+
+# Tokens de la API (apps.authentication.authentication)
+# Vencimiento en segundos desde la creación (0 = nunca) y vida de la entrada en caché
+AUTH_TOKEN_TTL = int(os.environ.get('AUTH_TOKEN_TTL', str(7 * 24 * 3600)))
+AUTH_TOKEN_CACHE_TTL = int(os.environ.get('AUTH_TOKEN_CACHE_TTL', '60'))
+
+# Registro de actividad de administradores (apps.authentication.activity)
+# Se guarda en lotes: al juntar BATCH_SIZE entradas o tras FLUSH_INTERVAL segundos
+ACTIVITY_LOG_BATCH_SIZE = int(os.environ.get('ACTIVITY_LOG_BATCH_SIZE', '50'))
+ACTIVITY_LOG_FLUSH_INTERVAL = float(os.environ.get('ACTIVITY_LOG_FLUSH_INTERVAL', '5'))
+
+# Conexiones persistentes a la base de datos (apps.common.db)
+# Segundos que se reutiliza cada conexión: 0 = una por request, None = sin límite
+# (debe ser menor que wait_timeout de MySQL). Con ASGI (core/asgi.py marca el
+# proceso con DJANGO_ASGI) el valor por defecto es 0: cada request async usa un
+# hilo distinto de sync_to_async y su conexión no se reutilizaría. Las comprobaciones
+# de salud descartan antes del request una conexión que el servidor cerró.
+ASGI = os.environ.get('DJANGO_ASGI', 'False') == 'True'
+DB_CONN_MAX_AGE = os.environ.get('DB_CONN_MAX_AGE', '0' if ASGI else '300')
+DB_CONN_MAX_AGE = None if DB_CONN_MAX_AGE in ('', 'None') else int(DB_CONN_MAX_AGE)
+DB_CONN_HEALTH_CHECKS = os.environ.get('DB_CONN_HEALTH_CHECKS', 'True') == 'True'
+DB_CONNECTION_POLICY = {
+    'CONN_MAX_AGE': DB_CONN_MAX_AGE,
+    'CONN_HEALTH_CHECKS': DB_CONN_HEALTH_CHECKS,
+}
+# Abrir las conexiones al iniciar cada worker de gunicorn (gunicorn.conf.py), solo
+# de estos alias: cada hilo de cada worker abre una por alias
+DB_WARMUP = os.environ.get('DB_WARMUP', 'True') == 'True'
+DB_WARMUP_ALIASES = os.environ.get('DB_WARMUP_ALIASES', 'default').split(',')
+
+# Réplica de lectura para el tráfico público (apps.common.routers)
+# Se activa al definir DATABASES['replica'] (DB_REPLICA_HOST); sin ella todo va a default
+DATABASE_ROUTERS = ['apps.common.routers.ReadReplicaRouter']
+READ_REPLICA_APPS = ['pets', 'content']
+# La réplica recibe el esquema por replicación: `migrate` no crea tablas en ella
+READ_REPLICA_MIGRATE = False
+# Segundos que un cliente lee del primario después de escribir (read-your-writes)
+READ_REPLICA_PIN_SECONDS = int(os.environ.get('READ_REPLICA_PIN_SECONDS', '5'))
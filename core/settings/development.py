@@ -26,6 +26,8 @@ DATABASES = {
         'PASSWORD': os.getenv('DB_PASSWORD', ''),
         'HOST': os.getenv('DB_HOST', 'mysql-187c0b93-proyectohuellitasbd-cc9c.b.aivencloud.com'),
         'PORT': os.getenv('DB_PORT', '13886'),
+        # Reutilizar la conexión TLS entre requests (DB_CONN_MAX_AGE en base.py)
+        **DB_CONNECTION_POLICY,
         'OPTIONS': {
             'init_command': "SET sql_mode='STRICT_TRANS_TABLES'",
             'charset': 'utf8mb4',
@@ -36,6 +38,17 @@ DATABASES = {
     }
 }
 
+# Réplica de solo lectura para el tráfico público (apps.common.routers)
+# Mismas opciones que el primario; usuario y contraseña propios si se definen
+if os.getenv('DB_REPLICA_HOST'):
+    DATABASES['replica'] = {
+        **DATABASES['default'],
+        'HOST': os.getenv('DB_REPLICA_HOST'),
+        'PORT': os.getenv('DB_REPLICA_PORT', DATABASES['default']['PORT']),
+        'USER': os.getenv('DB_REPLICA_USER', DATABASES['default']['USER']),
+        'PASSWORD': os.getenv('DB_REPLICA_PASSWORD', DATABASES['default']['PASSWORD']),
+    }
+
 
 # Email para desarrollo (aparece en consola)
 EMAIL_BACKEND = 'django.core.mail.backends.console.EmailBackend'
@@ -23,6 +23,8 @@ DATABASES = {
         'PASSWORD': os.getenv('DB_PASSWORD', ''),
         'HOST': os.getenv('DB_HOST', 'mysql-187c0b93-proyectohuellitasbd-cc9c.b.aivencloud.com'),
         'PORT': os.getenv('DB_PORT', '13886'),
+        # Reutilizar la conexión TLS entre requests (DB_CONN_MAX_AGE en base.py)
+        **DB_CONNECTION_POLICY,
         'OPTIONS': {
             'init_command': "SET sql_mode='STRICT_TRANS_TABLES'",
             'charset': 'utf8mb4',
@@ -33,6 +35,43 @@ DATABASES = {
     }
 }
 
+# Réplica de solo lectura para el tráfico público (apps.common.routers)
+# Mismas opciones que el primario; usuario y contraseña propios si se definen
+if os.getenv('DB_REPLICA_HOST'):
+    DATABASES['replica'] = {
+        **DATABASES['default'],
+        'HOST': os.getenv('DB_REPLICA_HOST'),
+        'PORT': os.getenv('DB_REPLICA_PORT', DATABASES['default']['PORT']),
+        'USER': os.getenv('DB_REPLICA_USER', DATABASES['default']['USER']),
+        'PASSWORD': os.getenv('DB_REPLICA_PASSWORD', DATABASES['default']['PASSWORD']),
+    }
+
+
+# Caché compartida entre workers: archivos (por defecto) o tabla en la base de datos
+# Para 'db' ejecutar antes: python manage.py createcachetable
+if os.environ.get('CACHE_BACKEND', 'file') == 'db':
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.db.DatabaseCache',
+            'LOCATION': os.environ.get('CACHE_LOCATION', 'huellitas_cache'),
+            'TIMEOUT': 300,
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+            'LOCATION': os.environ.get('CACHE_LOCATION', '/var/tmp/huellitas_cache'),
+            'TIMEOUT': 300,
+        }
+    }
+
+# Instrumentación: medir una muestra y no exponer los tiempos internos a clientes
+REQUEST_INSTRUMENTATION_SAMPLE_RATE = float(os.environ.get('REQUEST_INSTRUMENTATION_SAMPLE_RATE', '0.1'))
+REQUEST_INSTRUMENTATION_SERVER_TIMING = os.environ.get('REQUEST_INSTRUMENTATION_SERVER_TIMING', 'False') == 'True'
+
+# Métricas agregadas entre los workers de gunicorn
+METRICS_DIR = os.environ.get('METRICS_DIR', '/var/tmp/huellitas_metrics')
 
 # Seguridad
 SECRET_KEY = os.environ.get('SECRET_KEY', 'change-this-in-production')
@@ -47,6 +86,7 @@ EMAIL_PORT = int(os.environ.get('EMAIL_PORT', 587))
 EMAIL_USE_TLS = True
 EMAIL_HOST_USER = os.environ.get('EMAIL_HOST_USER', '')
 EMAIL_HOST_PASSWORD = os.environ.get('EMAIL_HOST_PASSWORD', '')
+DEFAULT_FROM_EMAIL = os.environ.get('DEFAULT_FROM_EMAIL', EMAIL_HOST_USER or DEFAULT_FROM_EMAIL)
 
 # CORS más restrictivo en producción
 CORS_ALLOW_ALL_ORIGINS = False
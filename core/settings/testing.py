@@ -11,9 +11,37 @@ DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': ':memory:',
+    },
+    # Réplica de lectura (apps.common.routers): otra base independiente, así los
+    # tests ven de cuál se leyó y pueden simular el retraso de la replicación
+    'replica': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': ':memory:',
+    },
+}
+
+# Sin modelos enviados a la réplica salvo en ReadReplicaRouterTests, que declara
+# las dos bases (los demás tests solo pueden consultar `default`)
+READ_REPLICA_APPS = []
+# Como es otra base (no una réplica real), necesita sus propias tablas
+READ_REPLICA_MIGRATE = True
+
+# Caché deshabilitada en tests; los tests de caché la activan con override_settings
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.dummy.DummyCache',
     }
 }
 
+# Versiones de imágenes en el mismo hilo para poder verificarlas
+IMAGE_PROCESSING_EAGER = True
+
+# Tareas en segundo plano en el mismo hilo
+TASKS_EAGER = True
+
+# Registro de actividad sin buffer: cada entrada se guarda al confirmar la transacción
+ACTIVITY_LOG_BATCH_SIZE = 1
+
 # Email para tests
 EMAIL_BACKEND = 'django.core.mail.backends.locmem.EmailBackend'
 
@@ -0,0 +1,32 @@
+"""
+Variante de testing con conexiones persistentes (apps.common.db)
+
+La base en memoria de testing.py nunca se cierra, así que no permite ver
+cuándo Django cierra o reutiliza una conexión. Esta variante usa SQLite en
+archivo con la política de producción:
+
+    DJANGO_SETTINGS_MODULE=core.settings.testing_connections python manage.py test apps.common.tests.ConnectionReuseTests
+"""
+import tempfile
+
+from .testing import *
+
+DB_CONN_MAX_AGE = 60
+DB_CONN_HEALTH_CHECKS = True
+DB_CONNECTION_POLICY = {
+    'CONN_MAX_AGE': DB_CONN_MAX_AGE,
+    'CONN_HEALTH_CHECKS': DB_CONN_HEALTH_CHECKS,
+}
+
+_TEST_DATABASE = os.path.join(tempfile.gettempdir(), 'huellitas_test_connections.sqlite3')
+
+DATABASES = {
+    'default': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': _TEST_DATABASE,
+        # Sin TEST.NAME Django usaría otra vez una base en memoria
+        'TEST': {'NAME': _TEST_DATABASE},
+        **DB_CONNECTION_POLICY,
+    },
+    'replica': DATABASES['replica'],
+}
@@ -18,6 +18,10 @@ urlpatterns = [
     path('api/contact/', include('apps.contact.urls')),
     path('api/content/', include('apps.content.urls')),
     path('api/', include('apps.common.urls')),
+    
+    # Lectura pública async (ASGI): mismas respuestas que los endpoints síncronos
+    path('api/async/', include('apps.pets.async_urls')),
+    path('api/async/content/', include('apps.content.async_urls')),
 ]
 
 # Servir archivos de media y static en desarrollo
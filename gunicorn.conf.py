@@ -0,0 +1,132 @@
+"""
+Configuración de gunicorn para producción
+
+gunicorn la carga sola desde el directorio de trabajo, así que start.sh sigue
+ejecutando `gunicorn core.wsgi:application`. Para los endpoints async
+(apps/common/async_api.py):
+
+    GUNICORN_WORKER_CLASS=uvicorn_worker.UvicornWorker gunicorn core.asgi:application
+
+(con core/asgi.py DB_CONN_MAX_AGE vale 0 por defecto: sin conexiones persistentes).
+
+Todos los valores se pueden cambiar con variables de entorno:
+
+- GUNICORN_BIND (por defecto 0.0.0.0:$PORT, o 0.0.0.0:8000 sin PORT)
+- GUNICORN_WORKERS (o WEB_CONCURRENCY): 2 x CPUs + 1
+  Presupuesto de conexiones a MySQL: workers x GUNICORN_THREADS por cada alias
+  de DB_WARMUP_ALIASES al arrancar (solo `default`), más las de la réplica que
+  se abren con el tráfico; durante un deploy conviven los workers viejos y los
+  nuevos. Debe quedar por debajo de max_connections del plan.
+- GUNICORN_WORKER_CLASS: gthread
+- GUNICORN_THREADS: hilos por worker con gthread (4)
+- GUNICORN_PRELOAD: importar Django una vez en el master y compartir la
+  memoria con los workers (True)
+- GUNICORN_MAX_REQUESTS / GUNICORN_MAX_REQUESTS_JITTER: reciclar cada worker
+  tras 1000 +- 100 requests, para que no se reinicien todos a la vez
+- GUNICORN_TIMEOUT: 120 s, para subir galerías y PDFs con conexiones lentas
+- GUNICORN_GRACEFUL_TIMEOUT, GUNICORN_KEEPALIVE, GUNICORN_LOG_LEVEL,
+  GUNICORN_ACCESS_LOG ('-' = consola, vacío = desactivado)
+"""
+import os
+
+
+def env_int(name, default):
+    value = os.environ.get(name)
+    return int(value) if value else default
+
+
+def env_bool(name, default):
+    value = os.environ.get(name)
+    return value == 'True' if value else default
+
+
+def cpu_count():
+    # CPUs asignadas al proceso (en un contenedor pueden ser menos que las del host)
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+bind = os.environ.get('GUNICORN_BIND') or f'0.0.0.0:{os.environ.get("PORT", "8000")}'
+workers = env_int('GUNICORN_WORKERS', env_int('WEB_CONCURRENCY', cpu_count() * 2 + 1))
+worker_class = os.environ.get('GUNICORN_WORKER_CLASS', 'gthread')
+threads = env_int('GUNICORN_THREADS', 4)
+preload_app = env_bool('GUNICORN_PRELOAD', True)
+
+max_requests = env_int('GUNICORN_MAX_REQUESTS', 1000)
+max_requests_jitter = env_int('GUNICORN_MAX_REQUESTS_JITTER', 100)
+
+timeout = env_int('GUNICORN_TIMEOUT', 120)
+graceful_timeout = env_int('GUNICORN_GRACEFUL_TIMEOUT', 30)
+keepalive = env_int('GUNICORN_KEEPALIVE', 5)
+
+# Latido de los workers en memoria: un disco lento no debe parecer un worker colgado
+if os.path.isdir('/dev/shm'):
+    worker_tmp_dir = '/dev/shm'
+
+loglevel = os.environ.get('GUNICORN_LOG_LEVEL', 'info')
+accesslog = os.environ.get('GUNICORN_ACCESS_LOG', '-') or None
+errorlog = '-'
+
+
+def on_starting(server):
+    """
+    Master, antes de crear los workers: métricas desde cero (apps.common.metrics)
+
+    No configura Django: el módulo de settings lo elige core/wsgi.py al cargar
+    la aplicación. Con preload_app ya se cargó y se usa su METRICS_DIR; sin
+    preload, la variable de entorno METRICS_DIR.
+    """
+    from django.conf import settings
+    from apps.common.metrics import clear_metrics_dir
+
+    if settings.configured:
+        directory = getattr(settings, 'METRICS_DIR', None)
+    else:
+        directory = os.environ.get('METRICS_DIR')
+    removed = clear_metrics_dir(directory)
+    if removed:
+        server.log.info('Métricas anteriores borradas: %s archivos', removed)
+
+
+def post_fork(server, worker):
+    """
+    Worker recién creado: no reutilizar conexiones del master
+
+    Con preload_app el master importa Django antes del fork; una conexión a la
+    base de datos abierta entonces quedaría compartida por todos los workers.
+    Cada worker la descarta y abre la suya (post_worker_init).
+    """
+    from django.db import connections
+
+    connections.close_all()
+
+
+def post_worker_init(worker):
+    """
+    Aplicación cargada: abrir las conexiones persistentes de cada hilo
+    (apps.common.db, DB_WARMUP)
+    """
+    from apps.common.db import warm_up_worker
+
+    opened = warm_up_worker(worker)
+    if opened:
+        worker.log.info('Conexiones abiertas al iniciar (ms): %s', opened)
+
+
+def worker_exit(server, worker):
+    """
+    Worker que termina (reciclado por max_requests o apagado): volcar lo
+    pendiente del registro de actividad y de las métricas
+    """
+    from django.apps import apps as registry
+
+    if not registry.ready:
+        # El worker terminó antes de cargar la aplicación
+        return
+    from apps.authentication.activity import flush_activity
+    from apps.common.metrics import flush_metrics
+
+    flush_activity()
+    flush_metrics()
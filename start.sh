@@ -3,5 +3,21 @@
 # Ejecutar collectstatic
 python manage.py collectstatic --noinput
 
+# Worker de tareas en segundo plano (correos y estado de mascotas adoptadas)
+python manage.py run_tasks &
+
 # Iniciar Gunicorn (o cualquier otro servidor WSGI)
-gunicorn core.wsgi:application
+# Workers, hilos, preload y reciclado: gunicorn.conf.py (variables GUNICORN_*)
+gunicorn core.wsgi:application &
+
+# Al detener el contenedor (SIGTERM) se detienen los dos procesos
+trap 'kill -TERM $(jobs -p) 2>/dev/null' TERM INT
+
+# Si el worker o Gunicorn terminan, se detiene el otro y el script sale con
+# ese código: la plataforma reinicia el contenedor en lugar de dejar la cola
+# de tareas sin worker mientras la API sigue respondiendo
+wait -n
+status=$?
+kill -TERM $(jobs -p) 2>/dev/null
+wait
+exit $status